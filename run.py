@@ -1,14 +1,15 @@
 import sys
 
-from PyQt6.QtWidgets import QApplication
+if __name__ == "__main__":
+    # imported here rather than at module level, since worker processes started with 'spawn' run this module again
+    from PyQt6.QtWidgets import QApplication
 
-from src.app.load_settings import load_user_settings
-from src.app.mainwindow import MainWindow
-from src.app.styling import apply_styling
+    from src.app.load_settings import load_user_settings
+    from src.app.mainwindow import MainWindow
+    from src.app.styling import apply_styling
 
-from src.paths import USER_SETTINGS_PATH
+    from src.paths import USER_SETTINGS_PATH
 
-if __name__ == "__main__":
     app = QApplication([])
     user_settings = load_user_settings(USER_SETTINGS_PATH)
     apply_styling(app, user_settings['language'])
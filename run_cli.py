@@ -0,0 +1,6 @@
+import sys
+
+if __name__ == "__main__":
+    from src.app.cli import main
+
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .database import create_tables
+from .models.router_model import Router
+from .models.plate_model import Plate
+from .models.part_model import Part
+from .models.utils import serialize_contour
+from .controllers.optimization_controller import OptimizationController
+from .utils.packing.layout_export import ExportFormat
+from .utils.packing.utils.part_type import ID_AMOUNT_DELIMITER
+from .utils.stl_parser import STLParser
+from .utils.cancellation import CancellationToken
+from .logging import logger
+
+from ..paths import DATABASE_URI
+
+"""
+Headless command line entry point for layout generation. Imports no Qt modules, so it can run on servers without a display.
+
+Layouts are generated either from the app database, using selected routers and plates and all imported parts,
+or from JSON job files describing routers, plates and parts:
+
+{
+    "routers": [{"plate_x": 1000, "plate_y": 2000, "min_safe_dist_from_edge": 50, "drill_bit_diameter": 5, "mill_bit_diameter": 10}],
+    "plates": [{"id": "stock1", "x": 1000, "y": 1000, "z": 5, "material": "aluminum", "contours": [[[x, y], ...], ...]}],
+    "parts": [
+        {"stl": "bracket.stl", "amount": 4, "material": "aluminum"},
+        {"id": "spacer", "contour": [[x, y], ...], "thickness": 5, "material": "aluminum"}
+    ]
+}
+
+Router and plate fields not given use model defaults. STL paths are relative to the job file.
+Part ids default to the STL file name without extension. They must not contain RESERVED_ID_SUBSTRINGS, which mark plate margins,
+plate contours and part copies in piece ids.
+For each job, placements.json is written to its own output directory, along with an optional preview image and vector exports.
+"""
+
+def create_session(database_uri: str) -> Session:
+    """ Create session for database, creating missing tables and converting legacy contours. """
+    engine = create_engine(database_uri)
+    create_tables(engine)
+    return sessionmaker(bind=engine)()
+
+RESERVED_ID_SUBSTRINGS = ('edge', 'ctr', ID_AMOUNT_DELIMITER)
+
+def validate_part_id(part_id: str):
+    """ Raise ValueError if part id contains a reserved substring, so its pieces would be mistaken for margins, plate contours or copies. """
+    reserved = [substring for substring in RESERVED_ID_SUBSTRINGS if substring in part_id]
+    if reserved:
+        raise ValueError(f"Part id {part_id!r} contains reserved {', '.join(map(repr, reserved))}; give the part a different \"id\".")
+
+def load_job(session: Session, job_path: str):
+    """ Add routers, plates and parts described by JSON job file to session. Routers and plates are selected. """
+    with open(job_path, encoding='utf-8') as file:
+        job: Dict[str, List[Dict[str, Any]]] = json.load(file)
+    job_dir = os.path.dirname(os.path.abspath(job_path))
+
+    for router in job.get('routers', []):
+        session.add(Router(**router, selected=True))
+
+    for plate in job.get('plates', []):
+        plate = dict(plate)
+        contours = plate.pop('contours', None)
+        if contours:
+            plate['contours'] = OptimizationController._get_reverted_plate_ctrs([[tuple(point) for point in contour] for contour in contours])
+        session.add(Plate(**plate, selected=True))
+
+    for part in job.get('parts', []):
+        part = dict(part)
+        if 'stl' in part:
+            stl_path = os.path.join(job_dir, part.pop('stl'))
+            parser = STLParser(stl_path)
+            parser.parse_stl()
+            part.setdefault('id', os.path.splitext(os.path.basename(stl_path))[0])
+            part.setdefault('thickness', parser.thickness)
+            part['filename'] = os.path.basename(stl_path)
+            contour = parser.outer_contour
+        else:
+            contour = np.array(part.pop('contour'), dtype=float)
+        if 'id' in part:
+            validate_part_id(part['id'])
+        if contour is None or len(contour) < 3:
+            raise ValueError(f"Part {part.get('id', part.get('filename'))} has no valid contour.")
+        session.add(Part(**part, contours=serialize_contour(np.asarray(contour, dtype=float).reshape(-1, 2))))
+
+    session.commit()
+
+def run_job(session: Session, output_dir: str, args: argparse.Namespace) -> Tuple[int, int]:
+    """ Generate layout for session and write outputs to directory. Returns amounts of placed and unplaced parts. """
+    os.makedirs(output_dir, exist_ok=True)
+    controller = OptimizationController(
+        session,
+        os.path.join(output_dir, 'preview.png'),
+        time_budget=args.time_budget,
+        workers=args.workers,
+        evaluations=args.evaluations
+    )
+    job = controller.prepare()
+    token = CancellationToken()
+    timer = threading.Timer(args.time_limit, token.cancel) if args.time_limit else None
+    if timer is not None:
+        timer.start()
+    try:
+        controller.set_layout(controller.generate(job, token))
+    finally:
+        if timer is not None:
+            timer.cancel()
+    if token.is_cancelled():
+        logger.warning(f"Layout generation for {output_dir} stopped at time limit of {args.time_limit} seconds.")
+
+    placements = {
+        piece_id: None if placement is None else {
+            'plate': placement[0],
+            'x': placement[1][0],
+            'y': placement[1][1],
+            'rotation': placement[2]
+        }
+        for piece_id, placement in controller.placements.items()
+        if 'edge' not in piece_id and 'ctr' not in piece_id
+    }
+    with open(os.path.join(output_dir, 'placements.json'), 'w', encoding='utf-8') as file:
+        json.dump({'placements': placements}, file, indent=2)
+
+    if args.preview:
+        controller.render_preview(high_quality=args.high_quality)
+    for format in args.export:
+        controller.export_layout(output_dir, ExportFormat(format))
+
+    n_unplaced = sum(placement is None for placement in placements.values())
+    return len(placements) - n_unplaced, n_unplaced
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate part layouts without the GUI.")
+    parser.add_argument('jobs', nargs='*', help="JSON job files. The app database is used if none are given.")
+    parser.add_argument('--db', default=None, help="SQLite database file used instead of JSON jobs. Defaults to the app database.")
+    parser.add_argument('-o', '--output', default='layouts', help="output directory, containing one directory per job")
+    parser.add_argument('--time-budget', type=float, default=0.0, help="seconds spent searching for a better layout per job")
+    parser.add_argument('--evaluations', type=int, default=0, help="layouts evaluated per search. Without --time-budget, the layout is the same on any machine")
+    parser.add_argument('--time-limit', type=float, default=None, help="hard limit in seconds per job, after which the best layout so far is used")
+    parser.add_argument('--workers', type=int, default=None, help="processes used for searching. Defaults to all cores.")
+    parser.add_argument('--preview', action='store_true', help="write preview.png for each job")
+    parser.add_argument('--high-quality', action='store_true', help="render previews with matplotlib")
+    parser.add_argument('--export', nargs='+', default=[], choices=[format.value for format in ExportFormat], help="write vector files per plate")
+    return parser
+
+def main(argv: List[str] = None) -> int:
+    """ Run layout jobs. Returns 0 if all jobs completed, 1 otherwise. """
+    args = get_parser().parse_args(argv)
+    if args.jobs and args.db:
+        print("Give either JSON jobs or a database, not both.", file=sys.stderr)
+        return 1
+
+    if args.jobs:
+        jobs = [(os.path.splitext(os.path.basename(job))[0], 'sqlite://', job) for job in args.jobs]
+    else:
+        jobs = [('database', f'sqlite:///{os.path.abspath(args.db)}' if args.db else DATABASE_URI, None)]
+
+    failed = 0
+    for name, database_uri, job_path in jobs:
+        session = create_session(database_uri)
+        try:
+            if job_path is not None:
+                load_job(session, job_path)
+            n_placed, n_unplaced = run_job(session, os.path.join(args.output, name), args)
+            print(f"{name}: placed {n_placed} parts, {n_unplaced} unplaced")
+        except Exception as e:
+            failed += 1
+            logger.error(f"Encountered error while generating layout for {name}: {e}")
+            print(f"{name}: failed: {e}", file=sys.stderr)
+        finally:
+            session.close()
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
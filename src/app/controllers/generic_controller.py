@@ -8,6 +8,7 @@ from typing import Union, TypeVar, Type, List
 from sqlalchemy.orm import Session
 
 from ..models.utils import is_value_of_type, get_python_type
+from ..models.geometry_cache import geometry_cache
 
 from ..logging import logger
 
@@ -76,6 +77,7 @@ class GenericController:
             
             self.session.delete(item)
             self.session.commit()
+            geometry_cache.invalidate(self.db_table.__tablename__, id)
             logger.debug(f"Item with id {id} removed successfully.")
             return True
         except Exception as e:
@@ -105,6 +107,7 @@ class GenericController:
         try:
             self.session.query(self.db_table).delete()
             self.session.commit()
+            geometry_cache.invalidate(self.db_table.__tablename__)
             logger.debug("Successfully cleared out data table.")
         except Exception as e:
             logger.error(f"Encountered error while attempting to clear out data table: {e}")
@@ -172,6 +175,7 @@ class GenericController:
 
             setattr(item, attr, new_val)
             self.session.commit()
+            geometry_cache.invalidate(self.db_table.__tablename__, id)
             logger.debug(f"Updated item id {id}: set {attr} to {new_val}")
             return item
         except Exception as e:
@@ -14,7 +14,7 @@ from sqlalchemy.orm import Session
 import cv2
 
 from ..models.plate_model import Plate, PlateConstants
-from ..models.utils import serialize_array_list
+from ..models.utils import serialize_contours
 
 from ..controllers.generic_controller import GenericController
 
@@ -418,7 +418,7 @@ class ImageEditingController(GenericController):
             logger.error("Attempted to save flat contours in wrong state.")
             return False   
         try:
-            self._edit_item_attr(self.plate.id, 'contours', serialize_array_list(self.flattened_contours))
+            self._edit_item_attr(self.plate.id, 'contours', serialize_contours(self.flattened_contours))
             return True
         except Exception as e:
             logger.error(f"Encountered exception while attempting to save flattened contours: {e}")
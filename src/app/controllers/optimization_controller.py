@@ -6,24 +6,37 @@ Date: 2024/06/23
 import os
 import enum
 from collections import defaultdict
-from typing import Union, Tuple, List
+from typing import Callable, Dict, NamedTuple, Union, Tuple, List
 import numpy as np
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from ..models.router_model import Router
 from ..models.plate_model import Plate
 from ..models.part_model import Part
-from ..models.utils import deserialize_array, deserialize_array_list, serialize_array, serialize_array_list
+from ..models.utils import serialize_contours
+from ..models.geometry_cache import geometry_cache
 
 from ..utils.packing.bin import Bin
 from ..utils.packing.utils.area2d import Area2D
 from ..utils.packing.utils.dimension2d import Dimension2D
-from ..utils.packing.packing_algo import execute_packing_algorithm
+from ..utils.packing.layout_optimizer import Layout
+from ..utils.packing.progress import PackingProgress
+from ..utils.packing.layout_export import export_layout, ExportFormat
+from ..utils.packing.packing_algo import generate_layout, get_placements, plot_part_placements, render_part_placements, RIGHT_ANGLE_ROTATIONS
+from ..utils.packing.utils.part_type import ID_AMOUNT_DELIMITER
+from ..utils.cancellation import CancellationToken
+from ..utils.contour_utils import simplify_contour
 
 from ..logging import logger
 
-import matplotlib.pyplot as plt
+class PackingJob(NamedTuple):
+    """ Plates, parts and router limits read from db, in the input format of generate_layout. """
+    plates: List[Tuple[str, Tuple[float, float], List[List[Tuple[float, float]]]]]
+    parts: List[Tuple[str, List[Tuple[float, float]], int]]
+    bit_diameter: float
+    edge_distance: float
 
 class OptimizationController:
     """
@@ -31,11 +44,19 @@ class OptimizationController:
     ### Parameters:
     - session: working session.
     - preview_path: preview image filename
+    - rotations: rotations in degrees tried for each part during packing
+    - time_budget: seconds spent searching for a layout using fewer plates. A single greedy pass is made if 0 and evaluations is 0.
+    - evaluations: layouts evaluated by each search. Without a time budget, the same layout is generated on any machine.
+    - workers: amount of processes searching in parallel. Defaults to all cores.
+
+    Part contours are simplified before packing, removing points closer than CONTOUR_TOLERANCE_FACTOR times the bit diameter to the outline.
+    Saved layouts use the original contours.
     """
     MIN_QUANTIZED_VALUE: float = .01 
-    ID_AMOUNT_DELIMITER = "__"
+    CONTOUR_TOLERANCE_FACTOR: float = .1
+    ID_AMOUNT_DELIMITER = ID_AMOUNT_DELIMITER
 
-    def __init__(self, session: Session, preview_path: str, conversion_factor: float = 1.0):
+    def __init__(self, session: Session, preview_path: str, conversion_factor: float = 1.0, rotations: Tuple[float, ...] = RIGHT_ANGLE_ROTATIONS, time_budget: float = 0.0, workers: int = None, evaluations: int = 0):
         if not os.path.exists(os.path.dirname(preview_path)):
             logger.error(f"Indicated optimization preview directory path does not exist: {preview_path}")
             raise FileNotFoundError(f"Directory not found: {preview_path}")
@@ -43,13 +64,27 @@ class OptimizationController:
         self.session = session
         self.preview_path = preview_path
         self.conversion_factor = conversion_factor
+        self.rotations = rotations
+        self.time_budget = time_budget
+        self.evaluations = evaluations
+        self.workers = workers
 
         self.routers_orm, self.parts_orm, self.plates_orm = None, None, None
+        self.layout: Layout = None
         self.placements = None
 
     def optimize(self):
-        """ Call optimization algorithm and generate layout using selected plates, parts, and routers. """
-
+        """ 
+        Call optimization algorithm and generate layout using selected plates, parts, and routers. 
+        The preview image is not rendered; call render_preview once it is needed.
+        """
+        self.set_layout(self.generate(self.prepare()))
+
+    def prepare(self) -> PackingJob:
+        """ 
+        Read and validate selected plates, parts, and routers from db, and get packing job for generate. 
+        Raises ValueError if selection is invalid. Uses the session, so it must run on the GUI thread.
+        """
         selected_routers: List[Router] = self._get_selected_routers()
         if selected_routers is None:
             raise ValueError("No routers selected.")
@@ -118,62 +153,122 @@ class OptimizationController:
             raise ValueError("Selected plates exceed maximum size of selected router.")
 
         parts = []
+        contour_tolerance = max_bit_diameter * OptimizationController.CONTOUR_TOLERANCE_FACTOR
 
         for part in self.parts_orm:
-            part_id = part.id
-            amount = part.amount
-            contour = OptimizationController._get_formatted_part_ctr(part)
-            for i in range(amount):
-                parts.append((OptimizationController._get_part_id_with_amt(part_id, i), contour))
-
-        self.placements = execute_packing_algorithm(
-            plates, 
-            parts, 
-            max_bit_diameter, 
-            edge_distance,
-            self.preview_path, 
-            self.conversion_factor
+            contour = OptimizationController._get_simplified_part_ctr(part, contour_tolerance)
+            parts.append((part.id, contour, part.amount))
+
+        return PackingJob(plates, parts, max_bit_diameter, edge_distance)
+
+    def generate(
+        self, 
+        job: PackingJob, 
+        cancellation_token: CancellationToken = None, 
+        progress_callback: Callable[[float, str], None] = None
+    ) -> Layout:
+        """ 
+        Pack job returned by prepare. Does not use the session or modify the controller, so it can run on a worker thread.
+        If cancelled, the best layout found so far is returned. progress_callback receives the share of work done and a short summary
+        of placed parts and plate utilization.
+        """
+        return generate_layout(
+            job.plates, 
+            job.parts, 
+            job.bit_diameter, 
+            job.edge_distance,
+            rotations=self.rotations,
+            time_budget=self.time_budget,
+            evaluations=self.evaluations,
+            workers=self.workers,
+            cancellation_token=cancellation_token,
+            progress_callback=None if progress_callback is None else lambda progress: progress_callback(
+                progress.fraction, OptimizationController._get_progress_summary(progress)
+            )
         )
 
+    @staticmethod
+    def _get_progress_summary(progress: PackingProgress) -> str:
+        """ Get summary of placed parts and utilization of used plates, e.g. '12/40, 63%'. """
+        return f"{progress.pieces_placed}/{progress.pieces_total}, {progress.utilization:.0%}"
+
+    def set_layout(self, layout: Layout):
+        """ Store generated layout and its placements. """
+        self.layout = layout
+        self.placements = get_placements(layout)
+
+    def render_preview(self, layout: Layout = None, high_quality: bool = False) -> bool:
+        """ 
+        Render preview image of generated layout to preview path, using matplotlib if high_quality is set. Safe to call from a worker thread.
+        Returns True if the preview was rendered, False if rendering failed or there is no layout with placed parts.
+        """
+        layout = layout or self.layout
+        if layout is None or len(layout.used_bins) == 0:
+            return False
+        render = plot_part_placements if high_quality else render_part_placements
+        return render(layout.used_bins, layout.free_bins, self.preview_path, conversion_factor=self.conversion_factor)
+
+    def export_layout(self, directory: str, format: ExportFormat = ExportFormat.SVG) -> List[str]:
+        """ 
+        Write generated layout to directory as one vector file per used plate. Returns paths of written files.
+        Parts are written with their original contours, placed as in save_layout, rather than the simplified outlines used for packing.
+        """
+        if self.layout is None:
+            return []
+        part_placements = {
+            piece_id: placement for piece_id, placement in self.placements.items()
+            if placement is not None and 'edge' not in piece_id and 'ctr' not in piece_id
+        }
+        parts = self._get_parts_by_id({OptimizationController._strip_amt_part_id(piece_id) for piece_id in part_placements})
+        part_rings = {
+            piece_id: [OptimizationController._get_placed_part_ctr(parts[OptimizationController._strip_amt_part_id(piece_id)], position, rotation)]
+            for piece_id, (_, position, rotation) in part_placements.items()
+        }
+        return export_layout(self.layout.used_bins, directory, format, self.conversion_factor, part_rings=part_rings)
+
     def save_layout(self) -> Tuple[set, set]:
-        """ Save generated layout to database. Returns tuple of used pieces and used bins. """
+        """ 
+        Save generated layout to database, appending the contours of placed parts to the contours of their plates.
+        Placements are grouped per plate, so each plate's contour list is extended and serialized once, and all plates are written with
+        a single bulk update and commit. Nothing is written if a placement refers to a missing part or plate.
+        Returns tuple of used pieces and used bins.
+        """
         if self.placements is None:
             return
 
-        used_pieces = set()
-        used_bins = set()
-
+        plate_placements = defaultdict(list)
         for piece_id, placement in self.placements.items():
-            if 'edge' in piece_id or 'ctr' in piece_id:
+            if placement is None or 'edge' in piece_id or 'ctr' in piece_id:
                 continue
+            plate_placements[placement[0]].append((piece_id, placement))
+
+        used_pieces = {piece_id for placements in plate_placements.values() for piece_id, _ in placements}
+        used_bins = set(plate_placements)
+        if not used_bins:
+            return (used_pieces, used_bins)
+
+        parts = self._get_parts_by_id({OptimizationController._strip_amt_part_id(piece_id) for piece_id in used_pieces})
+        plates = {plate.id: plate for plate in self.session.query(Plate).filter(Plate.id.in_(used_bins))}
+        if len(plates) != len(used_bins):
+            raise ValueError("Layout contains plates that are no longer in the database.")
+
+        plate_updates = []
+        for bin_id, placements in plate_placements.items():
+            used_plate_contours = OptimizationController._get_formatted_plate_ctrs(plates[bin_id])
+            for piece_id, (_, position, rotation) in placements:
+                used_part = parts[OptimizationController._strip_amt_part_id(piece_id)]
+                used_part_contour = OptimizationController._get_placed_part_ctr(used_part, position, rotation)
+                used_plate_contours.append([(int(x), int(y)) for x, y in used_part_contour])
+            plate_updates.append({'id': bin_id, 'contours': OptimizationController._get_reverted_plate_ctrs(used_plate_contours)})
 
-            stripped_id = OptimizationController._strip_amt_part_id(piece_id)
-            used_pieces.add(piece_id)
-
-            bin_id, coordinates = placement
-            delta_x, delta_y = coordinates
-
-            used_bins.add(bin_id)
-
-            used_part = self.session.query(Part).filter(Part.id == stripped_id).all()[0]
-            used_part_contour = OptimizationController._get_formatted_part_ctr(used_part)
-
-            used_plate = self.session.query(Plate).filter(Plate.id == bin_id).all()[0]
-            used_plate_contours = OptimizationController._get_formatted_plate_ctrs(used_plate)
-
-            shifted_contour = []
-
-            for point in used_part_contour:
-                shifted_contour.append((int(point[0] + delta_x), int(point[1] + delta_y)))
-
-            used_plate_contours.append(shifted_contour)
-
-            setattr(
-                used_plate, 
-                'contours', 
-                OptimizationController._get_reverted_plate_ctrs(used_plate_contours)
-            )
+        try:
+            self.session.execute(update(Plate), plate_updates)
             self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        for bin_id in used_bins:
+            geometry_cache.invalidate(Plate.__tablename__, bin_id)
         
         return (used_pieces, used_bins)
 
@@ -193,28 +288,60 @@ class OptimizationController:
 
     @staticmethod
     def _get_formatted_plate_ctrs(plate: Plate) -> List[List[Tuple[float, float]]]:
-        """ Get properly formatted contour list for given plate """ 
-        formatted_contours =  [contour.reshape(-1, 2).tolist() for contour in deserialize_array_list(plate.contours)] if plate.contours is not None else []
-        for contour in formatted_contours:
-            for i, point in enumerate(contour):
-                contour[i] = (point[0], point[1])
-        return formatted_contours
+        """ Get properly formatted contour list for given plate. The list is a copy, but the contours in it are cached and must not be modified. """ 
+        contours = geometry_cache.get(plate, 'formatted', lambda contours: [list(map(tuple, contour.tolist())) for contour in contours])
+        return list(contours or [])
     
     @staticmethod
-    def _get_reverted_plate_ctrs(contours: List[List[Tuple[float, float]]]) -> str:
-        """ Get plate contours reverted back to serialized string format. Returns in format [np.array([[[x, y]], [[x, y]], [[x, y]], ...]), ...] serialized as a string. """
-        contour_list = []
-        for contour in contours:
-            contour_list.append(np.array([[[point[0], point[1]]] for point in contour]))
-        return serialize_array_list(contour_list)
+    def _get_reverted_plate_ctrs(contours: List[List[Tuple[float, float]]]) -> bytes:
+        """ Get plate contours reverted back to binary contour format. Stored as int32 if all coordinates are integers, float32 otherwise. """
+        return serialize_contours([np.array(contour).reshape(-1, 2) for contour in contours])
 
     @staticmethod
     def _get_formatted_part_ctr(part: Part) -> List[Tuple[float, float]]:
-        """ Get properly formatted contours for given part """
-        contour = deserialize_array(part.contours).tolist()
-        for i, point in enumerate(contour):
-            contour[i] = (point[0], point[1])
-        return contour
+        """ Get properly formatted contours for given part. The contour is cached and must not be modified. """
+        return geometry_cache.get(part, 'formatted', lambda contours: list(map(tuple, contours[0].tolist())))
+
+    @staticmethod
+    def _get_simplified_part_ctr(part: Part, tolerance: float) -> List[Tuple[float, float]]:
+        """ Get formatted contour of part simplified with given tolerance. Its bounding box is unchanged, so placements apply to the original contour. """
+        return geometry_cache.get(
+            part, 
+            ('simplified', tolerance), 
+            lambda contours: list(map(tuple, simplify_contour(contours[0], tolerance).tolist()))
+        )
+
+    @staticmethod
+    def _get_rotated_part_ctr(part: Part, degrees: float) -> List[Tuple[float, float]]:
+        """ Get formatted contour of part rotated as placed in a layout. Cached per rotation, so copies of a part are rotated once. """
+        return geometry_cache.get(
+            part, 
+            ('rotated', degrees), 
+            lambda contours: OptimizationController._get_rotated_ctr(OptimizationController._get_formatted_part_ctr(part), degrees)
+        )
+
+    @staticmethod
+    def _get_placed_part_ctr(part: Part, position: Tuple[float, float], degrees: float) -> List[Tuple[float, float]]:
+        """ Get original contour of part rotated and shifted as placed in a layout. """
+        delta_x, delta_y = position
+        return [(x + delta_x, y + delta_y) for x, y in OptimizationController._get_rotated_part_ctr(part, degrees)]
+
+    @staticmethod
+    def _get_rotated_ctr(contour: List[Tuple[float, float]], degrees: float) -> List[Tuple[float, float]]:
+        """ Rotate contour counterclockwise around its bounding box center, keeping the bounding box minimum in place. Matches Area2D rotation. """
+        if degrees % 360 == 0 or len(contour) == 0:
+            return contour
+        points = np.array(contour, dtype=float)
+        min_xy, max_xy = points.min(axis=0), points.max(axis=0)
+        center = (min_xy + max_xy) / 2
+        angle = np.radians(degrees)
+        rotation_matrix = np.array([
+            [np.cos(angle), -np.sin(angle)],
+            [np.sin(angle), np.cos(angle)]
+        ])
+        rotated = (points - center) @ rotation_matrix.T
+        rotated += min_xy - rotated.min(axis=0)
+        return [(point[0], point[1]) for point in rotated.tolist()]
 
     """ Database queries """
 
@@ -233,6 +360,13 @@ class OptimizationController:
             logger.error(f"Encountered exception while attempting to get imported parts: {e}")
             return None
 
+    def _get_parts_by_id(self, part_ids: set) -> Dict[str, Part]:
+        """ Get parts with given ids by id. Raises ValueError if any of them are no longer in the database. """
+        parts = {part.id: part for part in self.session.query(Part).filter(Part.id.in_(part_ids))}
+        if len(parts) != len(part_ids):
+            raise ValueError("Layout contains parts that are no longer in the database.")
+        return parts
+
     def _get_selected_plates(self) -> List[Plate]:
         """ Get all selected plates. """
         try:
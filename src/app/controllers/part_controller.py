@@ -4,30 +4,58 @@ Date: 2024/06/01
 """
 
 import os
-from typing import Union
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Tuple, Union
 
 import numpy as np
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..models.part_model import Part
-from ..models.utils import serialize_array, deserialize_array
+from ..models.utils import serialize_contour, get_uuid
+from ..models.geometry_cache import geometry_cache
 from ..utils.stl_parser import STLParser
+from ..utils.stl_cache import STLCache, ParsedSTL
+from ..utils.cancellation import CancellationToken, OperationCancelled
 from ..logging import logger
 
 from .generic_controller import GenericController 
 
+def parse_stl_file(filepath: str, preview_path: str, stl_cache: STLCache = None) -> ParsedSTL:
+    """
+    Parse STL file and save its preview image, loading both from stl_cache instead if the file is cached.
+    Module level function so it can run in worker processes. Raises an exception if the file cannot be parsed.
+    """
+    key = stl_cache.get_key(filepath) if stl_cache is not None else None
+    parsed = stl_cache.load(key) if key is not None else None
+    if parsed is not None:
+        logger.debug(f"Loaded STL file {filepath} from cache")
+        stl_cache.copy_preview(key, preview_path)
+        return parsed
+
+    parser = STLParser(filepath)
+    parser.parse_stl()
+    parser.save_preview_image(preview_path)
+    parsed = ParsedSTL.from_parser(parser)
+    if key is not None:
+        stl_cache.save(key, parsed, preview_path)
+    return parsed
+
 class PartController(GenericController):
     """
     Controller for handling part logic.
     ### Parameters:
     - session: working session.
     - preview_image_directory: directory for storing part preview images.
+    - stl_cache: cache of parsed STL files, so reimported files are not parsed again. Files are always parsed if None.
     """
     MAX_PART_AMOUNT: int = 20
+    CANCELLATION_CHECK_INTERVAL: float = 0.1
 
-    def __init__(self, session: Session, preview_image_directory: str):
+    def __init__(self, session: Session, preview_image_directory: str, stl_cache: STLCache = None):
         super().__init__(session, Part, preview_image_directory)
+        self.stl_cache = stl_cache
     '''
     Add new parts
     '''
@@ -36,31 +64,157 @@ class PartController(GenericController):
         Extract part from STL file and add to db, create preview image.
         Returns newly created part if successful, None otherwise
         """
+        if not self.can_import(filepath):
+            return None
+
+        try:
+            parsed_part = self.parse_file(filepath)
+        except Exception as e:
+            logger.error(f"Encountered error while attempting to import file {filepath}: {e}")
+            return None
+        return self.add_parsed(parsed_part)
+
+    def can_import(self, filepath: str) -> bool:
+        """ Check that STL file exists and has not been imported yet. """
         if not os.path.exists(filepath):
             logger.error(f"STL file does not exist: {filepath}")
-            return None
+            return False
 
         duplicates = self.session.query(Part).filter(Part.filename == os.path.basename(filepath)).first()
         if duplicates is not None:
             logger.debug(f"Attempted to add already existing STL file: {filepath}")
+            return False
+        return True
+
+    def parse_file(self, filepath: str) -> Part:
+        """
+        Extract part from STL file and create preview image, without adding it to db. 
+        Does not use the session, so it can run on a worker thread. Raises an exception if the file cannot be parsed.
+        Files with the same content as a cached file are loaded from the cache instead of being parsed.
+        """
+        id = get_uuid()
+        parsed = parse_stl_file(filepath, self._get_preview_image_path(id), self.stl_cache)
+        return self._create_part(id, filepath, parsed)
+
+    def parse_files(
+        self,
+        filepaths: List[str],
+        workers: int = None,
+        cancellation_token: CancellationToken = None,
+        progress_callback: Callable[[float, str], None] = None
+    ) -> Tuple[List[Part], Dict[str, str]]:
+        """
+        Extract parts from STL files and create preview images in worker processes, without adding them to db.
+        Does not use the session, so it can run on a worker thread. Files are parsed in the calling process if workers is 1 or there is a single file.
+        Returns parts in order of filepaths and error messages of files that could not be parsed, by filepath.
+        Raises OperationCancelled if cancelled, after removing the previews created so far.
+        """
+        ids = [get_uuid() for _ in filepaths]
+        tasks = [(filepath, self._get_preview_image_path(id), self.stl_cache) for filepath, id in zip(filepaths, ids)]
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        results: Dict[int, ParsedSTL] = {}
+        errors: Dict[str, str] = {}
+
+        def on_parsed(idx: int, get_result: Callable[[], ParsedSTL]):
+            try:
+                results[idx] = get_result()
+            except Exception as e:
+                logger.error(f"Encountered error while attempting to import file {filepaths[idx]}: {e}")
+                errors[filepaths[idx]] = str(e)
+            if progress_callback is not None:
+                n_done = len(results) + len(errors)
+                progress_callback(n_done / len(tasks), f"{n_done}/{len(tasks)}")
+
+        try:
+            if workers <= 1:
+                for idx, task in enumerate(tasks):
+                    if cancellation_token is not None:
+                        cancellation_token.raise_if_cancelled()
+                    on_parsed(idx, lambda: parse_stl_file(*task))
+            else:
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                    futures = {executor.submit(parse_stl_file, *task): idx for idx, task in enumerate(tasks)}
+                    pending = set(futures)
+                    while pending:
+                        done, pending = wait(pending, timeout=self.CANCELLATION_CHECK_INTERVAL, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            on_parsed(futures[future], future.result)
+                        if cancellation_token is not None and cancellation_token.is_cancelled():
+                            executor.shutdown(cancel_futures=True)
+                            raise OperationCancelled()
+        except OperationCancelled:
+            for id in ids:
+                self._remove_preview(id)
+            raise
+
+        parts = [self._create_part(ids[idx], filepaths[idx], results[idx]) for idx in sorted(results)]
+        return parts, errors
+
+    def _create_part(self, id: str, filepath: str, parsed: ParsedSTL) -> Part:
+        """ Create part from parsing result of STL file. """
+        return Part(
+            id=id,
+            filename=os.path.basename(filepath), 
+            thickness=parsed.thickness,
+            contours=serialize_contour(parsed.outer_contour)
+        )
+
+    def add_parsed(self, part: Part) -> Union[Part, None]:
+        """ Add part created by parse_file to db. Returns part if successful, None otherwise. """
+        if self.session.query(Part).filter(Part.filename == part.filename).first() is not None:
+            logger.debug(f"Attempted to add already existing STL file: {part.filename}")
+            self._remove_preview(part.id)
             return None
+        self._add_item_to_db(part)
+        logger.debug(f"Imported file {part.filename} successfully")
+        return part
+
+    def add_parsed_all(self, parts: List[Part]) -> List[Part]:
+        """
+        Add parts created by parse_file or parse_files to db in a single transaction.
+        Parts whose file name is already in db or earlier in parts are skipped and their previews removed. Returns added parts.
+        """
+        filenames = {part.filename for part in parts}
+        existing = {filename for (filename,) in self.session.query(Part.filename).filter(Part.filename.in_(filenames))}
+        added = []
+        for part in parts:
+            if part.filename in existing:
+                logger.debug(f"Attempted to add already existing STL file: {part.filename}")
+                self._remove_preview(part.id)
+                continue
+            existing.add(part.filename)
+            added.append(part)
 
         try:
-            parser = STLParser(filepath) 
-            parser.parse_stl()
-            part = Part(
-                filename=os.path.basename(filepath), 
-                thickness=parser.thickness,
-                contours=serialize_array(parser.outer_contour)
-            )
-            self._add_item_to_db(part)
-            dst_path = self._get_preview_image_path(str(part.id))
-            parser.save_preview_image(dst_path)
-            logger.debug(f"Imported file {filepath} successfully")
-            return part
+            self.session.add_all(added)
+            self.session.commit()
         except Exception as e:
-            logger.error(f"Encountered error while attempting to import file {filepath}: {e}")
-            return None
+            logger.error(f"Encountered exception while adding {len(added)} parts: {e}")
+            self.session.rollback()
+            for part in added:
+                self._remove_preview(part.id)
+            return []
+        logger.debug(f"Imported {len(added)} files successfully")
+        return added
+
+    def add_from_files(self, filepaths: List[str], workers: int = None) -> List[Part]:
+        """
+        Extract parts from STL files in worker processes and add them to db in a single transaction.
+        Files that do not exist, are already imported or cannot be parsed are skipped. Returns added parts.
+        """
+        filepaths = [filepath for filepath in filepaths if self.can_import(filepath)]
+        if not filepaths:
+            return []
+        parts, _ = self.parse_files(filepaths, workers)
+        return self.add_parsed_all(parts)
+
+    def _remove_preview(self, id: str):
+        """ Delete preview image of part that was not added to db. """
+        preview_path = self._get_preview_image_path(id)
+        if preview_path is not None and os.path.exists(preview_path):
+            os.remove(preview_path)
+
     '''
     Remove parts
     '''
@@ -95,9 +249,10 @@ class PartController(GenericController):
         return self._get_item_attr(id, 'material')
 
     def get_contours(self, id: str) -> Union[np.array, None]:
-        """ Get part contours. Returns None if an error occurs. """
-        contours = self._get_item_attr(id, 'contours')
-        return deserialize_array(contours) if contours else None
+        """ Get part contours. Returns None if an error occurs. The returned array is cached and read-only. """
+        part = self._get_item_by_id(id)
+        contours = geometry_cache.get_contours(part) if part is not None else None
+        return contours[0] if contours else None
 
     def get_amount(self, id: str) -> Union[int, None]:
         """
@@ -10,10 +10,11 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..models.plate_model import Plate, PlateConstants
-from ..models.utils import serialize_array, deserialize_array, deserialize_array_list
+from ..models.utils import serialize_contours
+from ..models.geometry_cache import geometry_cache
 
-import matplotlib.pyplot as plt
 from ..utils.plotting_util import PlottingConstants, _generate_rectangle_coordinates
+from ..utils.raster_renderer import RasterCanvas, hex_to_bgr, save_image
 
 from ..logging import logger
 
@@ -90,10 +91,10 @@ class PlateController(GenericController):
         """ Get plate z dimension. Returns None if an error occurs."""
         return self._get_item_attr(id, 'z')
 
-    def get_contours(self, id: str) -> Union[np.array, None]:
-        """ Get plate contours. Returns None if an error occurs."""
-        contours_as_string = self._get_item_attr(id, 'contours')
-        return deserialize_array(contours_as_string)
+    def get_contours(self, id: str) -> Union[List[np.ndarray], None]:
+        """ Get plate contours as arrays of points of shape (n, 2). Returns None if an error occurs or plate has no contours. The returned arrays are cached and read-only."""
+        plate = self._get_item_by_id(id)
+        return geometry_cache.get_contours(plate) if plate is not None else None
 
     def get_selected(self, id: str) -> Union[bool, None]:
         """ Get plate selection status. Returns None if an error occurs. """
@@ -128,12 +129,11 @@ class PlateController(GenericController):
             return None
         return self._edit_item_attr(id, 'material', new_material)
     
-    def edit_contours(self, id: str, new_contour: np.array) -> Union[Plate, None]:
+    def edit_contours(self, id: str, new_contours: List[np.ndarray]) -> Union[Plate, None]:
         """
         Edit plate contours. Returns modified plate or None if an error occurs.
         """
-        contours_as_string = serialize_array(new_contour)
-        return self._edit_item_attr(id, 'contours', contours_as_string)
+        return self._edit_item_attr(id, 'contours', serialize_contours(new_contours))
 
     def edit_selected(self, id: str, new_val: bool) -> Union[Plate, None]:
         """
@@ -170,32 +170,49 @@ class PlateController(GenericController):
     '''
     Preview image logic
     '''
-    def save_preview(self, plate: Plate, figsize: Tuple[int, int] = (4, 4), dpi: int = 80):
+    def save_preview(self, plate: Plate, figsize: Tuple[int, int] = (4, 4), dpi: int = 80, high_quality: bool = False):
         """
-        Saves a preview image for a plate using matplotlib.
+        Saves a preview image for a plate. Drawn directly with OpenCV unless high_quality is set, in which case matplotlib is used.
 
         Arguments:
         - plate: Plate ORM instance.
         - figsize: Width and height in inches (defaults to 4x4).
         - dpi: Pixels per inch (defaults to 80).
+        - high_quality: plot with matplotlib, including axes.
         """
         try:
             image_path = self._get_preview_image_path(plate.id)
-            image_contours = deserialize_array_list(plate.contours)
+            image_contours = geometry_cache.get_contours(plate)
             plate_xy = (plate.x * self.conversion_factor, plate.y * self.conversion_factor)
             plate_rect_x, plate_rect_y = _generate_rectangle_coordinates(*plate_xy)
         except AttributeError as e:
             logger.debug(f"Encountered error while attempting to create preview image for plate with id {plate.id}: {e}")
             return
 
+        if not high_quality:
+            try:
+                canvas = RasterCanvas(*plate_xy, figsize[0] * dpi, figsize[1] * dpi, background=hex_to_bgr(PlottingConstants.PLOT_BG_COLOR))
+                line_color = hex_to_bgr(PlottingConstants.PLOT_LINE_COLOR)
+                canvas.draw_polygon(list(zip(plate_rect_x, plate_rect_y)), line_color)
+                for contour in image_contours or []:
+                    canvas.draw_polygon(contour * self.conversion_factor, line_color, closed=False)
+            except ValueError as e:
+                logger.debug(f"Encountered error while attempting to create preview image for plate with id {plate.id}: {e}")
+                return
+            if save_image(canvas.image, image_path):
+                logger.debug(f"Preview image for plate with id {plate.id} saved successfully.")
+            return
+
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=figsize)
 
         plt.plot(plate_rect_x, plate_rect_y, color=PlottingConstants.PLOT_LINE_COLOR)
 
         if image_contours:
             for contour in image_contours:
-                x_coords = [point[0][0] * self.conversion_factor for point in contour]
-                y_coords = [point[0][1] * self.conversion_factor for point in contour]
+                x_coords = contour[:, 0] * self.conversion_factor
+                y_coords = contour[:, 1] * self.conversion_factor
                 plt.plot(x_coords, y_coords, color=PlottingConstants.PLOT_LINE_COLOR, linewidth=1)
 
         plt.grid(True)
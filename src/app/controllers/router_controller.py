@@ -12,8 +12,8 @@ from sqlalchemy.orm import Session
 
 from ..models.router_model import Router, RouterConstants
 
-import matplotlib.pyplot as plt
 from ..utils.plotting_util import PlottingConstants, _generate_rectangle_coordinates
+from ..utils.raster_renderer import RasterCanvas, hex_to_bgr, save_image
 
 from ..logging import logger
 
@@ -213,14 +213,15 @@ class RouterController(GenericController):
     '''
     Preview image logic
     '''
-    def save_preview(self, router: Router, figsize: Tuple[int, int] = (8, 8), dpi: int = 80):
+    def save_preview(self, router: Router, figsize: Tuple[int, int] = (8, 8), dpi: int = 80, high_quality: bool = False):
         """
-        Saves a preview image for a router using matplotlib.
+        Saves a preview image for a router. Drawn directly with OpenCV unless high_quality is set, in which case matplotlib is used.
 
         Arguments:
         - router: Router ORM instance.
         - figsize: Width and height in inches (defaults to 8x8).
         - dpi: Pixels per inch (defaults to 80).
+        - high_quality: plot with matplotlib, including axes.
         """
         try:
             image_path = self._get_preview_image_path(router.id)
@@ -240,6 +241,25 @@ class RouterController(GenericController):
         router_rect_x, router_rect_y = _generate_rectangle_coordinates(*router_xy, router_x_offset, router_y_offset)
         safe_rect_x, safe_rect_y = _generate_rectangle_coordinates(*(dim - 2 * safe_distance for dim in plate_xy), safe_distance, safe_distance)
 
+        if not high_quality:
+            rectangles = [(plate_rect_x, plate_rect_y), (router_rect_x, router_rect_y), (safe_rect_x, safe_rect_y)]
+            all_x = [x for rect_x, _ in rectangles for x in rect_x]
+            all_y = [y for _, rect_y in rectangles for y in rect_y]
+            try:
+                canvas = RasterCanvas(
+                    max(all_x) - min(all_x), max(all_y) - min(all_y), figsize[0] * dpi, figsize[1] * dpi, 
+                    flip_y=True, background=hex_to_bgr(PlottingConstants.PLOT_BG_COLOR), origin=(min(all_x), min(all_y))
+                )
+            except ValueError:
+                return
+            line_color = hex_to_bgr(PlottingConstants.PLOT_LINE_COLOR)
+            for (rect_x, rect_y), dash in zip(rectangles, (RasterCanvas.DOT_LENGTH, 0, RasterCanvas.DASH_LENGTH)):
+                canvas.draw_polygon(list(zip(rect_x, rect_y)), line_color, dash=dash)
+            save_image(canvas.image, image_path)
+            return
+
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=figsize)
 
         plt.plot(plate_rect_x, plate_rect_y, color=PlottingConstants.PLOT_LINE_COLOR, linestyle=':')
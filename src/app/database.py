@@ -4,9 +4,11 @@ Date: 2024/05/31
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
 
 from .logging import logger
+from .models.utils import migrate_legacy_contours
 from ..paths import DATABASE_URI
 
 engine = create_engine(DATABASE_URI)
@@ -14,7 +16,13 @@ Session = scoped_session(sessionmaker(bind=engine))
 Base = declarative_base()
 
 def init_db():
-    Base.metadata.create_all(engine)
+    create_tables(engine)
+
+def create_tables(db_engine: Engine):
+    """ Create missing tables and convert contours stored in the legacy text format. """
+    Base.metadata.create_all(db_engine)
+    with db_engine.begin() as connection:
+        migrate_legacy_contours(connection)
 
 def get_session():
     return Session()
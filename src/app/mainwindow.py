@@ -23,7 +23,7 @@ from .utils.clear_dir import clear_dir
 from .utils.settings_enum import DEFAULT_LANGUAGE, DEFAULT_UNITS
 
 from .database import init_db, teardown_db, get_session, close_session
-from ..paths import PART_PREVIEW_DIR, PLATE_PREVIEW_DIR, ROUTER_PREVIEW_DIR, ICON_PATH, USER_SETTINGS_PATH, TEMP_DIRS
+from ..paths import PART_PREVIEW_DIR, STL_CACHE_DIR, PLATE_PREVIEW_DIR, ROUTER_PREVIEW_DIR, ICON_PATH, USER_SETTINGS_PATH, TEMP_DIRS
 
 from .translations import main_window
 from .logging import logger
@@ -53,7 +53,7 @@ class MainWindow(QMainWindow):
             self.texts['home_button'][user_language]: \
                 HomeView(user_language),
             self.texts['part_button'][user_language]: \
-                PartView(self.session, PART_PREVIEW_DIR, user_language, user_units),
+                PartView(self.session, PART_PREVIEW_DIR, user_language, user_units, STL_CACHE_DIR),
             self.texts['stock_button'][user_language]: \
                 PlateView(self.session, PLATE_PREVIEW_DIR, user_language, user_units),
             self.texts['router_button'][user_language]: \
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from .utils import deserialize_contours
+
+"""
+In-memory cache of contours decoded from ORM rows and of geometry derived from them.
+"""
+
+class GeometryEntry(NamedTuple):
+    """ Contours stored in a row, the bytes they were decoded from, and derived geometry by name. """
+    data: bytes
+    contours: List[np.ndarray]
+    derived: Dict[Hashable, Any]
+
+class GeometryCache:
+    """
+    Cache of decoded contours of rows with a contours column, keyed by (table name, row id, version).
+    Versions are counted per row and increased by invalidate, which controllers call whenever they modify or remove a row.
+    An entry is only used while the row still holds the bytes it was decoded from, so rows written without a controller are never served stale.
+    The least recently used entries are dropped once there are more than max_entries.
+
+    Returned contours and geometry are shared between callers and must not be modified.
+    """
+    MAX_ENTRIES: int = 1024
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries if max_entries is not None else GeometryCache.MAX_ENTRIES
+        self.versions: Dict[Tuple[str, str], int] = {}
+        self.entries: 'OrderedDict[Tuple[str, str, int], GeometryEntry]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_contours(self, item: Any) -> Union[List[np.ndarray], None]:
+        """ Get contours of item as read-only arrays of points of shape (n, 2). Returns None if item has no contours or they cannot be decoded. """
+        entry = self._get_entry(item)
+        return entry.contours if entry is not None else None
+
+    def get(self, item: Any, name: Hashable, compute: Callable[[List[np.ndarray]], Any]) -> Any:
+        """
+        Get geometry derived from contours of item, computed by compute(contours) on first use and stored under name.
+        Returns None if item has no contours or they cannot be decoded.
+        """
+        entry = self._get_entry(item)
+        if entry is None:
+            return None
+        with self.lock:
+            if name in entry.derived:
+                return entry.derived[name]
+        value = compute(entry.contours)
+        with self.lock:
+            return entry.derived.setdefault(name, value)
+
+    def invalidate(self, table: str, id: str = None):
+        """ Drop cached geometry of row with id in table, or of all rows in table if id is None. """
+        with self.lock:
+            rows = [row for row in self.versions if row[0] == table] if id is None else [(table, id)]
+            for row in rows:
+                version = self.versions.get(row, 0)
+                self.entries.pop((*row, version), None)
+                self.versions[row] = version + 1
+
+    def clear(self):
+        """ Drop all cached geometry. """
+        with self.lock:
+            self.entries.clear()
+
+    def _get_entry(self, item: Any) -> Union[GeometryEntry, None]:
+        """ Get entry of item, decoding its contours if they are not cached or have changed since they were cached. """
+        data = item.contours
+        if data is None:
+            return None
+        row = (item.__tablename__, item.id)
+
+        with self.lock:
+            key = (*row, self.versions.setdefault(row, 0))
+            entry = self.entries.get(key)
+            if entry is not None and (entry.data is data or entry.data == data):
+                self.entries.move_to_end(key)
+                return entry
+
+        contours = deserialize_contours(data)
+        if contours is None:
+            return None
+        entry = GeometryEntry(data, contours, {})
+
+        with self.lock:
+            if key[2] == self.versions.get(row, 0):
+                self.entries[key] = entry
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return entry
+
+geometry_cache = GeometryCache()
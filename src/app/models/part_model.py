@@ -5,7 +5,7 @@ Date: 2024/05/31
 
 import sys
 from typing import NamedTuple
-from sqlalchemy import Column, Integer, String, Float, Text
+from sqlalchemy import Column, Integer, String, Float, LargeBinary
 from ..database import Base
 from .utils import get_uuid
 
@@ -21,5 +21,5 @@ class Part(Base):
     filename = Column(String, unique=True)
     thickness = Column(Float, nullable=False)
     material = Column(String, nullable=False, default=PartConstants.DEFAULT_MATERIAL)
-    contours = Column(Text, nullable=False)
+    contours = Column(LargeBinary, nullable=False)
     amount = Column(Integer, nullable=False, default=1)
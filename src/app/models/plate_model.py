@@ -5,7 +5,7 @@ Date: 2024/05/31
 
 import sys
 from typing import NamedTuple
-from sqlalchemy import Column, String, Float, Text, Boolean
+from sqlalchemy import Column, String, Float, LargeBinary, Boolean
 from ..database import Base
 from .utils import get_uuid
 
@@ -28,6 +28,6 @@ class Plate(Base):
     y = Column(Float, nullable=False, default=PlateConstants.DEFAULT_Y)
     z = Column(Float, nullable=False, default=PlateConstants.DEFAULT_Z)
     material = Column(String, nullable=False, default=PlateConstants.DEFAULT_MATERIAL)
-    contours = Column(Text, nullable=True, default=None)
+    contours = Column(LargeBinary, nullable=True, default=None)
     selected = Column(Boolean, nullable=False, default=False)
     
\ No newline at end of file
@@ -5,13 +5,15 @@ Date: 2024/05/31
 
 import numpy as np
 import base64
+import struct
 import uuid
 import io
 
 from ..logging import logger
 
 from typing import Union, Type, Any, List
-from sqlalchemy import Integer, Float, String, Text, Boolean
+from sqlalchemy import Integer, Float, String, Text, Boolean, LargeBinary, text
+from sqlalchemy.engine import Connection
 
 """
 Util functions for dealing with models.
@@ -22,7 +24,8 @@ ORM_TYPE_MAP = {
     Float: float,
     String: str,
     Text: str,
-    Boolean: bool
+    Boolean: bool,
+    LargeBinary: bytes
 }
 
 def get_python_type(sqlalchemy_type) -> Union[Type, tuple]:
@@ -107,4 +110,106 @@ def deserialize_array_list(base64_str: str) -> List[np.ndarray]:
     except Exception as e:
         logger.error(f"Error deserializing array list: {e}")
         return None
-    
\ No newline at end of file
+    
+"""
+Binary contour format, stored in LargeBinary columns.
+
+An 8 byte header holds the magic bytes b'CTR', a point type code (b'i' for int32, b'f' for float32) and the amount of contours as uint32.
+It is followed by amount + 1 int32 offsets into the point buffer, and by the points of all contours as little endian (x, y) pairs.
+All fields are 4 byte aligned, so contours are decoded as read-only views into the stored bytes without copying.
+"""
+
+CONTOUR_MAGIC = b'CTR'
+CONTOUR_HEADER = struct.Struct('<3scI')
+CONTOUR_OFFSET_DTYPE = np.dtype('<i4')
+CONTOUR_POINT_DTYPES = {
+    b'i': np.dtype('<i4'),
+    b'f': np.dtype('<f4')
+}
+
+def serialize_contours(contours: List[np.ndarray]) -> bytes:
+    """
+    Serialize list of contours as bytes in binary contour format. Each contour is reshaped to an array of points of shape (n, 2).
+    Points are stored as int32 if all contours are integer arrays, and as float32 otherwise.
+    """
+    if contours is None:
+        return None
+    try:
+        arrays = [np.asarray(contour).reshape(-1, 2) for contour in contours]
+        code = b'i' if all(np.issubdtype(array.dtype, np.integer) for array in arrays) else b'f'
+        offsets = np.cumsum([0] + [len(array) for array in arrays]).astype(CONTOUR_OFFSET_DTYPE)
+        points = np.concatenate(arrays) if arrays else np.empty((0, 2))
+        return b''.join((
+            CONTOUR_HEADER.pack(CONTOUR_MAGIC, code, len(arrays)),
+            offsets.tobytes(),
+            points.astype(CONTOUR_POINT_DTYPES[code]).tobytes()
+        ))
+    except (ValueError, TypeError) as e:
+        logger.error(f"Error serializing contours: {e}")
+        return None
+
+def deserialize_contours(data: bytes) -> List[np.ndarray]:
+    """
+    Deserialize bytes in binary contour format back into a list of read-only arrays of points of shape (n, 2).
+    """
+    if data is None:
+        return None
+    try:
+        magic, code, amount = CONTOUR_HEADER.unpack_from(data)
+        if magic != CONTOUR_MAGIC or code not in CONTOUR_POINT_DTYPES:
+            raise ValueError("data is not in binary contour format")
+        offsets = np.frombuffer(data, dtype=CONTOUR_OFFSET_DTYPE, count=amount + 1, offset=CONTOUR_HEADER.size)
+        points = np.frombuffer(
+            data,
+            dtype=CONTOUR_POINT_DTYPES[code],
+            count=2 * int(offsets[-1]),
+            offset=CONTOUR_HEADER.size + offsets.nbytes
+        ).reshape(-1, 2)
+        return [points[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+    except (ValueError, TypeError, struct.error) as e:
+        logger.error(f"Error deserializing contours: {e}")
+        return None
+
+def serialize_contour(contour: np.ndarray) -> bytes:
+    """
+    Serialize single contour as bytes in binary contour format.
+    """
+    if contour is None:
+        return None
+    return serialize_contours([contour])
+
+def deserialize_contour(data: bytes) -> np.ndarray:
+    """
+    Deserialize bytes in binary contour format holding a single contour. Returns None if data holds a different amount of contours.
+    """
+    contours = deserialize_contours(data)
+    if contours is None or len(contours) != 1:
+        return None
+    return contours[0]
+
+CONTOUR_TABLES = ('parts', 'plates')
+
+def migrate_legacy_contours(connection: Connection) -> int:
+    """
+    Convert contours stored in the legacy base 64 text format, written by serialize_array and serialize_array_list, to binary contour format.
+    Updates all tables in CONTOUR_TABLES that exist. Rows that cannot be decoded are left unchanged. Returns the amount of converted rows.
+    """
+    tables = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+    converted = 0
+    for table in CONTOUR_TABLES:
+        if table not in tables:
+            continue
+        rows = connection.execute(text(f"SELECT id, contours FROM {table} WHERE typeof(contours) = 'text'")).all()
+        updates = []
+        for id, contours in rows:
+            converted_contours = serialize_contours(deserialize_array_list(contours))
+            if converted_contours is None:
+                logger.warning(f"Could not convert contours of row {id} in table {table}, leaving them unchanged.")
+                continue
+            updates.append({'id': id, 'contours': converted_contours})
+        if updates:
+            connection.execute(text(f"UPDATE {table} SET contours = :contours WHERE id = :id"), updates)
+            converted += len(updates)
+    if converted:
+        logger.info(f"Converted {converted} contour columns to binary contour format.")
+    return converted
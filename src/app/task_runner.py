@@ -0,0 +1,141 @@
+import inspect
+import traceback
+from typing import Any, Callable, List
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .utils.cancellation import CancellationToken, OperationCancelled
+from .logging import logger
+
+"""
+Runs long operations on worker threads so views stay responsive.
+
+Tasks are plain functions, usually controller methods. A function accepting a `cancellation_token` argument receives the task's
+CancellationToken, and one accepting a `progress_callback` argument receives a function taking progress as a fraction in [0, 1]
+and an optional message. Results, errors, progress and cancellation are delivered through Qt signals, which are received in the GUI thread.
+
+Tasks must not use the database session, which belongs to the GUI thread. Read inputs before starting a task and write results in
+the finished handler instead.
+"""
+
+class TaskSignals(QObject):
+    """
+    Signals emitted by a Task.
+    - progress: percentage in [0, 100] and message.
+    - finished: return value of task function.
+    - failed: error message.
+    - cancelled: task was cancelled before or while running.
+    - done: emitted last, whatever the outcome.
+    """
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    done = pyqtSignal()
+
+class Task(QRunnable):
+    """
+    Runnable calling fn(*args, **kwargs) on a worker thread.
+
+    ### Parameters:
+    - fn: function to call. cancellation_token and progress_callback arguments are passed if fn accepts them.
+    - args, kwargs: arguments passed to fn.
+    """
+    def __init__(self, fn: Callable[..., Any], *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.token = CancellationToken()
+        self.signals = TaskSignals()
+
+        parameters = inspect.signature(fn).parameters
+        if 'cancellation_token' in parameters:
+            self.kwargs['cancellation_token'] = self.token
+        if 'progress_callback' in parameters:
+            self.kwargs['progress_callback'] = self.report_progress
+
+    def cancel(self):
+        """ Request cancellation. Tasks that have not started yet are skipped. """
+        self.token.cancel()
+
+    def report_progress(self, fraction: float, message: str = ''):
+        """ Emit progress given as a fraction in [0, 1]. Called from the worker thread. """
+        self.signals.progress.emit(int(round(min(max(fraction, 0.0), 1.0) * 100)), message)
+
+    def run(self):
+        try:
+            if self.token.is_cancelled():
+                self.signals.cancelled.emit()
+                return
+            result = self.fn(*self.args, **self.kwargs)
+            if self.token.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+        except OperationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            logger.error(f"Encountered exception in background task {getattr(self.fn, '__name__', self.fn)}: {traceback.format_exc()}")
+            self.signals.failed.emit(str(e))
+        finally:
+            self.signals.done.emit()
+
+class TaskRunner(QObject):
+    """
+    Starts tasks on a thread pool and keeps them alive until they are done.
+
+    ### Parameters:
+    - max_threads: maximum amount of tasks running at once. Tasks run one at a time, in order, if 1. Defaults to the amount of cores.
+    """
+    def __init__(self, max_threads: int = None, parent: QObject = None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads is not None:
+            self.pool.setMaxThreadCount(max_threads)
+        self.tasks: List[Task] = []
+
+    def start(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        on_finished: Callable[[Any], None] = None,
+        on_failed: Callable[[str], None] = None,
+        on_progress: Callable[[int, str], None] = None,
+        on_cancelled: Callable[[], None] = None,
+        on_done: Callable[[], None] = None,
+        **kwargs
+    ) -> Task:
+        """ Run fn(*args, **kwargs) on the thread pool. Handlers are called in the GUI thread. Returns the started task. """
+        task = Task(fn, *args, **kwargs)
+        for signal, handler in (
+            (task.signals.finished, on_finished),
+            (task.signals.failed, on_failed),
+            (task.signals.progress, on_progress),
+            (task.signals.cancelled, on_cancelled),
+            (task.signals.done, on_done)
+        ):
+            if handler is not None:
+                signal.connect(handler)
+        task.signals.done.connect(lambda: self._remove(task))
+        self.tasks.append(task)
+        self.pool.start(task)
+        return task
+
+    def cancel_all(self):
+        """ Request cancellation of all running and queued tasks. """
+        for task in self.tasks:
+            task.cancel()
+
+    def is_busy(self) -> bool:
+        """ Check if any tasks are running or queued. """
+        return len(self.tasks) > 0
+
+    def wait(self, msecs: int = -1) -> bool:
+        """ Block until all tasks are done or timeout in milliseconds expires. Returns True if all tasks are done. """
+        return self.pool.waitForDone(msecs)
+
+    def _remove(self, task: Task):
+        if task in self.tasks:
+            self.tasks.remove(task)
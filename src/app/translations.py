@@ -707,6 +707,14 @@ optimization_view = {
         LanguageEnum.RUS.value: "Сгенерировать оптимальную компоновку",
         LanguageEnum.JP.value: "最適なレイアウトを生成"
     },
+    'cancel_button_text': {
+        LanguageEnum.ENG_UK.value: "Cancel",
+        LanguageEnum.ENG_US.value: "Cancel",
+        LanguageEnum.CN_TRAD.value: "取消",
+        LanguageEnum.CN_SIMP.value: "取消",
+        LanguageEnum.RUS.value: "Отмена",
+        LanguageEnum.JP.value: "キャンセル"
+    },
     'save_button_text': {
         LanguageEnum.ENG_UK.value: "Save Layout",
         LanguageEnum.ENG_US.value: "Save Layout",
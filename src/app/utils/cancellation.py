@@ -0,0 +1,32 @@
+import threading
+
+"""
+Cooperative cancellation for long running operations. Independent of Qt, so controllers and packing code can use it headless.
+"""
+
+class OperationCancelled(Exception):
+    """ Raised by CancellationToken.raise_if_cancelled once cancellation has been requested. """
+
+class CancellationToken:
+    """
+    Thread-safe flag used to request cancellation of an operation running in another thread.
+    Long running code checks the token at convenient points and stops early, either by checking is_cancelled or by calling raise_if_cancelled.
+
+    ### Parameters:
+    - event: event used as flag, e.g. a multiprocessing event shared with worker processes. A new threading.Event is used if None.
+    """
+    def __init__(self, event: threading.Event = None):
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self):
+        """ Request cancellation. """
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        """ Check if cancellation has been requested. """
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """ Raise OperationCancelled if cancellation has been requested. """
+        if self._event.is_set():
+            raise OperationCancelled()
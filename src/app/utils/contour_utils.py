@@ -0,0 +1,95 @@
+import numpy as np
+
+"""
+Array operations on closed contours given as arrays of points of shape (n, 2), without repeating the first point.
+"""
+
+def get_arc_lengths(contour: np.ndarray, closed: bool = True) -> np.ndarray:
+    """ Get cumulative arc length at each point, starting at 0. Includes the closing segment back to the first point if closed. """
+    points = np.vstack((contour, contour[:1])) if closed else contour
+    return np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))))
+
+def interpolate_contour(contour: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """ Get points at given arc length positions along closed contour, found with np.searchsorted and linear interpolation. """
+    points = np.vstack((contour, contour[:1]))
+    arc_lengths = get_arc_lengths(contour)
+    n_segments = len(points) - 1
+    segment_idx = np.clip(np.searchsorted(arc_lengths, positions, side='right') - 1, 0, n_segments - 1)
+    segment_lengths = arc_lengths[segment_idx + 1] - arc_lengths[segment_idx]
+    t = np.divide(positions - arc_lengths[segment_idx], segment_lengths, out=np.zeros(len(positions)), where=segment_lengths > 0)
+    return points[segment_idx] + np.clip(t, 0, 1)[:, None] * (points[segment_idx + 1] - points[segment_idx])
+
+def decimate_contour(contour: np.ndarray, min_spacing: float) -> np.ndarray:
+    """
+    Remove points from dense areas of closed contour, keeping the first point of each stretch of min_spacing arc length.
+    Spacing is measured along the contour rather than as the distance to the last kept point, so it can be computed for all points at once.
+    Kept points at the end of the contour closer than min_spacing to the first point are removed too, so the closing segment is not shorter
+    than the others.
+    """
+    contour = np.asarray(contour, dtype=np.float64)
+    if len(contour) < 2:
+        return contour
+    buckets = np.floor(get_arc_lengths(contour, closed=False) / min_spacing)
+    decimated = contour[np.flatnonzero(np.diff(buckets, prepend=-1))]
+    far_from_start = np.flatnonzero(np.hypot(*(decimated - decimated[0]).T) >= min_spacing)
+    return decimated[:far_from_start[-1] + 1] if len(far_from_start) else decimated[:1]
+
+def densify_contour(contour: np.ndarray, spacing: float) -> np.ndarray:
+    """
+    Add points to sparse areas of closed contour. Points are inserted every spacing along each segment, until the rest of the segment
+    is shorter than twice the spacing. The result starts after the first point and ends with it, as each segment is followed by its end point.
+    """
+    contour = np.asarray(contour, dtype=np.float64)
+    if len(contour) < 2:
+        return contour
+    arc_lengths = get_arc_lengths(contour)
+    segment_lengths = np.diff(arc_lengths)
+    counts = np.maximum(np.floor(segment_lengths / spacing).astype(np.int64) - 1, 0) + 1
+
+    segment_idx = np.repeat(np.arange(len(segment_lengths)), counts)
+    steps = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    positions = np.where(
+        steps == counts[segment_idx],
+        arc_lengths[segment_idx + 1],
+        arc_lengths[segment_idx] + steps * spacing
+    )
+    return interpolate_contour(contour, positions)
+
+def simplify_contour(contour: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify closed contour with the Douglas-Peucker algorithm, removing points closer than tolerance to the simplified outline.
+    Points with minimum and maximum x and y are always kept, so the bounding box of the contour does not change. The simplified contour
+    starts at the first of these points.
+    Returns the contour unchanged if tolerance is not positive or the simplified contour would have fewer than 3 points.
+    """
+    contour = np.asarray(contour, dtype=np.float64)
+    if tolerance <= 0 or len(contour) < 4:
+        return contour
+
+    extremes = sorted({*np.argmin(contour, axis=0).tolist(), *np.argmax(contour, axis=0).tolist()})
+    contour = np.roll(contour, -extremes[0], axis=0)
+    points = np.vstack((contour, contour[:1]))
+    keep = np.zeros(len(points), dtype=bool)
+    anchors = [idx - extremes[0] for idx in extremes] + [len(contour)]
+    keep[anchors] = True
+    stack = list(zip(anchors[:-1], anchors[1:]))
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        chord = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        chord_length = np.hypot(*chord)
+        if chord_length > 0:
+            distances = np.abs(chord[0] * offsets[:, 1] - chord[1] * offsets[:, 0]) / chord_length
+        else:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.extend(((start, split), (split, end)))
+
+    simplified = contour[keep[:-1]]
+    return simplified if len(simplified) >= 3 else contour
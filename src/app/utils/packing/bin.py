@@ -3,13 +3,16 @@ Author: nagan319
 Date: 2024/09/04
 """
 
-from typing import List, Tuple, Union, Dict
+from typing import Callable, List, Tuple, Union, Dict
 import copy
 
 from .utils.area2d import Area2D
 from .utils.dimension2d import Dimension2D
 from .utils.rectangle2d import Rectangle2D
+from .utils.spatial_index import SpatialIndex
 from .utils.vector2d import Vector2D 
+from .max_rects import MaxRects, PlacementHeuristic
+from ..cancellation import CancellationToken
 
 '''
 implementation for bin edges:   
@@ -20,18 +23,44 @@ implementation for bin edges:
 '''
 
 class Bin:
-    """ Bin class to handle packing algorithm. """
-    def __init__(self, id: str, dimension: Dimension2D, edge_distance: float = 0):
+    """ 
+    Bin class to handle packing algorithm. 
+    Rotations are tried relative to each piece's current orientation, in the order given; earlier rotations win ties.
+    """
+    SIZE_DECIMALS: int = 6
+
+    def __init__(
+        self, 
+        id: str, 
+        dimension: Dimension2D, 
+        edge_distance: float = 0, 
+        heuristic: PlacementHeuristic = PlacementHeuristic.BOTTOM_LEFT, 
+        rotations: Tuple[float, ...] = (0.0,)
+    ):
+        if len(rotations) == 0:
+            raise ValueError("Bin requires at least one allowed rotation.")
         self.id = id
+        self.rotations = tuple(rotations)
         self.dimension = Dimension2D(dimension.width, dimension.height)
         self.n_placed: int = 0
         self.placed_pieces: List[Area2D] = []
-        self.free_rectangles: List[Rectangle2D] = [
-            Rectangle2D(0, 0, self.dimension.width, self.dimension.height)
-        ]
+        self.index = SpatialIndex(self.dimension.width, self.dimension.height)
+        self.free_space = MaxRects(
+            [Rectangle2D(0, 0, self.dimension.width, self.dimension.height)],
+            heuristic
+        )
         self.edge_distance = edge_distance
         if self.edge_distance > 0:
             self.add_edge_margins()
+
+    @property
+    def free_rectangles(self) -> List[Rectangle2D]:
+        """ Free rectangles managed by the bin's MaxRects free space. """
+        return self.free_space.free_rectangles
+
+    @free_rectangles.setter
+    def free_rectangles(self, free_rectangles: List[Rectangle2D]) -> None:
+        self.free_space.free_rectangles = free_rectangles
     
     """ Accessor methods """
 
@@ -61,134 +90,184 @@ class Bin:
 
     def add_edge_margins(self):
         """ Add edge margins in the case of a required 'safe edge distance' """
-        rectangles = [
+        for i, rect in enumerate(Bin.get_edge_margin_rectangles(self.dimension, self.edge_distance)):
+            edge = Area2D(id=f'edge{i}', shape=rect, shift_to_origin=False)
+            edge.prepare()
+            self.placed_pieces.append(edge)
+            self.index.insert(edge)
+            self.n_placed += 1
+        self.free_rectangles = [
+            Rectangle2D(
+                self.edge_distance, 
+                self.edge_distance, 
+                self.dimension.width - 2 * self.edge_distance, 
+                self.dimension.height - 2 * self.edge_distance
+            )
+        ]
+
+    @staticmethod
+    def get_edge_margin_rectangles(dimension: Dimension2D, edge_distance: float) -> List[Rectangle2D]:
+        """ Get rectangles covering the edge margin of a bin: bottom, top, left and right. """
+        return [
             Rectangle2D(
                 0,
                 0,
-                self.dimension.width, 
-                self.edge_distance,
+                dimension.width, 
+                edge_distance,
             ),
             Rectangle2D(
                 0,
-                self.dimension.height - self.edge_distance, 
-                self.dimension.width,
-                self.edge_distance
+                dimension.height - edge_distance, 
+                dimension.width,
+                edge_distance
             ),
             Rectangle2D(
                 0, 
-                self.edge_distance,
-                self.edge_distance,
-                self.dimension.height - (2 * self.edge_distance)
+                edge_distance,
+                edge_distance,
+                dimension.height - (2 * edge_distance)
             ),
             Rectangle2D(
-                self.dimension.width - self.edge_distance,
-                self.edge_distance,
-                self.edge_distance,
-                self.dimension.height - (2 * self.edge_distance)               
-            )
-        ]
-
-        for i, rect in enumerate(rectangles):
-            self.placed_pieces.append(Area2D(id=f'edge{i}', shape=rect, shift_to_origin=False))
-            self.n_placed += 1
-        self.free_rectangles = [
-            Rectangle2D(
-                self.edge_distance, 
-                self.edge_distance, 
-                self.dimension.width - 2 * self.edge_distance, 
-                self.dimension.height - 2 * self.edge_distance
+                dimension.width - edge_distance,
+                edge_distance,
+                edge_distance,
+                dimension.height - (2 * edge_distance)               
             )
         ]
 
     def add_immovable_part(self, piece: Area2D):
-        """ Adds pre-placed part at indicated coordinate. """
+        """ Adds pre-placed part at indicated coordinate. Its geometry is prepared, as it is tested against every later placement. """
         if piece.get_bb().width > self.dimension.width or piece.get_bb().height > self.dimension.height:
             raise ValueError(f"Attempted to place part of size ({piece.get_bb().width}, {piece.get_bb().height}) given a bin size of ({self.dimension.width}, {self.dimension.height})")
+        piece.prepare()
         Bin.update_rectangles(piece, self.free_rectangles)
         self.placed_pieces.append(piece)
+        self.index.insert(piece)
         self.n_placed += 1
 
     """ Packing algorithm """
 
-    def pack(self, to_place: List[Area2D]) -> List[Area2D]:
-        """ Main packing strategy. Returns list of unplaced pieces. """
-        sorted_pieces = sorted(to_place, key=lambda p: p.get_area(), reverse=True)
+    def pack(
+        self, 
+        to_place: List[Area2D], 
+        sort: bool = True, 
+        cancellation_token: CancellationToken = None, 
+        progress_callback: Callable[[Area2D, bool], None] = None
+    ) -> List[Area2D]:
+        """ 
+        Main packing strategy. Returns list of unplaced pieces. 
+        Pieces are placed largest first, or in the given order if sort is False.
+        Once a piece fails to fit, further copies with the same geometry and rotation are not retried, as the bin has not changed since.
+        If cancellation is requested, packing stops before the next piece and the remaining pieces are returned as unplaced.
+        progress_callback is called with each piece and whether it was placed.
+        """
+        sorted_pieces = sorted(to_place, key=lambda p: p.get_area(), reverse=True) if sort else list(to_place)
         remaining_pieces = []
+        failed_geometries = set()
 
-        for piece in sorted_pieces:
-            best_placement_idx = Bin.get_best_placement(piece, self.free_rectangles, self.placed_pieces, self.dimension)
+        for i, piece in enumerate(sorted_pieces):
+            if cancellation_token is not None and cancellation_token.is_cancelled():
+                remaining_pieces.extend(sorted_pieces[i:])
+                break
 
-            if best_placement_idx != -1:
+            geometry = (piece.get_geometry_key(), piece.get_rotation())
+            if geometry in failed_geometries:
+                remaining_pieces.append(piece)
+                if progress_callback is not None:
+                    progress_callback(piece, False)
+                continue
+
+            best_placement = self.get_best_rotated_placement(piece)
+
+            if best_placement is not None:
+                rotation, best_placement_idx = best_placement
                 best_placement_rectangle = self.free_rectangles[best_placement_idx]
-                piece.move(Vector2D(best_placement_rectangle.min_x, best_placement_rectangle.min_y))
+                piece.place_rotated(rotation, best_placement_rectangle.min_x, best_placement_rectangle.min_y)
                 
                 Bin.update_rectangles(piece, self.free_rectangles)
                 
                 self.placed_pieces.append(piece)
+                self.index.insert(piece)
                 self.n_placed += 1
             else:
+                failed_geometries.add(geometry)
                 remaining_pieces.append(piece)
 
+            if progress_callback is not None:
+                progress_callback(piece, best_placement is not None)
+
         return remaining_pieces
 
+    def get_best_rotated_placement(self, piece: Area2D) -> Union[Tuple[float, int], None]:
+        """ 
+        Find best placement of piece across allowed rotations. Rotations with a bounding box already tried are skipped, as they cannot place differently.
+        Returns tuple of (absolute rotation, free rectangle index) or None if no valid placement is found.
+        """
+        best_placement = None
+        best_score = None
+        tried_sizes = set()
+
+        for rotation in self.rotations:
+            absolute_rotation = (piece.get_rotation() + rotation) % 360
+            _, width, height = piece.get_rotated_shape(absolute_rotation)
+            size = (round(width, Bin.SIZE_DECIMALS), round(height, Bin.SIZE_DECIMALS))
+            if size in tried_sizes:
+                continue
+            tried_sizes.add(size)
+
+            placement_idx, score = Bin._get_scored_placement(
+                width, height, self.free_rectangles, self.placed_pieces, self.index, self.free_space.heuristic
+            )
+            if placement_idx != -1 and (best_score is None or score < best_score):
+                best_placement = (absolute_rotation, placement_idx)
+                best_score = score
+
+        return best_placement
+
     @staticmethod
-    def get_best_placement(piece: Area2D, free_rectangles: List[Rectangle2D], other_pieces: List[Area2D], bin_dimensions: Dimension2D) -> int:
-        """ Iterates through top-left corners of free rectangles, progressing across x and y coordinates.
+    def get_best_placement(
+        piece: Area2D, 
+        free_rectangles: List[Rectangle2D], 
+        other_pieces: List[Area2D], 
+        bin_dimensions: Dimension2D, 
+        index: SpatialIndex = None, 
+        heuristic: PlacementHeuristic = PlacementHeuristic.BOTTOM_LEFT
+    ) -> int:
+        """ Iterates through top-left corners of free rectangles the piece fits into, in the order given by the placement heuristic.
             Returns the index of the first available position for placement in the original list or -1 if no valid placement is found.
+            If a spatial index is given, only pieces whose bounding boxes overlap the candidate are tested for intersection.
         """
         piece_bb = piece.get_bb()
-        indexed_rectangles = [(i, r) for i, r in enumerate(free_rectangles)]
-        sorted_indexed_rectangles = sorted(indexed_rectangles, key=lambda item: (item[1].min_x, item[1].min_y))
-
-        for original_idx, rectangle in sorted_indexed_rectangles:
-            placed_piece = Area2D(shape=Rectangle2D(rectangle.min_x, rectangle.min_y, piece_bb.width, piece_bb.height))
-            if placed_piece.get_bb().fits_inside(rectangle):
-                intersection = False
-                for i, piece in enumerate(other_pieces):
-                    if placed_piece.intersection(piece, plot=True, filename=str(i)):
-                        intersection = True
-                if not intersection:
-                    return original_idx 
-
-        return -1 
+        placement_idx, _ = Bin._get_scored_placement(piece_bb.width, piece_bb.height, free_rectangles, other_pieces, index, heuristic)
+        return placement_idx
+
+    @staticmethod
+    def _get_scored_placement(
+        width: float, 
+        height: float, 
+        free_rectangles: List[Rectangle2D], 
+        other_pieces: List[Area2D], 
+        index: SpatialIndex, 
+        heuristic: PlacementHeuristic
+    ) -> Tuple[int, Union[Tuple[float, ...], None]]:
+        """ Get index and heuristic score of first valid placement for bounding box of given size. Returns (-1, None) if no valid placement is found. """
+        for original_idx in MaxRects.sort_candidates(free_rectangles, width, height, heuristic):
+            rectangle = free_rectangles[original_idx]
+            candidate = Rectangle2D(rectangle.min_x, rectangle.min_y, width, height)
+            placed_piece = Area2D(shape=candidate)
+            nearby_pieces = index.query(candidate) if index is not None else other_pieces
+            if not any(other.intersects(placed_piece) for other in nearby_pieces):
+                return original_idx, MaxRects.score(rectangle, width, height, heuristic)
+
+        return -1, None
     
     @staticmethod
     def update_rectangles(piece: Area2D, free_rectangles: List[Rectangle2D]):
         """ Updates free rectangle array to reflect addition of newly-placed piece.
-            All affected rectangles are split into up to 4 pieces around the newly-placed piece.
+            All affected rectangles are split into up to 4 maximal rectangles around the newly-placed piece, 
+            and rectangles contained in other free rectangles are pruned.
         """
-        piece_bb = piece.get_bb()
-        to_add = []
-        
-        for rectangle in free_rectangles[:]:  
-            if rectangle.intersects(piece_bb):
-                free_rectangles.remove(rectangle)
-
-                margin_values: Dict[str, float] = {
-                    'top': max(0, piece_bb.min_y - rectangle.min_y),
-                    'right': max(0, rectangle.max_x - piece_bb.max_x),
-                    'bottom': max(0, rectangle.max_y - piece_bb.max_y),
-                    'left': max(0, piece_bb.min_x - rectangle.min_x)
-                }
-
-                '''
-                splitting scheme:
-                T T T
-                L X R
-                B B R
-                '''
-                margin_rectangles: List[Tuple[str, Tuple[float, float, float, float]]] = [
-                    ('top', (rectangle.min_x, rectangle.min_y, rectangle.width, margin_values['top'])),
-                    ('right', (piece_bb.max_x, piece_bb.min_y, margin_values['right'], rectangle.height - margin_values['top'])),
-                    ('bottom', (rectangle.min_x, piece_bb.max_y, rectangle.width - margin_values['right'], margin_values['bottom'])),
-                    ('left', (rectangle.min_x, piece_bb.min_y, margin_values['left'], rectangle.height - margin_values['top'] - margin_values['bottom']))
-                ]
-                
-                for margin, rect_params in margin_rectangles:
-                    if margin_values[margin] > 0:
-                        to_add.append(Rectangle2D(*rect_params))
-        
-        free_rectangles.extend(to_add)
+        MaxRects.split_rectangles(piece.get_bb(), free_rectangles)
 
     def __repr__(self) -> str:
         """Return a string representation of the Bin object."""
@@ -0,0 +1,200 @@
+import enum
+import os
+import re
+from typing import Dict, Iterator, List, TextIO, Tuple, Union
+
+from shapely.geometry import Polygon
+
+from .bin import Bin
+from .nfp_bin import NFPBin
+
+"""
+Vector export of packed layouts. One file is written per plate, streamed directly from the placed pieces of each bin.
+"""
+
+class ExportFormat(enum.Enum):
+    """
+    File formats supported by export_layout.
+    - SVG: scalable vector graphics in millimeters, for viewing and documentation.
+    - DXF: AutoCAD R12 ASCII DXF with closed POLYLINE entities, readable by most CAM software.
+    """
+    SVG = 'svg'
+    DXF = 'dxf'
+
+class ExportLayers:
+    """ Layer names in DXF files, and group ids in SVG files. """
+    PLATE: str = 'PLATE'
+    CONTOURS: str = 'CONTOURS'
+    PARTS: str = 'PARTS'
+
+DXF_LAYER_COLORS = {ExportLayers.PLATE: 7, ExportLayers.CONTOURS: 1, ExportLayers.PARTS: 5}
+
+Ring = List[Tuple[float, float]]
+
+def export_layout(
+    bins: List[Union[Bin, NFPBin]],
+    directory: str,
+    format: ExportFormat = ExportFormat.SVG,
+    conversion_factor: float = 1.0,
+    precision: int = 3,
+    part_rings: Dict[str, List[Ring]] = None
+) -> List[str]:
+    """
+    Write one file per bin containing the plate outline, existing plate contours and placed part outlines.
+    Returns paths of written files, named after bin ids.
+
+    Parameters:
+    - bins: packed bins, e.g. Layout.used_bins.
+    - directory: existing output directory.
+    - format: ExportFormat.SVG or ExportFormat.DXF.
+    - conversion_factor: factor applied to all coordinates.
+    - precision: decimal places of written coordinates.
+    - part_rings: rings of placed parts by piece id, written instead of their packed shapes, e.g. original contours of parts packed
+        with simplified outlines.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Export directory {directory} does not exist.")
+    write = write_svg if format == ExportFormat.SVG else write_dxf
+
+    paths = []
+    for bin in bins:
+        path = os.path.join(directory, f"{get_safe_filename(bin.id)}.{format.value}")
+        with open(path, 'w', encoding='utf-8', newline='\n') as stream:
+            write(bin, stream, conversion_factor, precision, part_rings)
+        paths.append(path)
+    return paths
+
+def get_safe_filename(id: str) -> str:
+    """ Replace characters not allowed in filenames. """
+    return re.sub(r'[^A-Za-z0-9._-]', '_', id) or 'plate'
+
+def iter_layer_rings(bin: Union[Bin, NFPBin], part_rings: Dict[str, List[Ring]] = None) -> Iterator[Tuple[str, str, List[Ring]]]:
+    """ 
+    Yield (layer, id, rings) of plate contours and placed parts in bin. Each outline is given as its exterior ring followed by its holes.
+    Parts with rings in part_rings are yielded with those rings instead of their shapes.
+    """
+    for piece in bin.get_placed_pieces():
+        if 'edge' in piece.id:
+            continue
+        layer = ExportLayers.CONTOURS if 'ctr' in piece.id else ExportLayers.PARTS
+        if layer == ExportLayers.PARTS and part_rings is not None and piece.id in part_rings:
+            yield layer, piece.id, part_rings[piece.id]
+            continue
+        polygons = getattr(piece.shape, 'geoms', [piece.shape])
+        for polygon in polygons:
+            if isinstance(polygon, Polygon) and not polygon.is_empty:
+                yield layer, piece.id, [list(polygon.exterior.coords)[:-1]] + [list(ring.coords)[:-1] for ring in polygon.interiors]
+
+def get_plate_ring(bin: Union[Bin, NFPBin]) -> Ring:
+    """ Get plate outline as ring. """
+    width, height = bin.dimension.width, bin.dimension.height
+    return [(0.0, 0.0), (width, 0.0), (width, height), (0.0, height)]
+
+def _format(value: float, precision: int) -> str:
+    """ Format coordinate with given amount of decimal places, dropping trailing zeros. """
+    text = f"{value:.{precision}f}".rstrip('0').rstrip('.')
+    return '0' if text in ('', '-0') else text
+
+""" SVG """
+
+def write_svg(
+    bin: Union[Bin, NFPBin],
+    stream: TextIO,
+    conversion_factor: float = 1.0,
+    precision: int = 3,
+    part_rings: Dict[str, List[Ring]] = None
+):
+    """
+    Write bin as SVG document to text stream, one path per outline.
+    Units are millimeters if layout coordinates are. The y axis points down, matching previews.
+    """
+    width, height = (_format(dim * conversion_factor, precision) for dim in (bin.dimension.width, bin.dimension.height))
+    stream.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    stream.write(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}mm" height="{height}mm" viewBox="0 0 {width} {height}">\n'
+    )
+    stream.write(f'<title>{_escape(bin.id)}</title>\n')
+    stream.write('<g fill="none" stroke-linejoin="round">\n')
+
+    stream.write(f'<g id="{ExportLayers.PLATE}" stroke="#000000" stroke-width="0.5">\n')
+    stream.write(f'<path d="{_svg_path([get_plate_ring(bin)], conversion_factor, precision)}"/>\n')
+    stream.write('</g>\n')
+
+    for layer, color in ((ExportLayers.CONTOURS, '#cc0000'), (ExportLayers.PARTS, '#0000cc')):
+        stream.write(f'<g id="{layer}" stroke="{color}" stroke-width="0.25" fill-rule="evenodd">\n')
+        for piece_layer, id, rings in iter_layer_rings(bin, part_rings):
+            if piece_layer == layer:
+                stream.write(f'<path id="{_escape(id)}" d="{_svg_path(rings, conversion_factor, precision)}"/>\n')
+        stream.write('</g>\n')
+
+    stream.write('</g>\n</svg>\n')
+
+def _svg_path(rings: List[Ring], conversion_factor: float, precision: int) -> str:
+    """ Get SVG path data of closed rings. """
+    commands = []
+    for ring in rings:
+        points = ' '.join(f"{_format(x * conversion_factor, precision)},{_format(y * conversion_factor, precision)}" for x, y in ring)
+        commands.append(f"M{points}Z")
+    return ''.join(commands)
+
+def _escape(text: str) -> str:
+    """ Escape text for use in XML attributes. """
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+""" DXF """
+
+def write_dxf(
+    bin: Union[Bin, NFPBin],
+    stream: TextIO,
+    conversion_factor: float = 1.0,
+    precision: int = 3,
+    part_rings: Dict[str, List[Ring]] = None
+):
+    """
+    Write bin as AutoCAD R12 ASCII DXF to text stream, with one closed POLYLINE per ring on the PLATE, CONTOURS and PARTS layers.
+    The y axis is flipped so the drawing has the same orientation as previews, with the plate's minimum corner at the origin.
+    """
+    height = bin.dimension.height
+
+    def write_pairs(*pairs):
+        stream.write(''.join(f"{code}\n{value}\n" for code, value in pairs))
+
+    def write_polyline(layer: str, ring: Ring):
+        write_pairs((0, 'POLYLINE'), (8, layer), (66, 1), (10, 0), (20, 0), (30, 0), (70, 1))
+        for x, y in ring:
+            write_pairs(
+                (0, 'VERTEX'), (8, layer),
+                (10, _format(x * conversion_factor, precision)),
+                (20, _format((height - y) * conversion_factor, precision)),
+                (30, 0)
+            )
+        write_pairs((0, 'SEQEND'), (8, layer))
+
+    write_pairs(
+        (0, 'SECTION'), (2, 'HEADER'),
+        (9, '$ACADVER'), (1, 'AC1009'),
+        (9, '$EXTMIN'), (10, 0), (20, 0), (30, 0),
+        (9, '$EXTMAX'),
+        (10, _format(bin.dimension.width * conversion_factor, precision)),
+        (20, _format(height * conversion_factor, precision)),
+        (30, 0),
+        (0, 'ENDSEC')
+    )
+
+    write_pairs(
+        (0, 'SECTION'), (2, 'TABLES'),
+        (0, 'TABLE'), (2, 'LTYPE'), (70, 1),
+        (0, 'LTYPE'), (2, 'CONTINUOUS'), (70, 0), (3, 'Solid line'), (72, 65), (73, 0), (40, 0.0),
+        (0, 'ENDTAB'),
+        (0, 'TABLE'), (2, 'LAYER'), (70, len(DXF_LAYER_COLORS))
+    )
+    for layer, color in DXF_LAYER_COLORS.items():
+        write_pairs((0, 'LAYER'), (2, layer), (70, 0), (62, color), (6, 'CONTINUOUS'))
+    write_pairs((0, 'ENDTAB'), (0, 'ENDSEC'))
+
+    write_pairs((0, 'SECTION'), (2, 'ENTITIES'))
+    write_polyline(ExportLayers.PLATE, get_plate_ring(bin))
+    for layer, _, rings in iter_layer_rings(bin, part_rings):
+        for ring in rings:
+            write_polyline(layer, ring)
+    write_pairs((0, 'ENDSEC'), (0, 'EOF'))
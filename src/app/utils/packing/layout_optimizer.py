@@ -0,0 +1,229 @@
+import math
+import random
+import time
+from typing import Callable, List, NamedTuple, Tuple, Union
+
+from .bin import Bin
+from .nfp_bin import NFPBin
+from .utils.area2d import Area2D
+from .progress import PackingProgress, ProgressCallback, ProgressReporter
+from ..cancellation import CancellationToken
+
+class Layout(NamedTuple):
+    """ Result of packing pieces into a sequence of bins. """
+    used_bins: List[Union[Bin, NFPBin]]
+    free_bins: List[Union[Bin, NFPBin]]
+    unplaced: List[Area2D]
+
+class LayoutScore(NamedTuple):
+    """
+    Score of layout, compared lexicographically. Lower scores are better.
+    - unplaced: number of pieces that could not be placed.
+    - plates_used: number of bins containing at least one piece.
+    - used_area: total area of used bins, preferring smaller plates.
+    - leftover_utilization: utilization of the emptiest used bin, preferring layouts that leave one large usable remnant.
+    """
+    unplaced: int
+    plates_used: int
+    used_area: float
+    leftover_utilization: float
+
+class Genome(NamedTuple):
+    """ Piece order, as indices into the optimizer's pieces, and starting rotation of each piece in degrees. """
+    order: Tuple[int, ...]
+    rotations: Tuple[float, ...]
+
+def is_movable(piece: Area2D) -> bool:
+    """ Check if placed piece is a packed part rather than an edge margin or plate contour. """
+    return 'edge' not in piece.id and 'ctr' not in piece.id
+
+def get_utilization(layout: Layout) -> float:
+    """ Get area of placed pieces divided by total area of used bins, or 0 if no bins are used. """
+    bin_area = sum(bin.dimension.width * bin.dimension.height for bin in layout.used_bins)
+    if bin_area == 0:
+        return 0.0
+    return sum(piece.get_area() for bin in layout.used_bins for piece in bin.placed_pieces if is_movable(piece)) / bin_area
+
+def get_layout_progress(layout: Layout, n_pieces: int, fraction: float, evaluations: int = 0) -> PackingProgress:
+    """ Get progress snapshot describing layout of n_pieces pieces. """
+    return PackingProgress(
+        min(max(fraction, 0.0), 1.0),
+        n_pieces - len(layout.unplaced),
+        n_pieces,
+        len(layout.used_bins) + len(layout.free_bins),
+        get_utilization(layout),
+        evaluations
+    )
+
+def score_layout(layout: Layout) -> LayoutScore:
+    """ Score layout by unplaced pieces, plates used, plate area used and utilization of the emptiest plate. """
+    utilizations = [
+        sum(piece.get_area() for piece in bin.placed_pieces if is_movable(piece)) / (bin.dimension.width * bin.dimension.height)
+        for bin in layout.used_bins
+    ]
+    return LayoutScore(
+        len(layout.unplaced),
+        len(layout.used_bins),
+        sum(bin.dimension.width * bin.dimension.height for bin in layout.used_bins),
+        min(utilizations, default=0.0)
+    )
+
+class LayoutOptimizer:
+    """
+    Searches over piece order and starting rotation for the layout with the best LayoutScore.
+    Pieces are packed in the order given by a genome, without the area sort done by a single greedy pass.
+
+    Search strategy:
+    - the greedy ordering (largest area first, no rotation) is evaluated first, so the result is never worse than a single pass.
+    - local search mutates the current genome by swapping or moving pieces in the order, or changing the starting rotation of a piece.
+      Mutations that do not worsen the score are accepted, allowing moves across plateaus.
+    - after `restart_after` evaluations without improvement, the search restarts from a randomized largest-first ordering.
+    The search stops once the time budget in seconds or the maximum amount of evaluations is reached. Results are reproducible for a
+    given seed when limited by evaluations only, with time_budget None.
+
+    The search also stops once cancellation is requested, returning the best layout found so far. If the greedy ordering itself is
+    interrupted, the partially packed layout is returned, with the remaining pieces unplaced.
+
+    ### Parameters:
+    - pack_layout: function packing pieces, in the given order, into fresh bins. 
+        Called as pack_layout(pieces, cancellation_token) when optimize is given a cancellation token, so it can stop mid-layout.
+    - pieces: unplaced template pieces; copies are created for each evaluation.
+    - rotations: starting rotations to choose from, relative to each template's rotation.
+    - time_budget: wall-clock seconds for the search, or None for no time limit. Requires max_evaluations if None.
+    - max_evaluations: maximum amount of layouts evaluated, or None for no limit.
+    """
+    DEFAULT_RESTART_AFTER: int = 50
+    SHUFFLE_NOISE: float = 0.3
+    MAX_SWAP_DISTANCE: int = 8
+
+    def __init__(
+        self,
+        pack_layout: Callable[[List[Area2D]], Layout],
+        pieces: List[Area2D],
+        rotations: Tuple[float, ...] = (0.0,),
+        time_budget: float = 1.0,
+        seed: int = 0,
+        max_evaluations: int = None,
+        restart_after: int = DEFAULT_RESTART_AFTER
+    ):
+        if time_budget is not None and time_budget < 0:
+            raise ValueError(f"Time budget must not be negative, not {time_budget}")
+        if time_budget is None and max_evaluations is None:
+            raise ValueError("Search must be limited by a time budget or a maximum amount of evaluations.")
+        self.pack_layout = pack_layout
+        self.pieces = pieces
+        self.rotations = tuple(rotations) if rotations else (0.0,)
+        self.time_budget = time_budget
+        self.max_evaluations = max_evaluations
+        self.restart_after = restart_after
+        self.rng = random.Random(seed)
+        self.n_evaluations: int = 0
+        self.best_genome: Genome = None
+
+    def optimize(self, cancellation_token: CancellationToken = None, progress_callback: ProgressCallback = None) -> Tuple[Layout, LayoutScore]:
+        """ 
+        Run search and return best layout found along with its score. The genome of the best layout is stored in best_genome.
+        progress_callback receives the progress of the best layout after evaluations, at most every ProgressReporter.DEFAULT_INTERVAL seconds.
+        """
+        start = time.monotonic()
+        deadline = start + self.time_budget if self.time_budget is not None else math.inf
+        self.n_evaluations = 0
+        reporter = ProgressReporter(progress_callback)
+
+        genome = self.get_greedy_genome()
+        layout, score = self.evaluate(genome, cancellation_token)
+        best_layout, best_score = layout, score
+        self.best_genome = genome
+        current_genome, current_score = genome, score
+        since_improvement = 0
+
+        while len(self.pieces) > 1 and not self._is_finished(deadline, cancellation_token):
+            reporter.report(get_layout_progress(best_layout, len(self.pieces), self._get_fraction(start), self.n_evaluations))
+            restart = since_improvement >= self.restart_after
+            candidate = self.get_random_genome() if restart else self.mutate(current_genome)
+
+            layout, score = self.evaluate(candidate, cancellation_token)
+            if restart or score <= current_score:
+                current_genome, current_score = candidate, score
+            improved = score < best_score
+            if improved:
+                best_layout, best_score = layout, score
+                self.best_genome = candidate
+            since_improvement = 0 if improved or restart else since_improvement + 1
+
+        reporter.report(get_layout_progress(best_layout, len(self.pieces), 1.0, self.n_evaluations), force=True)
+        return best_layout, best_score
+
+    def _is_finished(self, deadline: float, cancellation_token: CancellationToken = None) -> bool:
+        """ Check if time budget or evaluation limit has been reached, or cancellation has been requested. """
+        if cancellation_token is not None and cancellation_token.is_cancelled():
+            return True
+        if self.max_evaluations is not None and self.n_evaluations >= self.max_evaluations:
+            return True
+        return time.monotonic() >= deadline
+
+    def _get_fraction(self, start: float) -> float:
+        """ Get share of time budget or evaluation limit used since start, whichever is larger. """
+        if self.time_budget is None:
+            fraction = 0.0
+        else:
+            fraction = (time.monotonic() - start) / self.time_budget if self.time_budget > 0 else 1.0
+        if self.max_evaluations:
+            fraction = max(fraction, self.n_evaluations / self.max_evaluations)
+        return min(fraction, 1.0)
+
+    """ Genomes """
+
+    def get_greedy_genome(self) -> Genome:
+        """ Get genome matching a single greedy pass: largest bounding box first, then largest area first. """
+        order = sorted(range(len(self.pieces)), key=lambda i: self.pieces[i].get_bb().area, reverse=True)
+        order = sorted(order, key=lambda i: self.pieces[i].get_area(), reverse=True)
+        return Genome(tuple(order), tuple(0.0 for _ in self.pieces))
+
+    def get_random_genome(self) -> Genome:
+        """ Get randomized largest-first genome, with areas perturbed by random noise and random starting rotations. """
+        order = sorted(
+            range(len(self.pieces)),
+            key=lambda i: self.pieces[i].get_area() * self.rng.uniform(1 - self.SHUFFLE_NOISE, 1 + self.SHUFFLE_NOISE),
+            reverse=True
+        )
+        return Genome(tuple(order), tuple(self.rng.choice(self.rotations) for _ in self.pieces))
+
+    def mutate(self, genome: Genome) -> Genome:
+        """ Get copy of genome with two pieces swapped, one piece moved, or the starting rotation of one piece changed. """
+        order, rotations = list(genome.order), list(genome.rotations)
+        n = len(order)
+        operation = self.rng.randrange(3) if len(self.rotations) > 1 else self.rng.randrange(2)
+
+        if operation == 0:
+            i = self.rng.randrange(n - 1)
+            j = min(n - 1, i + self.rng.randint(1, self.MAX_SWAP_DISTANCE))
+            order[i], order[j] = order[j], order[i]
+        elif operation == 1:
+            i, j = self.rng.sample(range(n), 2)
+            order.insert(j, order.pop(i))
+        else:
+            piece_idx = self.rng.randrange(n)
+            rotations[piece_idx] = self.rng.choice([r for r in self.rotations if r != rotations[piece_idx]])
+
+        return Genome(tuple(order), tuple(rotations))
+
+    """ Evaluation """
+
+    def evaluate(self, genome: Genome, cancellation_token: CancellationToken = None) -> Tuple[Layout, LayoutScore]:
+        """ Pack copies of pieces in genome order and starting rotations. Packing stops early if cancellation is requested. """
+        pieces = [LayoutOptimizer.copy_piece(self.pieces[i], genome.rotations[i]) for i in genome.order]
+        layout = self.pack_layout(pieces) if cancellation_token is None else self.pack_layout(pieces, cancellation_token)
+        self.n_evaluations += 1
+        return layout, score_layout(layout)
+
+    @staticmethod
+    def copy_piece(template: Area2D, rotation: float = 0.0) -> Area2D:
+        """ Create unplaced copy of template piece sharing its geometry, turned by rotation relative to the template. """
+        piece = Area2D(id=template.id, shape=template, edge_margin=template.edge_margin)
+        piece.share_geometry(template)
+        piece.rotation = template.rotation
+        if rotation % 360 != 0:
+            x, y = template.get_position()
+            piece.place_rotated(template.rotation + rotation, x, y)
+        return piece
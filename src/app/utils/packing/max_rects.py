@@ -0,0 +1,99 @@
+import enum
+from typing import List, Tuple
+
+from .utils.rectangle2d import Rectangle2D
+
+class PlacementHeuristic(enum.Enum):
+    """
+    Rules for choosing between free rectangles a piece fits into.
+    - BOTTOM_LEFT: lowest x, then lowest y coordinate.
+    - BEST_SHORT_SIDE_FIT: smallest leftover along the shorter side of the free rectangle.
+    - BEST_AREA_FIT: smallest free rectangle by area.
+    """
+    BOTTOM_LEFT = 0
+    BEST_SHORT_SIDE_FIT = 1
+    BEST_AREA_FIT = 2
+
+class MaxRects:
+    """
+    Maximal-rectangles free space manager.
+    Free space is stored as a list of possibly overlapping rectangles, each of which is as large as possible.
+    Placing a piece splits every free rectangle it intersects into up to four maximal rectangles, after which
+    rectangles contained in other free rectangles are pruned, keeping the list from growing without bound.
+    """
+    def __init__(self, free_rectangles: List[Rectangle2D], heuristic: PlacementHeuristic = PlacementHeuristic.BOTTOM_LEFT):
+        self.free_rectangles: List[Rectangle2D] = free_rectangles
+        self.heuristic = heuristic
+
+    def split(self, occupied: Rectangle2D) -> None:
+        """ Update free rectangles to reflect newly-occupied area. """
+        MaxRects.split_rectangles(occupied, self.free_rectangles)
+
+    def get_candidates(self, width: float, height: float) -> List[int]:
+        """ Get indices of free rectangles that can fit a piece of given size, ordered from best to worst. """
+        return MaxRects.sort_candidates(self.free_rectangles, width, height, self.heuristic)
+
+    @staticmethod
+    def split_rectangles(occupied: Rectangle2D, free_rectangles: List[Rectangle2D]) -> None:
+        """
+        Split all free rectangles intersecting the occupied rectangle into maximal rectangles around it and prune the result.
+        The list is modified in place.
+        """
+        to_add = []
+
+        for rectangle in free_rectangles[:]:
+            if not rectangle.intersects(occupied):
+                continue
+            free_rectangles.remove(rectangle)
+
+            if occupied.min_x > rectangle.min_x:
+                to_add.append(Rectangle2D(rectangle.min_x, rectangle.min_y, occupied.min_x - rectangle.min_x, rectangle.height))
+            if occupied.max_x < rectangle.max_x:
+                to_add.append(Rectangle2D(occupied.max_x, rectangle.min_y, rectangle.max_x - occupied.max_x, rectangle.height))
+            if occupied.min_y > rectangle.min_y:
+                to_add.append(Rectangle2D(rectangle.min_x, rectangle.min_y, rectangle.width, occupied.min_y - rectangle.min_y))
+            if occupied.max_y < rectangle.max_y:
+                to_add.append(Rectangle2D(rectangle.min_x, occupied.max_y, rectangle.width, rectangle.max_y - occupied.max_y))
+
+        if not to_add:
+            return
+
+        free_rectangles.extend(to_add)
+        MaxRects.prune(free_rectangles)
+
+    @staticmethod
+    def prune(free_rectangles: List[Rectangle2D]) -> None:
+        """ Remove free rectangles that are contained in another free rectangle, including duplicates. The list is modified in place. """
+        pruned: List[Rectangle2D] = []
+        for rectangle in sorted(free_rectangles, key=lambda r: r.area, reverse=True):
+            if not any(other.contains(rectangle) for other in pruned):
+                pruned.append(rectangle)
+        free_rectangles[:] = pruned
+
+    @staticmethod
+    def sort_candidates(free_rectangles: List[Rectangle2D], width: float, height: float, heuristic: PlacementHeuristic = PlacementHeuristic.BOTTOM_LEFT) -> List[int]:
+        """ Get indices of free rectangles that fit a piece of given size, sorted by heuristic score. """
+        candidates = [
+            (MaxRects.score(rectangle, width, height, heuristic), i)
+            for i, rectangle in enumerate(free_rectangles)
+            if width <= rectangle.width and height <= rectangle.height
+        ]
+        candidates.sort()
+        return [i for _, i in candidates]
+
+    @staticmethod
+    def score(rectangle: Rectangle2D, width: float, height: float, heuristic: PlacementHeuristic) -> Tuple[float, ...]:
+        """ Score placement of piece of given size in free rectangle. Lower scores are better. """
+        if heuristic == PlacementHeuristic.BOTTOM_LEFT:
+            return (rectangle.min_x, rectangle.min_y)
+
+        leftover_x = rectangle.width - width
+        leftover_y = rectangle.height - height
+        short_side, long_side = min(leftover_x, leftover_y), max(leftover_x, leftover_y)
+
+        if heuristic == PlacementHeuristic.BEST_SHORT_SIDE_FIT:
+            return (short_side, long_side, rectangle.min_x, rectangle.min_y)
+        if heuristic == PlacementHeuristic.BEST_AREA_FIT:
+            return (rectangle.area - width * height, short_side, rectangle.min_x, rectangle.min_y)
+
+        raise ValueError(f"Invalid placement heuristic {heuristic}")
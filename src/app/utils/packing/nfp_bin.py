@@ -0,0 +1,212 @@
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
+import shapely
+from shapely.affinity import translate
+from shapely.geometry.base import BaseGeometry
+
+from .bin import Bin
+from .utils.area2d import Area2D
+from .utils.dimension2d import Dimension2D
+from .utils.rectangle2d import Rectangle2D
+from .utils.no_fit_polygon import NFPCache, inner_fit_region
+from ..cancellation import CancellationToken
+
+class NFPBin:
+    """
+    Bin class for true-shape nesting using no-fit polygons.
+    Has the same interface as Bin, but places pieces by their outlines rather than bounding boxes, so parts can nest into each other's concavities.
+    For each piece and rotation, the feasible region is the inner-fit region of the bin minus the no-fit polygons of all placed and immovable pieces;
+    the piece is placed at its bottom-left vertex (lowest x, then lowest y). Rotations are tried as in Bin, with earlier rotations winning ties.
+    No-fit polygons are cached in an NFPCache, which may be shared between bins.
+    """
+    POSITION_DECIMALS: int = 6
+
+    def __init__(
+        self,
+        id: str,
+        dimension: Dimension2D,
+        edge_distance: float = 0,
+        rotations: Tuple[float, ...] = (0.0,),
+        cache: NFPCache = None
+    ):
+        if len(rotations) == 0:
+            raise ValueError("Bin requires at least one allowed rotation.")
+        self.id = id
+        self.rotations = tuple(rotations)
+        self.dimension = Dimension2D(dimension.width, dimension.height)
+        self.edge_distance = edge_distance
+        self.cache = cache if cache is not None else NFPCache()
+        self.n_placed: int = 0
+        self.placed_pieces: List[Area2D] = []
+        self.obstacles: List[Area2D] = []
+        self.movable_pieces: List[Tuple[Area2D, float, Tuple[float, float]]] = []
+        self.free_rectangles: List[Rectangle2D] = []
+        self.container: Tuple[float, float, float, float] = (
+            self.edge_distance,
+            self.edge_distance,
+            self.dimension.width - self.edge_distance,
+            self.dimension.height - self.edge_distance
+        )
+        if self.edge_distance > 0:
+            self.add_edge_margins()
+
+    """ Accessor methods """
+
+    def get_placed_pieces(self) -> List[Area2D]:
+        """ Get list of all placed pieces. """
+        return self.placed_pieces
+
+    def get_n_placed(self) -> int:
+        """ Get number of placed pieces. """
+        return self.n_placed
+
+    def get_occupied_area(self) -> float:
+        """ Get area occupied by pieces. """
+        return sum(piece.get_area() for piece in self.placed_pieces)
+
+    def get_empty_area(self) -> float:
+        """ Get area not occupied by pieces. """
+        return self.dimension.width * self.dimension.height - self.get_occupied_area()
+
+    """ Pre-packing placement (existing parts) """
+
+    def add_edge_margins(self):
+        """ Add edge margins in the case of a required 'safe edge distance'. Margins are enforced by the inner-fit region rather than as obstacles. """
+        for i, rect in enumerate(Bin.get_edge_margin_rectangles(self.dimension, self.edge_distance)):
+            self.placed_pieces.append(Area2D(id=f'edge{i}', shape=rect, shift_to_origin=False))
+            self.n_placed += 1
+
+    def add_immovable_part(self, piece: Area2D):
+        """ Adds pre-placed part at indicated coordinate. """
+        if piece.get_bb().width > self.dimension.width or piece.get_bb().height > self.dimension.height:
+            raise ValueError(f"Attempted to place part of size ({piece.get_bb().width}, {piece.get_bb().height}) given a bin size of ({self.dimension.width}, {self.dimension.height})")
+        self.obstacles.append(piece)
+        self.placed_pieces.append(piece)
+        self.n_placed += 1
+
+    """ Packing algorithm """
+
+    def pack(
+        self, 
+        to_place: List[Area2D], 
+        sort: bool = True, 
+        cancellation_token: CancellationToken = None, 
+        progress_callback: Callable[[Area2D, bool], None] = None
+    ) -> List[Area2D]:
+        """ 
+        Main packing strategy. Returns list of unplaced pieces. 
+        Pieces are placed largest first, or in the given order if sort is False.
+        Once a piece fails to fit, further copies with the same geometry and rotation are not retried, as the bin has not changed since.
+        If cancellation is requested, packing stops before the next piece and the remaining pieces are returned as unplaced.
+        progress_callback is called with each piece and whether it was placed.
+        """
+        sorted_pieces = sorted(to_place, key=lambda p: p.get_area(), reverse=True) if sort else list(to_place)
+        remaining_pieces = []
+        failed_geometries = set()
+
+        for i, piece in enumerate(sorted_pieces):
+            if cancellation_token is not None and cancellation_token.is_cancelled():
+                remaining_pieces.extend(sorted_pieces[i:])
+                break
+
+            geometry = (piece.get_geometry_key(), piece.get_rotation())
+            if geometry in failed_geometries:
+                remaining_pieces.append(piece)
+                if progress_callback is not None:
+                    progress_callback(piece, False)
+                continue
+
+            best_placement = self.get_best_rotated_placement(piece)
+
+            if best_placement is not None:
+                rotation, (x, y) = best_placement
+                piece.place_rotated(rotation, x, y)
+                self.movable_pieces.append((piece, rotation, (x, y)))
+                self.placed_pieces.append(piece)
+                self.n_placed += 1
+            else:
+                failed_geometries.add(geometry)
+                remaining_pieces.append(piece)
+
+            if progress_callback is not None:
+                progress_callback(piece, best_placement is not None)
+
+        return remaining_pieces
+
+    def get_best_rotated_placement(self, piece: Area2D) -> Union[Tuple[float, Tuple[float, float]], None]:
+        """
+        Find bottom-left placement of piece across allowed rotations.
+        Returns tuple of (absolute rotation, position of bounding box) or None if no valid placement is found.
+        """
+        best_placement = None
+
+        for rotation in self.rotations:
+            absolute_rotation = (piece.get_rotation() + rotation) % 360
+            position = self.get_placement(piece, absolute_rotation)
+            if position is None:
+                continue
+            if best_placement is None or NFPBin._score(position) < NFPBin._score(best_placement[1]):
+                best_placement = (absolute_rotation, position)
+
+        return best_placement
+
+    def get_placement(self, piece: Area2D, rotation: float) -> Union[Tuple[float, float], None]:
+        """ Get bottom-left feasible position of piece at given absolute rotation, or None if it does not fit. """
+        outline = self.cache.get_outline(piece, rotation)
+        if not outline:
+            return None
+
+        feasible_region = inner_fit_region(self.container, shapely.total_bounds(outline))
+        if feasible_region is None:
+            return None
+
+        nfps = self._get_nfps(piece, rotation, feasible_region.bounds)
+        if nfps:
+            feasible_region = feasible_region.difference(shapely.union_all(nfps))
+        if feasible_region.is_empty:
+            return None
+
+        return NFPBin._get_bottom_left(feasible_region)
+
+    def _get_nfps(self, piece: Area2D, rotation: float, region_bounds: Tuple[float, float, float, float]) -> List[BaseGeometry]:
+        """ Get no-fit polygons of piece around placed and immovable pieces in absolute coordinates, skipping those outside region bounds. """
+        nfps = []
+
+        for obstacle in self.obstacles:
+            nfp = self.cache.get_obstacle_nfp(obstacle, piece, rotation)
+            if NFPBin._bounds_overlap(nfp.bounds, region_bounds):
+                nfps.append(nfp)
+
+        for placed_piece, placed_rotation, (x, y) in self.movable_pieces:
+            nfp = self.cache.get_nfp(placed_piece, placed_rotation, piece, rotation)
+            min_x, min_y, max_x, max_y = nfp.bounds
+            if NFPBin._bounds_overlap((min_x + x, min_y + y, max_x + x, max_y + y), region_bounds):
+                nfps.append(translate(nfp, x, y))
+
+        return nfps
+
+    @staticmethod
+    def _bounds_overlap(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float]) -> bool:
+        """ Check if bounds overlap, including adjacent bounds. """
+        return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+    @staticmethod
+    def _get_bottom_left(region: BaseGeometry) -> Tuple[float, float]:
+        """ Get vertex of region with lowest x coordinate, then lowest y coordinate. """
+        coordinates = shapely.get_coordinates(region)
+        order = np.lexsort((coordinates[:, 1], np.round(coordinates[:, 0], NFPBin.POSITION_DECIMALS)))
+        x, y = coordinates[order[0]]
+        return (float(x), float(y))
+
+    @staticmethod
+    def _score(position: Tuple[float, float]) -> Tuple[float, float]:
+        """ Score position in line with PlacementHeuristic.BOTTOM_LEFT. Lower scores are better. """
+        return (round(position[0], NFPBin.POSITION_DECIMALS), round(position[1], NFPBin.POSITION_DECIMALS))
+
+    def __repr__(self) -> str:
+        """Return a string representation of the NFPBin object."""
+        placed_piece_ids = [piece.id for piece in self.placed_pieces]
+        return (f"\nNFPBin ID: {self.id}, "
+                f"Dimensions: {self.dimension.width}x{self.dimension.height}, "
+                f"Placed Pieces: {placed_piece_ids}")
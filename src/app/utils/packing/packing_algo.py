@@ -1,48 +1,149 @@
 from .bin import Bin
+from .nfp_bin import NFPBin
+from .max_rects import PlacementHeuristic
+from .utils.no_fit_polygon import NFPCache
 from .utils.dimension2d import Dimension2D
 from .utils.rectangle2d import Rectangle2D
 from .utils.area2d import Area2D
+from .utils.part_type import PartType
+from .layout_optimizer import Layout, is_movable
+from .parallel_optimizer import ParallelLayoutOptimizer
+from .progress import PackingProgress, ProgressCallback, ProgressReporter
+from ..cancellation import CancellationToken
 
-from typing import List, Tuple, Dict, Union
+from typing import Callable, List, NamedTuple, Tuple, Dict, Union
 
+import enum
 import os
 import traceback
 
-import matplotlib
-matplotlib.use('Agg')  
+RIGHT_ANGLE_ROTATIONS: Tuple[float, ...] = (0.0, 90.0, 180.0, 270.0)
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+class PackingEngine(enum.Enum):
+    """
+    Packing engines selectable in execute_packing_algorithm.
+    - RECTANGLES: pieces are placed by bounding box at free rectangle corners (Bin).
+    - NO_FIT_POLYGON: pieces are placed by outline using no-fit polygons, nesting into concavities (NFPBin). Slower, but denser for irregular parts.
+    """
+    RECTANGLES = 0
+    NO_FIT_POLYGON = 1
+
+def rotation_steps(step: float) -> Tuple[float, ...]:
+    """ Get rotations from 0 up to 360 degrees in increments of given step. """
+    if step <= 0 or step > 360:
+        raise ValueError(f"Rotation step must be in range (0, 360], not {step}")
+    n_steps = int(360 // step)
+    return tuple(i * step for i in range(n_steps) if i * step < 360)
 
 def execute_packing_algorithm(
     input_bins: List[Tuple[str, Tuple[float, float], List[Tuple[float, float]]]], 
-    input_pieces: List[Tuple[str, List[Tuple[float, float]]]],
+    input_pieces: List[Union[Tuple[str, List[Tuple[float, float]]], Tuple[str, List[Tuple[float, float]], int]]],
     bit_diameter: float,
     min_edge_distance: float,
-    preview_filename: str,
-    conversion_factor: float = 1.0
-) -> Dict[str, Union[None, Tuple[str, Tuple[float, float]]]]:
+    preview_filename: Union[str, None] = None,
+    conversion_factor: float = 1.0,
+    heuristic: PlacementHeuristic = PlacementHeuristic.BOTTOM_LEFT,
+    rotations: Tuple[float, ...] = (0.0,),
+    engine: PackingEngine = PackingEngine.RECTANGLES,
+    time_budget: float = 0.0,
+    evaluations: int = 0,
+    seed: int = 0,
+    workers: int = 1,
+    high_quality_preview: bool = False,
+    cancellation_token: CancellationToken = None,
+    progress_callback: ProgressCallback = None
+) -> Dict[str, Union[None, Tuple[str, Tuple[float, float], float]]]:
     """
     Packs pieces into bins and returns their placements.
 
     Parameters:
         input_bins: List of tuples containing (bin_id, dimensions, contours).
-        input_pieces: List of tuples containing (piece_id, contours).
-        preview_filename: File to save preview
+        input_pieces: List of tuples containing (piece_id, contours) or (part_id, contours, amount). 
+            Copies of a part given with an amount share one geometry and are placed as <part_id>__<copy index>.
+        preview_filename: File to save preview. Rendering is skipped if None; use generate_layout and plot_part_placements to render separately.
         bit_diameter: max of drill and mill bit diameter (tolerance on side of each piece)
         edge_tolerance: minimum distance from edge of plate
+        heuristic: rule for choosing between free rectangles during placement
+        rotations: rotations in degrees tried for each piece, e.g. RIGHT_ANGLE_ROTATIONS or rotation_steps(step)
+        engine: packing engine used to place pieces. The heuristic only applies to PackingEngine.RECTANGLES.
+        time_budget: seconds spent searching piece orders and rotations with LayoutOptimizer. 
+            A single greedy pass is made if 0 and evaluations is 0.
+        evaluations: layouts evaluated by each search. Without a time budget, ParallelLayoutOptimizer.DEFAULT_N_SEARCHES searches are
+            limited by evaluations only, so the same seed gives the same layout on any machine and with any amount of workers.
+            Results limited by time depend on machine speed and load.
+        seed: random seed used by LayoutOptimizer
+        workers: amount of processes searching in parallel, or None for all cores. Only used with a time budget or evaluations.
+        high_quality_preview: render preview with matplotlib (plot_part_placements) rather than the faster raster renderer (render_part_placements).
+        cancellation_token: token used to stop packing early. The best layout found so far is returned, with remaining pieces unplaced.
+        progress_callback: function receiving PackingProgress with pieces placed, bins tried and utilization of the best layout so far.
 
     Returns:
         A dictionary where:
         - key: piece_id
-        - value: None if not placed, or (bin_id, coordinates) if placed.
+        - value: None if not placed, or (bin_id, coordinates, rotation) if placed.
+    """
+    if preview_filename is not None:
+        validate_preview_filename(preview_filename)
+
+    layout = generate_layout(
+        input_bins, input_pieces, bit_diameter, min_edge_distance, heuristic, rotations, engine, time_budget, evaluations, seed, workers,
+        cancellation_token, progress_callback
+    )
+    res = get_placements(layout)
+    
+    if preview_filename is not None and len(layout.used_bins) > 0:
+        render = plot_part_placements if high_quality_preview else render_part_placements
+        render(layout.used_bins, layout.free_bins, preview_filename, conversion_factor=conversion_factor)
+
+    return res
+
+def generate_layout(
+    input_bins: List[Tuple[str, Tuple[float, float], List[Tuple[float, float]]]], 
+    input_pieces: List[Union[Tuple[str, List[Tuple[float, float]]], Tuple[str, List[Tuple[float, float]], int]]],
+    bit_diameter: float,
+    min_edge_distance: float,
+    heuristic: PlacementHeuristic = PlacementHeuristic.BOTTOM_LEFT,
+    rotations: Tuple[float, ...] = (0.0,),
+    engine: PackingEngine = PackingEngine.RECTANGLES,
+    time_budget: float = 0.0,
+    evaluations: int = 0,
+    seed: int = 0,
+    workers: int = 1,
+    cancellation_token: CancellationToken = None,
+    progress_callback: ProgressCallback = None
+) -> Layout:
+    """ 
+    Packs pieces into bins without rendering a preview. Parameters match execute_packing_algorithm.
+    Returns the packed layout, which can be converted with get_placements and rendered later with plot_part_placements.
+    If cancelled, the best layout found so far is returned, which may leave pieces unplaced.
     """
+    validate_input(input_bins, input_pieces)
+
+    if time_budget > 0 or evaluations > 0:
+        problem = PackingProblem(input_bins, input_pieces, bit_diameter, min_edge_distance, heuristic, tuple(rotations), engine)
+        optimizer = ParallelLayoutOptimizer(
+            create_packer, problem, rotations, time_budget if time_budget > 0 else None, seed, workers, max_evaluations=evaluations or None
+        )
+        layout, _ = optimizer.optimize(cancellation_token, progress_callback)
+        return layout
+
+    obstacles = build_obstacles(input_bins, bit_diameter)
+    pieces = sorted(build_pieces(input_pieces, bit_diameter), key=lambda p: p.get_bb().area, reverse=True)
+    bins = build_bins(input_bins, obstacles, min_edge_distance, heuristic, rotations, engine, NFPCache())
+    return pack_bins(bins, pieces, cancellation_token=cancellation_token, progress_callback=progress_callback)
 
+def validate_preview_filename(preview_filename: str):
+    """ Check that preview file is a png in an existing directory. """
     if not os.path.exists(os.path.dirname(preview_filename)):
         raise FileNotFoundError(f"Directory for indicated preview filepath {preview_filename} does not exist.")
     if not preview_filename.lower().endswith('.png'):
         raise ValueError(f"Preview file must be a png, not {preview_filename}.")
 
+def validate_input(
+    input_bins: List[Tuple[str, Tuple[float, float], List[Tuple[float, float]]]], 
+    input_pieces: List[Union[Tuple[str, List[Tuple[float, float]]], Tuple[str, List[Tuple[float, float]], int]]]
+):
+    """ Check ids, dimensions, amounts and coordinates of input bins and pieces. """
     for bin in input_bins:
         id, dimensions, contours = bin
         if not isinstance(id, str):
@@ -55,35 +156,75 @@ def execute_packing_algorithm(
             raise ValueError("Bin dimensions must be positive.")
 
     for piece in input_pieces:
-        id, contour = piece
+        id, contour = piece[0], piece[1]
         if not isinstance(id, str):
             raise ValueError(f"Piece ID {id} is not a string.")
+        if len(piece) == 3 and (not isinstance(piece[2], int) or piece[2] < 0):
+            raise ValueError(f"Amount of piece {id} must be a non-negative integer, not {piece[2]}")
         for point in contour: 
             if not isinstance(point, tuple) or len(point) != 2:
-                raise ValueError(f"Point {point} in piece {piece.id} is not a tuple of length 2, not {point}")
+                raise ValueError(f"Point {point} in piece {id} is not a tuple of length 2, not {point}")
             for coordinate in point:
                 if not isinstance(coordinate, float):
-                    raise ValueError(f"All coordinates in piece {piece.id} must be floats, not {coordinate}")        
+                    raise ValueError(f"All coordinates in piece {id} must be floats, not {coordinate}")        
+
+class PackingProblem(NamedTuple):
+    """ Compact, picklable description of a packing job, as passed to execute_packing_algorithm. """
+    bins: List[Tuple[str, Tuple[float, float], List[Tuple[float, float]]]]
+    pieces: List[Union[Tuple[str, List[Tuple[float, float]]], Tuple[str, List[Tuple[float, float]], int]]]
+    bit_diameter: float
+    min_edge_distance: float
+    heuristic: PlacementHeuristic
+    rotations: Tuple[float, ...]
+    engine: PackingEngine
+
+def create_packer(problem: PackingProblem) -> Tuple[Callable[[List[Area2D], CancellationToken], Layout], List[Area2D]]:
+    """ 
+    Build template pieces for problem and a function packing copies of them, in the given order, into fresh bins.
+    Plate obstacles and NFPs are built once and shared between calls.
+    """
+    obstacles = build_obstacles(problem.bins, problem.bit_diameter)
+    pieces = build_pieces(problem.pieces, problem.bit_diameter)
+    nfp_cache = NFPCache()
 
-    bins: List[Bin] = []
-    pieces: List[Area2D] = []
-    res: Dict[str, Union[None, Tuple[str, Tuple[float, float]]]] = {}
+    def pack_layout(ordered_pieces: List[Area2D], cancellation_token: CancellationToken = None) -> Layout:
+        bins = build_bins(
+            problem.bins, obstacles, problem.min_edge_distance, problem.heuristic, problem.rotations, problem.engine, nfp_cache
+        )
+        return pack_bins(bins, ordered_pieces, sort=False, cancellation_token=cancellation_token)
 
+    return pack_layout, pieces
+
+def build_obstacles(
+    input_bins: List[Tuple[str, Tuple[float, float], List[Tuple[float, float]]]], 
+    bit_diameter: float
+) -> Dict[str, List[Area2D]]:
+    """ Create immovable parts from bin contours. Returns dictionary of bin id to immovable parts, which can be added to any amount of bins. """
+    obstacles: Dict[str, List[Area2D]] = {}
     for bin in input_bins:
-        bin_id, dimensions, contours = bin
-        width, height = dimensions
-        bin_obj = Bin(bin_id, Dimension2D(width, height), min_edge_distance)
-        for i, contour in enumerate(contours):
-            part = Area2D(
+        bin_id, _, contours = bin
+        obstacles[bin_id] = [
+            Area2D(
                 bin_id+f'ctr{i}', 
                 points=contour, 
                 shift_to_origin=False,
                 edge_margin=bit_diameter
             )
-            bin_obj.add_immovable_part(part) 
-        bins.append(bin_obj)
-    
+            for i, contour in enumerate(contours)
+        ]
+    return obstacles
+
+def build_pieces(
+    input_pieces: List[Union[Tuple[str, List[Tuple[float, float]]], Tuple[str, List[Tuple[float, float]], int]]],
+    bit_diameter: float
+) -> List[Area2D]:
+    """ Create unplaced pieces from input tuples, expanding part amounts into copies sharing one geometry. """
+    pieces: List[Area2D] = []
     for piece in input_pieces:
+        if len(piece) == 3:
+            part_id, outer_contour, amount = piece
+            pieces.extend(PartType(part_id, outer_contour, amount, bit_diameter).create_instances())
+            continue
         piece_id, outer_contour = piece
         pieces.append(
             Area2D(
@@ -92,42 +233,181 @@ def execute_packing_algorithm(
                 edge_margin=bit_diameter
             )
         )
+    return pieces
 
+def build_bins(
+    input_bins: List[Tuple[str, Tuple[float, float], List[Tuple[float, float]]]], 
+    obstacles: Dict[str, List[Area2D]],
+    min_edge_distance: float,
+    heuristic: PlacementHeuristic = PlacementHeuristic.BOTTOM_LEFT,
+    rotations: Tuple[float, ...] = (0.0,),
+    engine: PackingEngine = PackingEngine.RECTANGLES,
+    nfp_cache: NFPCache = None
+) -> List[Union[Bin, NFPBin]]:
+    """ Create empty bins for selected engine, containing their immovable parts. """
+    bins: List[Union[Bin, NFPBin]] = []
+    for bin in input_bins:
+        bin_id, dimensions, _ = bin
+        width, height = dimensions
+        if engine == PackingEngine.NO_FIT_POLYGON:
+            bin_obj = NFPBin(bin_id, Dimension2D(width, height), min_edge_distance, rotations, nfp_cache)
+        else:
+            bin_obj = Bin(bin_id, Dimension2D(width, height), min_edge_distance, heuristic, rotations)
+        for part in obstacles[bin_id]:
+            bin_obj.add_immovable_part(part) 
+        bins.append(bin_obj)
+    return bins
+
+def pack_bins(
+    bins: List[Union[Bin, NFPBin]], 
+    pieces: List[Area2D], 
+    sort: bool = True,
+    cancellation_token: CancellationToken = None,
+    progress_callback: ProgressCallback = None
+) -> Layout:
+    """ 
+    Pack pieces into bins, fullest bins first. Pieces that do not fit into a bin are carried over to the next one.
+    Pieces are placed largest first within each bin, or in the given order if sort is False.
+    If cancellation is requested, packing stops before the next piece; the remaining pieces are unplaced and untried bins are left out.
+    progress_callback receives PackingProgress after placement attempts, at most every ProgressReporter.DEFAULT_INTERVAL seconds.
+    """
     bins = sorted(bins, key=lambda b: b.get_empty_area())
-    pieces = sorted(pieces, key=lambda p: p.get_bb().area, reverse=True)
 
     used_bins = []
     free_bins = [] # bins that have been selected, but lack sufficient room for placement
 
-    for bin in bins:
-        if not pieces:  
+    reporter = ProgressReporter(progress_callback)
+    n_pieces = len(pieces)
+    n_placed, placed_area, used_area = 0, 0.0, 0.0
+
+    for bin_idx, bin in enumerate(bins):
+        if not pieces or (cancellation_token is not None and cancellation_token.is_cancelled()):
             break
-        
-        pieces = bin.pack(pieces)
 
-        if bin.n_placed > 0 and any(not 'edge' in piece.id and not 'ctr' in piece.id for piece in bin.placed_pieces):
+        bin_area = bin.dimension.width * bin.dimension.height
+        n_to_place, n_attempted, n_bin_placed = len(pieces), 0, 0
+
+        def on_piece(piece: Area2D, placed: bool):
+            nonlocal n_placed, placed_area, n_attempted, n_bin_placed
+            n_attempted += 1
+            if placed:
+                n_placed += 1
+                n_bin_placed += 1
+                placed_area += piece.get_area()
+            total_area = used_area + (bin_area if n_bin_placed > 0 else 0)
+            reporter.report(PackingProgress(
+                max(n_placed / n_pieces, (bin_idx + n_attempted / n_to_place) / len(bins)),
+                n_placed,
+                n_pieces,
+                bin_idx + 1,
+                placed_area / total_area if total_area > 0 else 0.0
+            ))
+
+        pieces = bin.pack(pieces, sort=sort, cancellation_token=cancellation_token, progress_callback=on_piece if progress_callback else None)
+
+        if bin.n_placed > 0 and any(is_movable(piece) for piece in bin.placed_pieces):
             used_bins.append(bin)
-            for piece in bin.placed_pieces:
-                x, y = piece.get_position()
-                res[piece.id] = (
-                    bin.id, 
-                    (x, y)
-                )
+            used_area += bin_area
         else:
             free_bins.append(bin) 
 
-    for piece in pieces:
+    reporter.report(PackingProgress(
+        1.0, n_placed, n_pieces, len(used_bins) + len(free_bins), placed_area / used_area if used_area > 0 else 0.0
+    ), force=True)
+    return Layout(used_bins, free_bins, pieces)
+
+def get_placements(layout: Layout) -> Dict[str, Union[None, Tuple[str, Tuple[float, float], float]]]:
+    """ Get placements of pieces in layout as a dictionary of piece id to (bin_id, coordinates, rotation), or None if not placed. """
+    res: Dict[str, Union[None, Tuple[str, Tuple[float, float], float]]] = {}
+
+    for bin in layout.used_bins:
+        for piece in bin.placed_pieces:
+            x, y = piece.get_position()
+            res[piece.id] = (
+                bin.id, 
+                (x, y),
+                piece.get_rotation()
+            )
+
+    for piece in layout.unplaced:
         if piece.id not in res:
             res[piece.id] = None
-    
-    if len(used_bins) > 0:
-       plot_part_placements(used_bins, free_bins, preview_filename, conversion_factor=conversion_factor)
 
     return res
 
-def plot_part_placements(used_bins: list, free_bins: list, filename: str, scale_factor: float = 1, width: float = 18, dpi: int = 120, conversion_factor: float = 1.0, bin_height: float = 3.75):
+def get_piece_label(piece_id: str) -> str:
+    """ Get shortened piece id displayed in previews. """
+    if 'ctr' in piece_id:
+        return 'ctr'+piece_id.split('ctr')[1]
+    elif 'edge' in piece_id:
+        return piece_id
+    return piece_id[:4] + '...' + piece_id[-4:]
+
+def render_part_placements(used_bins: list, free_bins: list, filename: str, width: int = 2160, bin_height: int = 450, conversion_factor: float = 1.0) -> bool:
     """
-    Plot contours of placed pieces inside multiple bins arranged vertically.
+    Draw contours of placed pieces inside multiple bins arranged vertically, directly into an image buffer with OpenCV.
+    Much faster than plot_part_placements, which remains available for high quality output. Returns True if the image was saved, False otherwise.
+
+    Parameters:
+    - used_bins: A list of used Bin instances.
+    - free_bins: A list of unused Bin instances.
+    - filename: The file path where the image will be saved.
+    - width: Maximum width of each bin in pixels.
+    - bin_height: Maximum height of each bin in pixels.
+    - conversion_factor: Factor to scale bin and piece dimensions (e.g., convert from millimeters to inches, or scale by other units).
+    """
+    from ..raster_renderer import RasterCanvas, RasterColors, add_title, stack_images, save_image
+
+    try:
+        images = []
+        text_plot_offset = 4
+
+        for bin in used_bins + free_bins:
+            canvas = RasterCanvas(bin.dimension.width * conversion_factor, bin.dimension.height * conversion_factor, width, bin_height)
+            canvas.draw_rectangle(0, 0, bin.dimension.width * conversion_factor, bin.dimension.height * conversion_factor, thickness=2)
+
+            for piece in bin.get_placed_pieces():
+                if 'edge' in piece.id:
+                    continue
+
+                canvas.draw_polygon([(x * conversion_factor, y * conversion_factor) for x, y in piece.shape.exterior.coords], thickness=2)
+
+                piece_bb = piece.get_bb()
+                canvas.draw_rectangle(
+                    piece_bb.min_x * conversion_factor, piece_bb.min_y * conversion_factor,
+                    piece_bb.width * conversion_factor, piece_bb.height * conversion_factor,
+                    RasterColors.BOUNDING_BOX, dash=RasterCanvas.DASH_LENGTH
+                )
+                canvas.draw_label(
+                    get_piece_label(piece.id),
+                    (piece_bb.min_x + text_plot_offset) * conversion_factor, (piece_bb.min_y + text_plot_offset) * conversion_factor,
+                    RasterColors.BOUNDING_BOX
+                )
+
+            for idx, free_rect in enumerate(bin.free_rectangles):
+                canvas.draw_rectangle(
+                    free_rect.min_x * conversion_factor, free_rect.min_y * conversion_factor,
+                    free_rect.width * conversion_factor, free_rect.height * conversion_factor,
+                    RasterColors.FREE_RECTANGLE, dash=RasterCanvas.DOT_LENGTH
+                )
+                canvas.draw_label(
+                    f'{idx}',
+                    (free_rect.min_x + text_plot_offset) * conversion_factor, (free_rect.min_y + text_plot_offset) * conversion_factor,
+                    RasterColors.FREE_RECTANGLE
+                )
+
+            images.append(add_title(canvas.image, f"Bin {bin.id}"))
+
+        return save_image(stack_images(images), filename)
+
+    except Exception as e:
+        traceback.print_exc()
+        return False
+
+def plot_part_placements(used_bins: list, free_bins: list, filename: str, scale_factor: float = 1, width: float = 18, dpi: int = 120, conversion_factor: float = 1.0, bin_height: float = 3.75) -> bool:
+    """
+    Plot contours of placed pieces inside multiple bins arranged vertically with matplotlib, for high quality output. 
+    Returns True if the plot was saved, False otherwise.
 
     Parameters:
     - used_bins: A list of used Bin instances.
@@ -138,15 +418,22 @@ def plot_part_placements(used_bins: list, free_bins: list, filename: str, scale_
     - dpi: Dots per inch for the saved image.
     - conversion_factor: Factor to scale bin and piece dimensions (e.g., convert from millimeters to inches, or scale by other units).
     - bin_height: Fixed height of each bin plot (default 3.75 units).
+
+    Uses a standalone figure rather than pyplot, so previews can be rendered from worker threads. Matplotlib is imported on first use.
     """
 
     try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import matplotlib.patches as patches
 
         fig_width = width
         fig_height_per_bin = bin_height
         total_fig_height = fig_height_per_bin * (len(used_bins) + len(free_bins))
 
-        fig, axs = plt.subplots(len(used_bins) + len(free_bins), 1, figsize=(fig_width, total_fig_height), dpi=dpi)
+        fig = Figure(figsize=(fig_width, total_fig_height), dpi=dpi)
+        FigureCanvasAgg(fig)
+        axs = fig.subplots(len(used_bins) + len(free_bins), 1)
 
         if len(used_bins) + len(free_bins) == 1:
             axs = [axs]
@@ -201,12 +488,7 @@ def plot_part_placements(used_bins: list, free_bins: list, filename: str, scale_
                 label_x = (piece_bb.min_x + text_plot_offset) * conversion_factor
                 label_y = (piece_bb.min_y + text_plot_offset) * conversion_factor
 
-                if 'ctr' in piece.id:
-                    display_text = 'ctr'+piece.id.split('ctr')[1]
-                elif 'edge' in piece.id:
-                    display_text = piece.id
-                else:
-                    display_text = piece.id[:4] + '...' + piece.id[-4:]
+                display_text = get_piece_label(piece.id)
 
                 ax.text(
                     label_x, label_y,
@@ -251,10 +533,11 @@ def plot_part_placements(used_bins: list, free_bins: list, filename: str, scale_
 
             ax.set_title(f"Bin {bin.id}", fontsize=10)
 
-        plt.tight_layout()
-        plt.savefig(filename, bbox_inches='tight', facecolor='white', dpi=dpi)
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(filename, bbox_inches='tight', facecolor='white', dpi=dpi)
+        return True
 
     except Exception as e:
         traceback.print_exc()
+        return False
 
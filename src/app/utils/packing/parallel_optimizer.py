@@ -0,0 +1,200 @@
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Any, Callable, List, NamedTuple, Tuple, Union
+
+from .layout_optimizer import LayoutOptimizer, Layout, LayoutScore, Genome, get_utilization
+from .progress import PackingProgress, ProgressCallback, ProgressReporter
+from .utils.area2d import Area2D
+from ..cancellation import CancellationToken
+
+PackerFactory = Callable[[Any], Tuple[Callable[[List[Area2D]], Layout], List[Area2D]]]
+
+class SearchResult(NamedTuple):
+    """ Compact result of a single search, returned from worker processes. """
+    score: LayoutScore
+    genome: Genome
+    n_evaluations: int
+    task_idx: int
+    utilization: float
+
+_stop_event = None
+
+def init_worker(stop_event):
+    """ Store event set by the calling process to stop searches early. Runs once in each worker process. """
+    global _stop_event
+    _stop_event = stop_event
+
+def run_search(
+    create_packer: PackerFactory,
+    problem: Any,
+    rotations: Tuple[float, ...],
+    deadline: Union[float, None],
+    seed: int,
+    max_evaluations: int,
+    task_idx: int,
+    cancellation_token: CancellationToken = None,
+    progress_callback: ProgressCallback = None
+) -> SearchResult:
+    """ 
+    Build packer from problem description and run a single seeded search until the wall-clock deadline, or without time limit if it is None.
+    Runs inside worker processes.
+    The search stops early once the token, or the stop event shared by the calling process, is set.
+    """
+    if cancellation_token is None and _stop_event is not None:
+        cancellation_token = CancellationToken(_stop_event)
+    pack_layout, pieces = create_packer(problem)
+    optimizer = LayoutOptimizer(
+        pack_layout,
+        pieces,
+        rotations,
+        max(0.0, deadline - time.time()) if deadline is not None else None,
+        seed,
+        max_evaluations
+    )
+    layout, score = optimizer.optimize(cancellation_token, progress_callback)
+    return SearchResult(score, optimizer.best_genome, optimizer.n_evaluations, task_idx, get_utilization(layout))
+
+class ParallelLayoutOptimizer:
+    """
+    Runs independent LayoutOptimizer searches in a process pool and keeps the best result.
+
+    Workers receive the problem as compact picklable data (e.g. tuples of ids, sizes and contour points) and a module-level
+    `create_packer` function that builds the packer and template pieces from it, so no shapely geometries or ORM objects cross
+    process boundaries. Each search returns only its score and genome; the winning genome is replayed in the calling process to
+    recreate the layout. Ties are broken by task index. Processes are started with the 'spawn' method, which is safe to use from GUI
+    and worker threads.
+
+    Searches are limited either by time or by evaluations:
+    - with a time budget, one search runs per worker for the whole budget. Results depend on machine speed and load.
+    - without a time budget, DEFAULT_N_SEARCHES searches of max_evaluations each run on however many workers are available.
+      The amount of work does not depend on the machine, so the same seed gives the same layout everywhere, with any amount of workers.
+    If n_searches is given and exceeds the amount of workers, searches run in rounds of one search per worker, and the time budget is
+    split evenly between rounds.
+
+    Cancellation is forwarded to worker processes through a shared event, and each search returns its best result so far. Replaying the
+    winning genome is not interrupted, so cancelling takes at most one more packing pass.
+
+    ### Parameters:
+    - create_packer: picklable function returning (pack_layout, pieces) for problem.
+    - problem: picklable problem description.
+    - rotations: starting rotations searched by LayoutOptimizer.
+    - time_budget: wall-clock seconds for the whole search, including process startup, or None to limit searches by evaluations only.
+    - workers: amount of worker processes. Defaults to all cores. Searches run in the calling process if 1.
+    - n_searches: amount of independent searches. Defaults to one per worker with a time budget, and DEFAULT_N_SEARCHES without one.
+    - max_evaluations: maximum amount of layouts evaluated by each search. Required if time_budget is None.
+
+    DEFAULT_N_SEARCHES is a multiple of common core counts (2, 3, 4, 6, 8, 12, 16, 24 and 48), so searches limited by evaluations keep
+    every core of such machines busy until the last round.
+    """
+    DEFAULT_N_SEARCHES: int = 48
+
+    def __init__(
+        self,
+        create_packer: PackerFactory,
+        problem: Any,
+        rotations: Tuple[float, ...] = (0.0,),
+        time_budget: float = 1.0,
+        seed: int = 0,
+        workers: int = None,
+        n_searches: int = None,
+        max_evaluations: int = None
+    ):
+        if time_budget is not None and time_budget < 0:
+            raise ValueError(f"Time budget must not be negative, not {time_budget}")
+        if time_budget is None and max_evaluations is None:
+            raise ValueError("Search must be limited by a time budget or a maximum amount of evaluations.")
+        if workers is not None and workers < 1:
+            raise ValueError(f"Amount of workers must be positive, not {workers}")
+        self.create_packer = create_packer
+        self.problem = problem
+        self.rotations = tuple(rotations)
+        self.time_budget = time_budget
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.n_searches = n_searches or (self.workers if time_budget is not None else ParallelLayoutOptimizer.DEFAULT_N_SEARCHES)
+        self.max_evaluations = max_evaluations
+        self.results: List[SearchResult] = []
+
+    def get_seeds(self) -> List[int]:
+        """ Get seeds of independent searches, derived from optimizer seed. """
+        rng = random.Random(self.seed)
+        return [rng.getrandbits(32) for _ in range(self.n_searches)]
+
+    def get_deadline(self, task_idx: int) -> Union[float, None]:
+        """ 
+        Get seconds after start at which search with given index stops, the end of its round of one search per worker.
+        Returns None if searches are limited by evaluations only.
+        """
+        if self.time_budget is None:
+            return None
+        n_rounds = -(-self.n_searches // self.workers)
+        return self.time_budget * (task_idx // self.workers + 1) / n_rounds
+
+    def optimize(self, cancellation_token: CancellationToken = None, progress_callback: ProgressCallback = None) -> Tuple[Layout, LayoutScore]:
+        """ 
+        Run searches and return best layout found along with its score.
+        progress_callback receives the progress of the best finished search while waiting, with the share of the time budget used.
+        A single search in the calling process reports its own progress instead.
+        """
+        start = time.time()
+        tasks = [
+            (self.create_packer, self.problem, self.rotations, self._get_end_time(start, task_idx), seed, self.max_evaluations, task_idx)
+            for task_idx, seed in enumerate(self.get_seeds())
+        ]
+        pack_layout, pieces = self.create_packer(self.problem)
+        reporter = ProgressReporter(progress_callback)
+        self.results = []
+
+        if self.workers == 1:
+            for task in tasks:
+                if self.results and cancellation_token is not None and cancellation_token.is_cancelled():
+                    break
+                self.results.append(run_search(*task, cancellation_token, progress_callback if self.n_searches == 1 else None))
+                reporter.report(self._get_progress(self.results, len(pieces), start))
+        else:
+            context = multiprocessing.get_context('spawn')
+            stop_event = context.Event()
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=init_worker, initargs=(stop_event,)) as executor:
+                futures = [executor.submit(run_search, *task) for task in tasks]
+                pending = futures
+                while pending:
+                    _, pending = wait(pending, timeout=ProgressReporter.DEFAULT_INTERVAL)
+                    if cancellation_token is not None and cancellation_token.is_cancelled():
+                        stop_event.set()
+                    finished = [future.result() for future in futures if future.done()]
+                    reporter.report(self._get_progress(finished, len(pieces), start))
+                self.results = [future.result() for future in futures]
+
+        best = min(self.results, key=lambda result: (result.score, result.task_idx))
+
+        layout, score = LayoutOptimizer(pack_layout, pieces, self.rotations).evaluate(best.genome)
+        reporter.report(self._get_progress(self.results, len(pieces), start, 1.0), force=True)
+        return layout, score
+
+    def _get_end_time(self, start: float, task_idx: int) -> Union[float, None]:
+        """ Get time at which search with given index stops, or None if it is limited by evaluations only. """
+        deadline = self.get_deadline(task_idx)
+        return start + deadline if deadline is not None else None
+
+    def _get_progress(self, results: List[SearchResult], n_pieces: int, start: float, fraction: float = None) -> PackingProgress:
+        """ Get progress of best finished search. Bins tried are the plates used by its layout. """
+        if fraction is None:
+            fraction = (time.time() - start) / self.time_budget if self.time_budget else len(results) / self.n_searches
+        if not results:
+            return PackingProgress(min(fraction, 1.0), 0, n_pieces, 0, 0.0, 0)
+        best = min(results, key=lambda result: (result.score, result.task_idx))
+        return PackingProgress(
+            min(fraction, 1.0),
+            n_pieces - best.score.unplaced,
+            n_pieces,
+            best.score.plates_used,
+            best.utilization,
+            sum(result.n_evaluations for result in results)
+        )
+
+    def get_n_evaluations(self) -> int:
+        """ Get total amount of layouts evaluated by the last search. """
+        return sum(result.n_evaluations for result in self.results)
@@ -0,0 +1,42 @@
+import time
+from typing import Callable, NamedTuple
+
+class PackingProgress(NamedTuple):
+    """
+    Snapshot of packing progress, passed to progress callbacks.
+    - fraction: estimated share of work done, in [0, 1].
+    - pieces_placed: pieces placed in the best layout so far.
+    - pieces_total: pieces to place.
+    - bins_tried: bins packed so far, including the bin currently being packed.
+    - utilization: area of placed pieces divided by area of bins containing them, in the best layout so far.
+    - evaluations: layouts evaluated by layout search, 0 for a single greedy pass.
+    """
+    fraction: float
+    pieces_placed: int
+    pieces_total: int
+    bins_tried: int
+    utilization: float
+    evaluations: int = 0
+
+ProgressCallback = Callable[[PackingProgress], None]
+
+class ProgressReporter:
+    """
+    Passes progress to a callback at most once per interval in seconds, so per-piece updates do not flood slow receivers such as Qt signals.
+    Forced reports, such as the final one, are always passed. Does nothing if callback is None.
+    """
+    DEFAULT_INTERVAL: float = 0.1
+
+    def __init__(self, callback: ProgressCallback = None, interval: float = None):
+        self.callback = callback
+        self.interval = interval if interval is not None else ProgressReporter.DEFAULT_INTERVAL
+        self.last_report: float = None
+
+    def report(self, progress: PackingProgress, force: bool = False):
+        """ Pass progress to callback if forced or the interval has passed since the last report. """
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if force or self.last_report is None or now - self.last_report >= self.interval:
+            self.last_report = now
+            self.callback(progress)
@@ -4,8 +4,8 @@ Date: 2024/09/05
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 
+import shapely
 from shapely.geometry import Polygon, LineString, MultiLineString
 from shapely.affinity import rotate, translate
 
@@ -13,7 +13,8 @@ from .rectangle2d import Rectangle2D
 from .vector2d import Vector2D
 
 import enum
-from typing import Tuple, List
+import hashlib
+from typing import Tuple, List, Dict
 
 class BoundsEnum(enum.Enum):
     """ 
@@ -60,6 +61,21 @@ class Area2D:
         self.id = id
         self.area = self.shape.area
         self.rotation = 0.0
+        self._rotation_base: Tuple[Polygon, float] = None
+        self._rotated_shapes: Dict[float, Tuple[Polygon, float, float]] = {}
+        self._geometry_key: str = None
+
+    @property
+    def shape(self) -> Polygon:
+        """ Shapely polygon representing the area. """
+        return self._shape
+
+    @shape.setter
+    def shape(self, shape: Polygon) -> None:
+        """ Set shapely polygon and invalidate cached bounds. """
+        self._shape = shape
+        self._bounds = None
+        self._bb = None
 
     """ Util methods """
 
@@ -99,38 +115,70 @@ class Area2D:
         """ Free area left inside bounding box. """
         return self.get_bb().area - self.shape.area
 
+    def get_bounds(self) -> Tuple[float, float, float, float]:
+        """ Get bounds of shape without edge margin as (min_x, min_y, max_x, max_y). Cached until the shape changes. """
+        if self._bounds is None:
+            self._bounds = self.shape.bounds
+        return self._bounds
+
     def get_bb(self) -> Rectangle2D:
-        """ Get bounding box of shape. Returns Rectangle2D object. """
-        bounds = self.shape.bounds
-        min_x = bounds[BoundsEnum.MINX.value]
-        min_y = bounds[BoundsEnum.MINY.value]
-        max_x = bounds[BoundsEnum.MAXX.value]
-        max_y = bounds[BoundsEnum.MAXY.value]
-        return Rectangle2D(
-            min_x - self.edge_margin, 
-            min_y - self.edge_margin, 
-            max_x - min_x + 2 * self.edge_margin, 
-            max_y - min_y + 2 * self.edge_margin
-        )
+        """ Get bounding box of shape. Returns Rectangle2D object, cached until the shape changes. """
+        if self._bb is None:
+            bounds = self.get_bounds()
+            min_x = bounds[BoundsEnum.MINX.value]
+            min_y = bounds[BoundsEnum.MINY.value]
+            max_x = bounds[BoundsEnum.MAXX.value]
+            max_y = bounds[BoundsEnum.MAXY.value]
+            self._bb = Rectangle2D(
+                min_x - self.edge_margin, 
+                min_y - self.edge_margin, 
+                max_x - min_x + 2 * self.edge_margin, 
+                max_y - min_y + 2 * self.edge_margin
+            )
+        return self._bb
 
     def get_position(self) -> Tuple[float, float]:
         """ Get absolute position of piece in bin. """
         bounds = self.get_bb()
         return (bounds.min_x, bounds.min_y)
 
+    def get_geometry_key(self) -> str:
+        """ 
+        Get key identifying shape geometry and edge margin independently of position and current rotation.
+        Pieces created from identical contours share a key, allowing computations on their geometry to be reused.
+        """
+        if self._geometry_key is None:
+            base_shape, _, _ = self.get_rotated_shape(0)
+            digest = hashlib.sha1(shapely.to_wkb(base_shape)).hexdigest()
+            self._geometry_key = f"{digest}:{self.edge_margin}"
+        return self._geometry_key
+
+    def is_prepared(self) -> bool:
+        """ Check if shape has been prepared for repeated predicate tests. """
+        return bool(shapely.is_prepared(self.shape))
+
     """ Modifying shape """
 
+    def prepare(self) -> None:
+        """ 
+        Build GEOS prepared geometry for shape, speeding up repeated intersects/touches calls against it.
+        Only worthwhile for shapes that no longer move, since any modification replaces the geometry.
+        """
+        shapely.prepare(self.shape)
+
     def add(self, other: 'Area2D') -> None:
         """ Add area of another Area2D object. """
         combined_polygon = self.shape.union(other.shape)
         self.shape = combined_polygon
         self._update_area() 
+        self._clear_rotated_shapes()
 
     def subtract(self, other: 'Area2D') -> None:
         """ Subtract area of another Area2D object. """
         subtracted_polygon = self.shape.difference(other.shape)
         self.shape = subtracted_polygon
         self._update_area()
+        self._clear_rotated_shapes()
 
     """ Movement """
 
@@ -151,6 +199,52 @@ class Area2D:
         self.rotation %= 360
         self.shape = rotate(self.shape, degrees, origin='center')
 
+    def get_rotated_shape(self, degrees: float) -> Tuple[Polygon, float, float]:
+        """
+        Get shape at indicated absolute rotation, translated so that its bounding box starts at the origin.
+        Returns tuple of (shape, bounding box width, bounding box height). Variants are cached per angle.
+        """
+        degrees %= 360
+        variant = self._rotated_shapes.get(degrees)
+        if variant is None:
+            if self._rotation_base is None:
+                self._rotation_base = (self.shape, self.rotation)
+            base_shape, base_rotation = self._rotation_base
+            rotated_shape = rotate(base_shape, degrees - base_rotation, origin='center') if degrees != base_rotation else base_shape
+            min_x, min_y, max_x, max_y = rotated_shape.bounds
+            rotated_shape = translate(rotated_shape, self.edge_margin - min_x, self.edge_margin - min_y)
+            variant = (
+                rotated_shape, 
+                max_x - min_x + 2 * self.edge_margin, 
+                max_y - min_y + 2 * self.edge_margin
+            )
+            self._rotated_shapes[degrees] = variant
+        return variant
+
+    def place_rotated(self, degrees: float, x: float, y: float) -> None:
+        """ Set shape to indicated absolute rotation and place its bounding box at given position. """
+        rotated_shape, _, _ = self.get_rotated_shape(degrees)
+        self.shape = translate(rotated_shape, x, y)
+        self.rotation = degrees % 360
+
+    def share_geometry(self, other: 'Area2D') -> None:
+        """ 
+        Share cached bounds, rotation variants and geometry key with another unrotated Area2D of identical shape, such as another copy of the same part.
+        Variants computed by either object become available to both. Modifying the shape of either object with add/subtract detaches it again.
+        """
+        other.get_geometry_key()
+        self._bounds = other.get_bounds()
+        self._bb = other.get_bb()
+        self._rotation_base = other._rotation_base
+        self._rotated_shapes = other._rotated_shapes
+        self._geometry_key = other._geometry_key
+
+    def _clear_rotated_shapes(self) -> None:
+        """ Clear cached rotation variants after shape geometry is modified. """
+        self._rotation_base = None
+        self._rotated_shapes = {}
+        self._geometry_key = None
+
     """ Bound checks """
 
     def is_inside_area(self, container: 'Area2D') -> bool:
@@ -161,8 +255,29 @@ class Area2D:
         """ Check if shape is inside rectangle. Returns True if corners/edges match. """
         return self.get_bb().fits_inside(container)
 
+    def bounds_overlap(self, other: 'Area2D') -> bool:
+        """ Check if shape bounds overlap those of other shape. Returns False for adjacent shapes. """
+        min_x, min_y, max_x, max_y = self.get_bounds()
+        other_min_x, other_min_y, other_max_x, other_max_y = other.get_bounds()
+        if max_x <= other_min_x or other_max_x <= min_x:
+            return False
+        if max_y <= other_min_y or other_max_y <= min_y:
+            return False
+        return True
+
+    def intersects(self, other: 'Area2D') -> bool:
+        """ 
+        Check if interiors of shapes overlap. Equivalent to intersection(), but uses GEOS predicates instead of constructing the intersection geometry.
+        Returns False for shapes that only share edges or corners. Prepared geometry is used if this shape has been prepared.
+        """
+        if not self.bounds_overlap(other):
+            return False
+        return self.shape.intersects(other.shape) and not self.shape.touches(other.shape)
+
     def intersection(self, other: 'Area2D', plot=False, filename=None) -> bool:
         """ Check if intersection exists with other shape and optionally plot the result. """
+        if not self.bounds_overlap(other):
+            return False
         inters = self.shape.intersection(other.shape)
         return not inters.is_empty and inters.area > 0
     
\ No newline at end of file
@@ -0,0 +1,176 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, LineString, Point
+from shapely.geometry.base import BaseGeometry
+from shapely.affinity import scale
+
+from .area2d import Area2D
+
+"""
+No-fit polygon (NFP) utilities for true-shape nesting.
+
+The NFP of a fixed polygon A and a moving polygon B is the set of translations of B for which the interiors of A and B overlap,
+i.e. the Minkowski sum A + (-B). Placing the reference point of B on the boundary of the NFP makes the two polygons touch.
+
+Minkowski sums are computed as follows:
+- both convex: convex hull of pairwise vertex sums.
+- one convex: the other polygon translated by a vertex of the convex one, united with the hulls of each of its edges swept by the convex polygon.
+- neither convex: both polygons translated by a vertex of the other, united with the parallelograms formed by each pair of edges.
+Holes are ignored, so results are conservative for polygons with holes.
+"""
+
+CONVEXITY_TOLERANCE = 1e-9
+HOLE_AREA_TOLERANCE = 1e-6
+OUTLINE_SIMPLIFY_RATIO = 0.25
+POLYGON_TYPE_ID = 3
+
+def get_polygons(geometry: BaseGeometry) -> List[Polygon]:
+    """ Get non-empty polygon parts of geometry, discarding holes. """
+    parts = shapely.get_parts(geometry)
+    return [Polygon(part.exterior) for part in parts if shapely.get_type_id(part) == POLYGON_TYPE_ID and not part.is_empty]
+
+def remove_slivers(geometry: BaseGeometry, tolerance: float = HOLE_AREA_TOLERANCE) -> BaseGeometry:
+    """ Remove degenerate holes left by floating-point error when uniting polygons, which would otherwise be treated as feasible positions. """
+    polygons = []
+    for part in shapely.get_parts(geometry):
+        if shapely.get_type_id(part) != POLYGON_TYPE_ID or part.is_empty:
+            continue
+        holes = [ring for ring in part.interiors if len(ring.coords) >= 4 and Polygon(ring).area > tolerance]
+        polygons.append(shapely.make_valid(Polygon(part.exterior, holes)))
+    return shapely.union_all(polygons) if polygons else Polygon()
+
+def get_outline(shape: BaseGeometry, margin: float) -> List[Polygon]:
+    """
+    Get outline of shape grown by margin as a list of polygons.
+    The shape is simplified within a fraction of the margin first and grown by that tolerance on top of the margin,
+    so outlines stay light on dense contours while never coming closer to the shape than the margin.
+    """
+    if margin > 0:
+        tolerance = margin * OUTLINE_SIMPLIFY_RATIO
+        shape = shape.simplify(tolerance).buffer(margin + tolerance, join_style='mitre')
+    elif not shape.is_valid:
+        shape = shape.buffer(0)
+    return get_polygons(shape)
+
+def _is_convex(polygon: Polygon) -> bool:
+    """ Check if polygon is convex. """
+    hull_area = polygon.convex_hull.area
+    return hull_area - polygon.area <= CONVEXITY_TOLERANCE * max(hull_area, 1)
+
+def _vertices(polygon: Polygon) -> np.ndarray:
+    """ Get polygon exterior vertices without closing point. Returns array of shape (N, 2). """
+    return np.asarray(polygon.exterior.coords)[:-1, :2]
+
+def _edges(polygon: Polygon) -> np.ndarray:
+    """ Get polygon exterior edges. Returns array of shape (N, 2, 2). """
+    coords = np.asarray(polygon.exterior.coords)[:, :2]
+    return np.stack([coords[:-1], coords[1:]], axis=1)
+
+def _union_hulls(point_sets: np.ndarray, extra: List[BaseGeometry]) -> BaseGeometry:
+    """ Union convex hulls of point sets of shape (N, K, 2) together with extra geometries. Degenerate hulls are dropped. """
+    hulls = shapely.convex_hull(shapely.multipoints(point_sets))
+    hulls = hulls[shapely.get_type_id(hulls) == POLYGON_TYPE_ID]
+    return shapely.union_all(np.concatenate([hulls, np.array(extra, dtype=object)]))
+
+def _convex_minkowski_sum(polygon: Polygon, convex_vertices: np.ndarray) -> BaseGeometry:
+    """ Minkowski sum of arbitrary simple polygon and convex polygon given by its vertices. """
+    edges = _edges(polygon)
+    sums = edges[:, :, None, :] + convex_vertices[None, None, :, :]
+    sums = sums.reshape(len(edges), -1, 2)
+    offset_polygon = shapely.affinity.translate(polygon, *convex_vertices[0])
+    return _union_hulls(sums, [offset_polygon])
+
+def minkowski_sum(a: Polygon, b: Polygon) -> BaseGeometry:
+    """ Get Minkowski sum of two simple polygons. """
+    a_convex, b_convex = _is_convex(a), _is_convex(b)
+    a_vertices, b_vertices = _vertices(a), _vertices(b)
+
+    if a_convex and b_convex:
+        sums = (a_vertices[:, None, :] + b_vertices[None, :, :]).reshape(-1, 2)
+        return shapely.multipoints(sums).convex_hull
+    if b_convex:
+        return _convex_minkowski_sum(a, b_vertices)
+    if a_convex:
+        return _convex_minkowski_sum(b, a_vertices)
+
+    a_edges, b_edges = _edges(a), _edges(b)
+    sums = a_edges[:, None, :, None, :] + b_edges[None, :, None, :, :]
+    sums = sums.reshape(len(a_edges) * len(b_edges), 4, 2)
+    return _union_hulls(sums, [
+        shapely.affinity.translate(a, *b_vertices[0]),
+        shapely.affinity.translate(b, *a_vertices[0])
+    ])
+
+def no_fit_polygon(fixed: List[Polygon], moving: List[Polygon]) -> BaseGeometry:
+    """ Get no-fit polygon of moving outline around fixed outline, relative to the origin of the moving outline. """
+    reflected = [scale(polygon, -1, -1, origin=(0, 0)) for polygon in moving]
+    sums = [minkowski_sum(f, m) for f in fixed for m in reflected]
+    return remove_slivers(shapely.union_all(sums)) if sums else Polygon()
+
+def inner_fit_region(container: Tuple[float, float, float, float], outline_bounds: Tuple[float, float, float, float]) -> Union[BaseGeometry, None]:
+    """
+    Get region of translations that keep outline inside rectangular container, given as (min_x, min_y, max_x, max_y).
+    Returns a point or line if the outline fits exactly along an axis, or None if it does not fit.
+    """
+    min_x = container[0] - outline_bounds[0]
+    min_y = container[1] - outline_bounds[1]
+    max_x = container[2] - outline_bounds[2]
+    max_y = container[3] - outline_bounds[3]
+
+    if max_x < min_x or max_y < min_y:
+        return None
+    if max_x == min_x and max_y == min_y:
+        return Point(min_x, min_y)
+    if max_x == min_x or max_y == min_y:
+        return LineString([(min_x, min_y), (max_x, max_y)])
+    return shapely.box(min_x, min_y, max_x, max_y)
+
+class NFPCache:
+    """
+    Cache for piece outlines and no-fit polygons.
+    Outlines and NFPs between movable pieces are keyed by geometry key and rotation, so identical copies of a part share them.
+    NFPs against immovable pieces are keyed by the immovable piece itself, as its position is fixed.
+    """
+    def __init__(self):
+        self.outlines: Dict[Tuple[str, float], List[Polygon]] = {}
+        self.nfps: Dict[Tuple[str, float, str, float], BaseGeometry] = {}
+        self.obstacle_nfps: Dict[Tuple[Area2D, str, float], BaseGeometry] = {}
+        self.obstacle_outlines: Dict[Area2D, List[Polygon]] = {}
+
+    def get_outline(self, piece: Area2D, rotation: float) -> List[Polygon]:
+        """ Get outline of movable piece at given absolute rotation, in the frame where its bounding box starts at the origin. """
+        rotation %= 360
+        key = (piece.get_geometry_key(), rotation)
+        outline = self.outlines.get(key)
+        if outline is None:
+            shape, _, _ = piece.get_rotated_shape(rotation)
+            outline = get_outline(shape, piece.edge_margin)
+            self.outlines[key] = outline
+        return outline
+
+    def get_nfp(self, fixed: Area2D, fixed_rotation: float, moving: Area2D, moving_rotation: float) -> BaseGeometry:
+        """ Get NFP of moving piece around fixed piece, relative to the position of the fixed piece. """
+        fixed_rotation %= 360
+        moving_rotation %= 360
+        key = (fixed.get_geometry_key(), fixed_rotation, moving.get_geometry_key(), moving_rotation)
+        nfp = self.nfps.get(key)
+        if nfp is None:
+            nfp = no_fit_polygon(self.get_outline(fixed, fixed_rotation), self.get_outline(moving, moving_rotation))
+            self.nfps[key] = nfp
+        return nfp
+
+    def get_obstacle_nfp(self, obstacle: Area2D, moving: Area2D, moving_rotation: float) -> BaseGeometry:
+        """ Get NFP of moving piece around immovable piece in absolute coordinates. """
+        moving_rotation %= 360
+        key = (obstacle, moving.get_geometry_key(), moving_rotation)
+        nfp = self.obstacle_nfps.get(key)
+        if nfp is None:
+            obstacle_outline = self.obstacle_outlines.get(obstacle)
+            if obstacle_outline is None:
+                obstacle_outline = get_outline(obstacle.shape, obstacle.edge_margin)
+                self.obstacle_outlines[obstacle] = obstacle_outline
+            nfp = no_fit_polygon(obstacle_outline, self.get_outline(moving, moving_rotation))
+            self.obstacle_nfps[key] = nfp
+        return nfp
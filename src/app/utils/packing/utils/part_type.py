@@ -0,0 +1,38 @@
+from typing import List, Tuple
+
+from .area2d import Area2D
+
+ID_AMOUNT_DELIMITER = "__"
+
+class PartType:
+    """
+    Geometry shared by all copies of a part.
+    The contour is converted to a polygon once; every instance references the same shapely geometry, bounds, area,
+    rotation variants and geometry key, and only stores its own placement once packed.
+    Instance ids are formatted as <part id>__<copy index>.
+    """
+    def __init__(self, id: str, points: List[Tuple[float, float]], amount: int = 1, edge_margin: float = 0):
+        if amount < 0:
+            raise ValueError(f"Part amount must not be negative, not {amount}")
+        self.id = id
+        self.amount = amount
+        self.geometry = Area2D(id=id, points=list(points), edge_margin=edge_margin)
+        self.geometry.get_geometry_key()
+
+    def get_instance_id(self, idx: int) -> str:
+        """ Get id of indicated copy of part. """
+        return self.id + ID_AMOUNT_DELIMITER + str(idx)
+
+    def create_instance(self, id: str) -> Area2D:
+        """ Create unplaced Area2D sharing geometry of part type. """
+        instance = Area2D(id=id, shape=self.geometry, edge_margin=self.geometry.edge_margin)
+        instance.share_geometry(self.geometry)
+        return instance
+
+    def create_instances(self) -> List[Area2D]:
+        """ Create Area2D objects for all copies of part. """
+        return [self.create_instance(self.get_instance_id(i)) for i in range(self.amount)]
+
+    def __repr__(self) -> str:
+        """ Return a string representation of the PartType object. """
+        return f"\nPart type ID: {self.id}, Amount: {self.amount}, Area: {self.geometry.area}"
@@ -0,0 +1,61 @@
+import math
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from .area2d import Area2D, BoundsEnum
+from .rectangle2d import Rectangle2D
+
+class SpatialIndex:
+    """
+    Uniform bounding-box grid used to look up placed pieces that may collide with a candidate placement.
+    Pieces are registered in every cell their bounding box covers, so a query only visits nearby pieces.
+    """
+    DEFAULT_DIVISIONS: int = 32
+
+    def __init__(self, width: float, height: float, divisions: int = DEFAULT_DIVISIONS):
+        if divisions <= 0:
+            raise ValueError("Spatial index must have a positive amount of divisions.")
+        self.cell_size: float = max(width, height, 1) / divisions
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.pieces: List[Area2D] = []
+
+    def __len__(self) -> int:
+        return len(self.pieces)
+
+    def _cell_range(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Tuple[range, range]:
+        """ Get range of cell indices covered by bounds. """
+        x_range = range(math.floor(min_x / self.cell_size), math.floor(max_x / self.cell_size) + 1)
+        y_range = range(math.floor(min_y / self.cell_size), math.floor(max_y / self.cell_size) + 1)
+        return x_range, y_range
+
+    def insert(self, piece: Area2D) -> None:
+        """ Register piece using bounds of its shape. """
+        bounds = piece.get_bounds()
+        if any(math.isnan(b) for b in bounds):
+            return
+        piece_idx = len(self.pieces)
+        self.pieces.append(piece)
+        x_range, y_range = self._cell_range(*bounds)
+        for cx in x_range:
+            for cy in y_range:
+                self.cells[(cx, cy)].append(piece_idx)
+
+    def query(self, rectangle: Rectangle2D) -> List[Area2D]:
+        """ Get pieces whose bounding boxes overlap rectangle. Adjacent pieces are excluded, in line with Rectangle2D.intersects. """
+        x_range, y_range = self._cell_range(rectangle.min_x, rectangle.min_y, rectangle.max_x, rectangle.max_y)
+        visited: Set[int] = set()
+        candidates = []
+        for cx in x_range:
+            for cy in y_range:
+                for piece_idx in self.cells.get((cx, cy), ()):
+                    if piece_idx in visited:
+                        continue
+                    visited.add(piece_idx)
+                    piece = self.pieces[piece_idx]
+                    bounds = piece.get_bounds()
+                    if bounds[BoundsEnum.MAXX.value] <= rectangle.min_x or rectangle.max_x <= bounds[BoundsEnum.MINX.value]:
+                        continue
+                    if bounds[BoundsEnum.MAXY.value] <= rectangle.min_y or rectangle.max_y <= bounds[BoundsEnum.MINY.value]:
+                        continue
+                    candidates.append(piece)
+        return candidates
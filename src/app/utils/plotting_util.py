@@ -4,7 +4,6 @@ Date: 2024/06/03
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from typing import Tuple, List, Dict, Any
 
 """
@@ -0,0 +1,135 @@
+import numpy as np
+import cv2
+from typing import Tuple, List, Sequence
+
+"""
+Lightweight preview rendering with OpenCV, used instead of matplotlib for plate, router and layout previews.
+"""
+
+Color = Tuple[int, int, int]
+
+def hex_to_bgr(color: str) -> Color:
+    """ Convert hex color string such as '#1f77b4' to BGR tuple used by OpenCV. """
+    color = color.lstrip('#')
+    r, g, b = (int(color[i:i+2], 16) for i in (0, 2, 4))
+    return (b, g, r)
+
+class RasterColors:
+    BACKGROUND: Color = (255, 255, 255)
+    LINE: Color = (0, 0, 0)
+    BOUNDING_BOX: Color = (255, 0, 0)
+    FREE_RECTANGLE: Color = (0, 128, 0)
+    LABEL_TEXT: Color = (255, 255, 255)
+
+class RasterCanvas:
+    """
+    Image buffer for drawing shapes given in world units, such as millimeters.
+    World coordinates are scaled uniformly to fit the given region into the canvas, leaving a margin in pixels on each side.
+
+    ### Parameters:
+    - world_width, world_height: size of drawn region in world units, starting at origin.
+    - max_width, max_height: maximum canvas size in pixels. The canvas is shrunk along one axis to keep the aspect ratio.
+    - margin: empty border in pixels.
+    - flip_y: draw y axis upwards rather than downwards, as in a regular plot.
+    - origin: world coordinates of the minimum corner of the drawn region.
+    """
+    DASH_LENGTH: int = 8
+    DOT_LENGTH: int = 2
+
+    def __init__(
+        self,
+        world_width: float,
+        world_height: float,
+        max_width: int,
+        max_height: int,
+        margin: int = 10,
+        flip_y: bool = False,
+        background: Color = RasterColors.BACKGROUND,
+        origin: Tuple[float, float] = (0.0, 0.0)
+    ):
+        if world_width <= 0 or world_height <= 0:
+            raise ValueError(f"Drawn region must have positive size, not {world_width}x{world_height}")
+        if max_width <= 2 * margin or max_height <= 2 * margin:
+            raise ValueError(f"Canvas of {max_width}x{max_height} pixels too small for margin of {margin}")
+        self.scale = min((max_width - 2 * margin) / world_width, (max_height - 2 * margin) / world_height)
+        self.margin = margin
+        self.flip_y = flip_y
+        self.origin = np.array(origin, dtype=np.float64)
+        self.width = int(round(world_width * self.scale)) + 2 * margin
+        self.height = int(round(world_height * self.scale)) + 2 * margin
+        self.image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.image[:, :] = background
+
+    def to_pixels(self, points: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """ Convert world coordinates to array of integer pixel coordinates of shape (n, 2). """
+        points = (np.asarray(points, dtype=np.float64).reshape(-1, 2) - self.origin) * self.scale
+        if self.flip_y:
+            points[:, 1] = self.height - 2 * self.margin - points[:, 1]
+        return np.rint(points + self.margin).astype(np.int32)
+
+    def draw_polygon(self, points: Sequence[Tuple[float, float]], color: Color = RasterColors.LINE, thickness: int = 1, closed: bool = True, dash: int = 0):
+        """ Draw outline through points. Lines are dashed with given dash length in pixels if dash is positive. """
+        pixels = self.to_pixels(points)
+        if len(pixels) < 2:
+            return
+        if dash <= 0:
+            cv2.polylines(self.image, [pixels], closed, color, thickness, cv2.LINE_AA)
+            return
+        if closed:
+            pixels = np.vstack((pixels, pixels[:1]))
+        cv2.polylines(self.image, RasterCanvas._get_dashes(pixels, dash), False, color, thickness, cv2.LINE_AA)
+
+    def draw_rectangle(self, min_x: float, min_y: float, width: float, height: float, color: Color = RasterColors.LINE, thickness: int = 1, dash: int = 0):
+        """ Draw axis-aligned rectangle outline. """
+        corners = [(min_x, min_y), (min_x + width, min_y), (min_x + width, min_y + height), (min_x, min_y + height)]
+        self.draw_polygon(corners, color, thickness, True, dash)
+
+    def draw_label(self, text: str, x: float, y: float, background: Color, color: Color = RasterColors.LABEL_TEXT, font_scale: float = 0.4):
+        """ Draw text on a filled box with its top left corner at world coordinates x, y. """
+        (text_width, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)
+        left, top = self.to_pixels([(x, y)])[0]
+        if self.flip_y:
+            top -= text_height + baseline
+        cv2.rectangle(self.image, (left, top), (left + text_width + 2, top + text_height + baseline + 2), background, cv2.FILLED)
+        cv2.putText(self.image, text, (left + 1, top + text_height + 1), cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, 1, cv2.LINE_AA)
+
+    @staticmethod
+    def _get_dashes(pixels: np.ndarray, dash: int) -> List[np.ndarray]:
+        """ Split polyline into dash segments of given length in pixels, separated by gaps of the same length. """
+        dashes = []
+        for start, end in zip(pixels[:-1], pixels[1:]):
+            length = float(np.hypot(*(end - start)))
+            n_dashes = max(1, int(length // (2 * dash)))
+            offsets = np.arange(n_dashes)[:, None] * 2 * dash / max(length, 1)
+            starts = start + offsets * (end - start)
+            ends = start + np.minimum(offsets + dash / max(length, 1), 1) * (end - start)
+            dashes.extend(np.stack((starts, ends), axis=1).astype(np.int32))
+        return dashes
+
+def add_title(image: np.ndarray, title: str, height: int = 24, background: Color = RasterColors.BACKGROUND, color: Color = RasterColors.LINE) -> np.ndarray:
+    """ Get copy of image with centered title above it. """
+    header = np.empty((height, image.shape[1], 3), dtype=np.uint8)
+    header[:, :] = background
+    (text_width, text_height), _ = cv2.getTextSize(title, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+    origin = (max(0, (image.shape[1] - text_width) // 2), (height + text_height) // 2)
+    cv2.putText(header, title, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+    return np.vstack((header, image))
+
+def stack_images(images: List[np.ndarray], spacing: int = 10, background: Color = RasterColors.BACKGROUND) -> np.ndarray:
+    """ Stack images vertically, centered horizontally. """
+    width = max(image.shape[1] for image in images)
+    rows = []
+    for idx, image in enumerate(images):
+        row = np.empty((image.shape[0] + (spacing if idx > 0 else 0), width, 3), dtype=np.uint8)
+        row[:, :] = background
+        left = (width - image.shape[1]) // 2
+        row[row.shape[0] - image.shape[0]:, left:left + image.shape[1]] = image
+        rows.append(row)
+    return np.vstack(rows)
+
+def save_image(image: np.ndarray, path: str) -> bool:
+    """ Save image to path, with format given by its extension. Returns True if successful, False otherwise. """
+    try:
+        return bool(cv2.imwrite(path, image))
+    except cv2.error:
+        return False
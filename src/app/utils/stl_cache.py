@@ -0,0 +1,169 @@
+import os
+import shutil
+import hashlib
+import tempfile
+from typing import List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from .stl_parser import STLParser, Axis, MIN_QUANTIZED_VALUE, MIN_QUANTIZED_VALUE_DECIMALS, MIN_POINT_DISTANCE
+from ..logging import logger
+
+"""
+On-disk cache of parsed STL files, keyed by file content and parser parameters.
+
+Each entry is a compressed .npz archive holding the flat axis, thickness and contours, next to a copy of the preview image.
+Entries are written to a temporary file and moved into place, so an interrupted write never leaves a partial entry behind.
+Changing the parser parameters or CACHE_VERSION changes every key, so stale entries are simply never read again.
+The cache is limited to max_size bytes; entries are pruned after each save, least recently used first. Loading an entry marks it used.
+Deleting the directory, or calling clear, empties the cache.
+"""
+
+CACHE_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+PARSER_PARAMETERS = (MIN_QUANTIZED_VALUE, MIN_QUANTIZED_VALUE_DECIMALS, MIN_POINT_DISTANCE)
+
+class ParsedSTL(NamedTuple):
+    """
+    Result of parsing an STL file.
+    - flat_axis: axis along which the part is extruded.
+    - thickness: extent of the part along the flat axis.
+    - outer_contour: smoothed outer contour, oriented counterclockwise.
+    - inner_contours: holes inside the outer contour, oriented clockwise.
+    """
+    flat_axis: Axis
+    thickness: float
+    outer_contour: np.ndarray
+    inner_contours: List[np.ndarray]
+
+    @classmethod
+    def from_parser(cls, parser: STLParser) -> 'ParsedSTL':
+        """ Get result of parser after parse_stl has been called. """
+        return cls(parser.flat_axis, parser.thickness, parser.outer_contour, parser.inner_contours)
+
+class STLCache:
+    """
+    Cache of parsed STL files and their preview images in a directory, which is created if it does not exist.
+    Unreadable entries are treated as cache misses, so a corrupted cache only costs a re-parse.
+    Holds at most max_size bytes, MAX_SIZE by default.
+    """
+    MAX_SIZE: int = 256 * 1024 * 1024
+
+    def __init__(self, directory: str, max_size: int = None):
+        self.directory = directory
+        self.max_size = max_size if max_size is not None else STLCache.MAX_SIZE
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(filepath: str) -> str:
+        """ Get cache key of STL file, a SHA-256 hex digest of its content, the parser parameters and the cache version. """
+        digest = hashlib.sha256(repr((CACHE_VERSION, PARSER_PARAMETERS)).encode())
+        with open(filepath, 'rb') as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Union[ParsedSTL, None]:
+        """ Get cached parsing result and mark entry as used. Returns None if there is no complete entry for key. """
+        if not os.path.exists(self._get_preview_path(key)):
+            return None
+        try:
+            with np.load(self._get_data_path(key)) as data:
+                inner_offsets = data['inner_offsets']
+                parsed = ParsedSTL(
+                    flat_axis=Axis(int(data['flat_axis'])),
+                    thickness=float(data['thickness']),
+                    outer_contour=data['outer_contour'],
+                    inner_contours=np.split(data['inner_points'], inner_offsets[1:-1])[:len(inner_offsets) - 1]
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable STL cache entry {key}: {e}")
+            return None
+        for path in self._get_paths(key):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return parsed
+
+    def save(self, key: str, parsed: ParsedSTL, preview_path: str):
+        """ Store parsing result and a copy of its preview image, then prune least recently used entries. """
+        inner_offsets = np.cumsum([0] + [len(contour) for contour in parsed.inner_contours])
+        inner_points = np.concatenate(parsed.inner_contours) if parsed.inner_contours else np.empty((0, 2))
+        try:
+            with open(preview_path, 'rb') as preview:
+                self._write_atomic(self._get_preview_path(key), lambda file: shutil.copyfileobj(preview, file))
+            self._write_atomic(self._get_data_path(key), lambda file: np.savez_compressed(
+                file,
+                flat_axis=parsed.flat_axis.value,
+                thickness=parsed.thickness,
+                outer_contour=np.asarray(parsed.outer_contour, dtype=np.float64),
+                inner_points=np.asarray(inner_points, dtype=np.float64),
+                inner_offsets=inner_offsets
+            ))
+            self.prune()
+        except OSError as e:
+            logger.warning(f"Could not write STL cache entry {key}: {e}")
+
+    def copy_preview(self, key: str, dst_path: str):
+        """ Copy cached preview image to dst_path. """
+        shutil.copyfile(self._get_preview_path(key), dst_path)
+
+    def prune(self):
+        """ Remove least recently used entries until the cache holds at most max_size bytes. """
+        entries = {}
+        for name in os.listdir(self.directory):
+            key, extension = os.path.splitext(name)
+            if extension not in ('.npz', '.png'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            size, last_used = entries.get(key, (0, 0.0))
+            entries[key] = (size + stat.st_size, max(last_used, stat.st_mtime))
+
+        total_size = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda entry: entry[1][1]):
+            if total_size <= self.max_size:
+                break
+            self.remove(key)
+            total_size -= size
+
+    def remove(self, key: str):
+        """ Remove entry for key, if there is one. """
+        for path in self._get_paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """ Remove all entries. """
+        for name in os.listdir(self.directory):
+            key, extension = os.path.splitext(name)
+            if extension in ('.npz', '.png'):
+                self.remove(key)
+
+    def _write_atomic(self, path: str, write):
+        """ Call write with a temporary file in the cache directory and move it to path once complete. """
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                write(file)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _get_paths(self, key: str) -> Tuple[str, str]:
+        return self._get_data_path(key), self._get_preview_path(key)
+
+    def _get_data_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _get_preview_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
@@ -4,15 +4,14 @@ Date: 2024/04/15
 """
 
 import os
-import math
 from typing import Tuple, List
 from enum import Enum
 from collections import defaultdict
 
-from stl import mesh
 import numpy as np
-import matplotlib.pyplot as plt
 
+from .stl_reader import read_stl
+from .contour_utils import decimate_contour, densify_contour
 from ..logging import logger
 
 MIN_QUANTIZED_VALUE = 0.01
@@ -30,11 +29,11 @@ class Axis(Enum):
 class STLParser: 
     """
     Converts a valid STL file into a numpy ndarray consisting of a reasonable number of points for use in a 2D packing algorithm.
-    Utilizes the Mesh class from the numpy-stl library for processing.
-    The mesh is converted to vector format during initialization, resulting in a shape of (Nfacets, Nvertices == 3, Ncoordinates == 3).
+    The file is validated and read in a single pass by read_stl during initialization, resulting in a shape of (Nfacets, Nvertices == 3, Ncoordinates == 3).
+    Binary files are memory-mapped rather than copied into memory.
     
     ### Criteria for a valid STL file:
-    - Must be in ASCII format.
+    - Must be in binary or ASCII format.
     - File must represent a single 2D shape extruded along a third axis, which aligns with the x, y, or z axis.
     - Files with improper orientation may produce erroneous results (a stricter check will be added in future versions).
 
@@ -43,7 +42,9 @@ class STLParser:
     - Thickness (float): Represents the distance between the minimum and maximum point along the flat axis.
     - Flattened mesh (np array): Represents the mesh with all coordinates along the flat axis set to 0.
     - Outer edges (list of tuples): Represents an unsorted list of the outer edges of the polygon.
-    - Outer contour (np array): Contour created from edges with largest bounding box
+    - Contours (list of np arrays): Closed loops of outer edges.
+    - Outer contour (np array): Contour created from edges with largest bounding box, oriented counterclockwise.
+    - Inner contours (list of np arrays): Holes inside the outer contour, oriented clockwise and not smoothed.
     The outer contour is refined to include an amount of vertices appropriate for processing.
 
     ### Raises:
@@ -66,13 +67,13 @@ class STLParser:
             logger.error(f"STL file {src_path} does not exist") 
             raise FileNotFoundError(f"STL file {src_path} does not exist") 
         
-        if not STLParser.stl_file_valid(src_path):
-            logger.error(f"STL file {src_path} is invalid")
+        try:
+            self.stl_mesh_vector: np.array = read_stl(src_path)
+        except ValueError as e:
+            logger.error(f"STL file {src_path} is invalid: {e}")
             raise ValueError(f"STL file {src_path} is invalid")
 
         self.stl_filepath: str = src_path
-        self.stl_mesh: np.array = mesh.Mesh.from_file(self.stl_filepath)
-        self.stl_mesh_vector: np.array = np.array(self.stl_mesh.vectors)
         
         if not STLParser.stl_mesh_valid(self.stl_mesh_vector):
             e = f"STL file {self.stl_filepath} must be in mesh vector format. Current shape is {self.stl_mesh_vector.shape}"
@@ -96,8 +97,10 @@ class STLParser:
         self.contours: List[np.array] = STLParser.get_contours(self.outer_edges)
         logger.debug(f"Finding outermost contour...")
         self.outer_contour: np.array = STLParser.get_outermost_contour(self.contours)
+        logger.debug(f"Finding inner contours...")
+        self.inner_contours: List[np.array] = STLParser.get_inner_contours(self.contours, self.outer_contour)
         logger.debug(f"Smoothing contour...")
-        self.outer_contour = STLParser.get_smooth_contour(self.outer_contour)
+        self.outer_contour = STLParser.get_smooth_contour(STLParser.orient_contour(self.outer_contour))
         self.parsing_complete = True
         logger.debug(f"Parsing complete.")
 
@@ -107,7 +110,7 @@ class STLParser:
         Check if an STL file is valid.
         """
         try:
-            mesh.Mesh.from_file(filepath)
+            read_stl(filepath)
             return True
         except Exception:
             return False
@@ -156,61 +159,108 @@ class STLParser:
         return flattened_mesh
 
     @staticmethod
-    def get_outer_edges(flattened_mesh: np.array, flat_axis: Axis) -> List[EdgeShape]:
+    def get_outer_edges(flattened_mesh: np.array, flat_axis: Axis, tolerance: int = MIN_QUANTIZED_VALUE_DECIMALS) -> List[EdgeShape]:
         """
-        Get the outer edges of a flattened STL mesh. 
-        Returns a list of unsorted edges.
+        Get the outer edges of a flattened STL mesh, i.e. edges belonging to a single facet.
+        Vertices are rounded to tolerance decimals, so edges shared by neighbouring facets match despite floating point noise.
+        Edges are counted with a single np.unique over all 3 * Nfacets edges, each stored with its endpoints in sorted order.
+        Returns a list of unsorted edges, in order of first occurrence.
         """
         if flat_axis not in Axis:
             raise ValueError(f"Invalid axis {flat_axis}")
+        if len(flattened_mesh) == 0:
+            return []
 
-        edges = []
+        scale = 10 ** tolerance
+        plane_axes = [axis for axis in range(3) if axis != flat_axis.value]
+        points = np.rint(np.asarray(flattened_mesh, dtype=np.float64)[:, :, plane_axes] * scale).astype(np.int64)
+        edges = np.stack((points, np.roll(points, -1, axis=1)), axis=2).reshape(-1, 2, 2)
 
-        for facet in flattened_mesh:
-            for i in range(3):
-                point1 = [facet[i][j] for j in range(3) if j != flat_axis.value]
-                point2 = [facet[(i+1)%3][j] for j in range(3) if j != flat_axis.value]
-                edge = tuple(sorted([tuple(point1), tuple(point2)]))
-                edges.append(edge)
+        start, end = edges[:, 0], edges[:, 1]
+        swap = (start[:, 0] > end[:, 0]) | ((start[:, 0] == end[:, 0]) & (start[:, 1] > end[:, 1]))
+        edges[swap] = edges[swap][:, ::-1]
 
-        edge_counts = defaultdict(int)
-        for edge in edges:
-            edge_counts[edge] += 1
+        keys = np.ascontiguousarray(edges.reshape(-1, 4)).view(np.dtype((np.void, 4 * edges.itemsize))).ravel()
+        _, first_indices, counts = np.unique(keys, return_index=True, return_counts=True)
+        outer_edges = edges[np.sort(first_indices[counts == 1])] / scale
 
-        outer_edges = [edge for edge, count in edge_counts.items() if count == 1]
-        return outer_edges
+        return [((x1, y1), (x2, y2)) for (x1, y1), (x2, y2) in outer_edges.tolist()]
 
     @staticmethod
     def get_contours(outer_edges: List[EdgeShape]) -> List[np.array]:
         """
         Get contours from a list of outer edges.
-        Sorts edges into contours and returns a list of np arrays.
+        Vertices are indexed once, and each vertex maps to its incident edges. Every closed loop is then walked once, marking edges as visited,
+        so assembly takes linear time. Chains that do not close are returned as they are.
+        Returns a list of np arrays of points in walk order, without repeating the first point.
         """
-        points = defaultdict(list)
+        if len(outer_edges) == 0:
+            return []
+
+        endpoints = np.array(outer_edges, dtype=np.float64).reshape(-1, 2)
+        vertices, vertex_ids = np.unique(endpoints, axis=0, return_inverse=True)
+        edge_vertices = vertex_ids.reshape(-1, 2).tolist()
 
-        for edge in outer_edges:
-            for i, point in enumerate(edge):
-                points[point].append(edge[(i+1)%2])
+        incident_edges: List[List[int]] = [[] for _ in range(len(vertices))]
+        for edge_idx, (start, end) in enumerate(edge_vertices):
+            incident_edges[start].append(edge_idx)
+            incident_edges[end].append(edge_idx)
 
+        visited = [False] * len(edge_vertices)
         contours = []
-        iter_list = list(points)
-        while iter_list:
-            point = iter_list[0]
-            current_contour = []
-            while True:
-                current_contour.append(list(point))
-                next_point_options = points[point]
-                next_point = next_point_options[0]
-                points.pop(point)
-                iter_list.remove(point)
-                if not points[next_point]:
+
+        for first_edge_idx, (first_vertex, vertex) in enumerate(edge_vertices):
+            if visited[first_edge_idx]:
+                continue
+            visited[first_edge_idx] = True
+            loop = [first_vertex]
+            while vertex != first_vertex:
+                loop.append(vertex)
+                edge_idx = next((idx for idx in incident_edges[vertex] if not visited[idx]), None)
+                if edge_idx is None:
                     break
-                points[next_point].remove(point)
-                point = next_point
-            contours.append(np.array(current_contour))
+                visited[edge_idx] = True
+                start, end = edge_vertices[edge_idx]
+                vertex = end if start == vertex else start
+            contours.append(vertices[loop])
 
         return contours
 
+    @staticmethod
+    def get_inner_contours(contours: List[np.array], outer_contour: np.array) -> List[np.array]:
+        """
+        Get inner contours (holes) from a list of contours, i.e. all contours other than the outer contour with bounding boxes inside its bounding box.
+        Holes are oriented clockwise, opposite to the outer contour returned by orient_contour.
+        """
+        if outer_contour is None:
+            return []
+        outer_min_x, outer_max_x, outer_min_y, outer_max_y = STLParser._get_bounding_box(outer_contour)
+        inner_contours = []
+        for contour in contours:
+            if contour is outer_contour or len(contour) < 3:
+                continue
+            min_x, max_x, min_y, max_y = STLParser._get_bounding_box(contour)
+            if outer_min_x <= min_x and max_x <= outer_max_x and outer_min_y <= min_y and max_y <= outer_max_y:
+                inner_contours.append(STLParser.orient_contour(contour, clockwise=True))
+        return inner_contours
+
+    @staticmethod
+    def get_signed_area(contour: np.array) -> float:
+        """
+        Get area enclosed by a contour using the shoelace formula. Positive if the contour is counterclockwise, negative if clockwise.
+        """
+        x, y = contour[:, 0], contour[:, 1]
+        return float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2
+
+    @staticmethod
+    def orient_contour(contour: np.array, clockwise: bool = False) -> np.array:
+        """
+        Get contour with its points ordered counterclockwise, or clockwise if indicated.
+        """
+        if (STLParser.get_signed_area(contour) < 0) != clockwise:
+            return contour[::-1].copy()
+        return contour
+
     @staticmethod
     def get_outermost_contour(contours: List[np.array]) -> np.array:
         """
@@ -250,49 +300,20 @@ class STLParser:
     @staticmethod
     def _remove_contour_points(contour: np.array) -> np.array:
         """
-        Remove points from areas of high density of a contour to smooth it.
+        Remove points from areas of high density of a contour to smooth it, keeping one point per MIN_POINT_DISTANCE of arc length.
         """
-        new_contour = [contour[0]]
-
-        point_a = contour[0]
-        for point_b in contour[1:]:
-            if np.linalg.norm(point_b - point_a) > MIN_POINT_DISTANCE:
-                new_contour.append(point_a)
-                point_a = point_b
-
-        if np.linalg.norm(contour[-1] - contour[0]) > MIN_POINT_DISTANCE:
-            new_contour.append(contour[-1])
-
-        return np.array(new_contour)
+        return decimate_contour(contour, MIN_POINT_DISTANCE)
 
     @staticmethod
     def _add_contour_points(contour: np.array) -> np.array:
         """
-        Add points to areas of low density of a contour to smooth it.
+        Add points to areas of low density of a contour to smooth it, interpolating along segments longer than twice MIN_POINT_DISTANCE.
         """
-        new_contour = []
-
-        contour = tuple(map(tuple, contour))
-
-        for i in range(len(contour)):
-            point_a = np.array(contour[i])
-            point_b = np.array(contour[0]) if i == len(contour)-1 else np.array(contour[i+1])
-            angle = math.atan2(point_b[1]-point_a[1], point_b[0]-point_a[0])
-
-            curr_point = point_a
-            while True:
-                distance = np.linalg.norm(point_b-curr_point)
-                if distance < 2 * MIN_POINT_DISTANCE:
-                    new_contour.append(tuple(point_b))
-                    break
-                curr_point += (MIN_POINT_DISTANCE * math.cos(angle), MIN_POINT_DISTANCE * math.sin(angle))
-                new_contour.append(tuple(curr_point))
-
-        return np.array(new_contour)
+        return densify_contour(contour, MIN_POINT_DISTANCE)
 
     def save_preview_image(self, dst_path: str, scale_factor: float = 1, figsize: tuple = (3.9, 3.75), dpi: int = 80):
         """
-        Save an image of the parsed STL file.
+        Save an image of the parsed STL file. Uses a standalone figure rather than pyplot, so it can be called from worker threads.
 
         - scale_factor: Factor to scale the image.
         - figsize: Size of the figure (width, height).
@@ -303,29 +324,31 @@ class STLParser:
 
         logger.debug(f"Creating plot for preview image...")
 
-        plt.figure(figsize=figsize)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
 
         for edge in self.outer_edges:
             x_values, y_values = zip(*edge)
             if scale_factor != 1:
                 x_values = tuple([x * scale_factor for x in x_values])
                 y_values = tuple([y * scale_factor for y in y_values])
-            plt.plot(x_values, y_values, color=STLParser.PLOT_COLOR)
+            ax.plot(x_values, y_values, color=STLParser.PLOT_COLOR)
 
-        plt.xlabel('Z: ' + str(self.thickness) + ' mm', fontsize=10, labelpad=5, horizontalalignment='center')
+        ax.set_xlabel('Z: ' + str(self.thickness) + ' mm', fontsize=10, labelpad=5, horizontalalignment='center')
 
-        plt.grid(True)
-        plt.gca().set_facecolor(STLParser.BG_COLOR)
-        plt.gca().set_aspect('equal')
-        plt.grid(False)
-        plt.tick_params(axis='x', colors=STLParser.TEXT_COLOR)
-        plt.tick_params(axis='y', colors=STLParser.TEXT_COLOR)
+        ax.set_facecolor(STLParser.BG_COLOR)
+        ax.set_aspect('equal')
+        ax.grid(False)
+        ax.tick_params(axis='x', colors=STLParser.TEXT_COLOR)
+        ax.tick_params(axis='y', colors=STLParser.TEXT_COLOR)
 
-        plt.gca().spines['top'].set_color(STLParser.TEXT_COLOR)
-        plt.gca().spines['bottom'].set_color(STLParser.TEXT_COLOR)
-        plt.gca().spines['left'].set_color(STLParser.TEXT_COLOR)
-        plt.gca().spines['right'].set_color(STLParser.TEXT_COLOR)
+        for spine in ax.spines.values():
+            spine.set_color(STLParser.TEXT_COLOR)
 
         logger.debug(f"Saving preview image...")
-        plt.savefig(dst_path, bbox_inches='tight', facecolor='#FFFFFF', dpi=dpi)
+        fig.savefig(dst_path, bbox_inches='tight', facecolor='#FFFFFF', dpi=dpi)
         logger.debug(f"Image saved to {dst_path}.")
@@ -0,0 +1,90 @@
+import os
+import re
+
+import numpy as np
+
+"""
+Single pass STL reading, validating the file while parsing it.
+
+Binary files are memory-mapped with a structured dtype, so the triangles are read lazily from the file without being copied.
+ASCII files are streamed in chunks, so only the parsed vertices and one chunk of text are held in memory at a time.
+"""
+
+BINARY_HEADER_SIZE = 80
+BINARY_COUNT_SIZE = 4
+BINARY_FACET_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2')
+])
+ASCII_CHUNK_SIZE = 1 << 24
+
+ASCII_VERTEX_PATTERN = re.compile(rb'vertex\s+(\S+)\s+(\S+)\s+(\S+)')
+
+def read_stl(filepath: str) -> np.ndarray:
+    """
+    Read triangles of a binary or ASCII STL file as an array of shape (Nfacets, Nvertices == 3, Ncoordinates == 3).
+    Binary files are returned as a read-only view into a memory map of the file.
+    Raises FileNotFoundError if the file does not exist, and ValueError if it is not a valid STL file or contains no facets.
+    """
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(f"STL file {filepath} does not exist")
+
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as file:
+        header = file.read(BINARY_HEADER_SIZE + BINARY_COUNT_SIZE)
+
+    if is_binary(header, size):
+        return read_binary_stl(filepath)
+    if header.lstrip().startswith(b'solid'):
+        return read_ascii_stl(filepath)
+    raise ValueError(f"STL file {filepath} is neither binary nor ASCII STL")
+
+def is_binary(header: bytes, size: int) -> bool:
+    """ Check if file with given header and size in bytes is a binary STL, i.e. its size matches the facet count in its header. """
+    if len(header) < BINARY_HEADER_SIZE + BINARY_COUNT_SIZE:
+        return False
+    n_facets = int.from_bytes(header[BINARY_HEADER_SIZE:], 'little')
+    return size == BINARY_HEADER_SIZE + BINARY_COUNT_SIZE + n_facets * BINARY_FACET_DTYPE.itemsize
+
+def read_binary_stl(filepath: str) -> np.ndarray:
+    """ Memory-map triangles of binary STL file. Raises ValueError if the file contains no facets. """
+    n_facets = (os.path.getsize(filepath) - BINARY_HEADER_SIZE - BINARY_COUNT_SIZE) // BINARY_FACET_DTYPE.itemsize
+    if n_facets <= 0:
+        raise ValueError(f"STL file {filepath} contains no facets")
+    facets = np.memmap(filepath, dtype=BINARY_FACET_DTYPE, mode='r', offset=BINARY_HEADER_SIZE + BINARY_COUNT_SIZE, shape=(n_facets,))
+    return facets['vertices']
+
+def read_ascii_stl(filepath: str, chunk_size: int = ASCII_CHUNK_SIZE) -> np.ndarray:
+    """
+    Parse triangles of ASCII STL file in chunks of given size in bytes, each ending at a line break.
+    Raises ValueError if the file contains no facets, facets without exactly three vertices, or invalid coordinates.
+    """
+    vertex_chunks = []
+    n_vertices, n_facets = 0, 0
+    remainder = b''
+
+    with open(filepath, 'rb') as file:
+        while True:
+            data = file.read(chunk_size)
+            chunk = remainder + data
+            if data:
+                split_idx = chunk.rfind(b'\n') + 1
+                chunk, remainder = chunk[:split_idx], chunk[split_idx:]
+            if chunk:
+                n_facets += chunk.count(b'endfacet')
+                vertices = ASCII_VERTEX_PATTERN.findall(chunk)
+                if vertices:
+                    try:
+                        vertex_chunks.append(np.array(vertices).astype(np.float32))
+                    except ValueError:
+                        raise ValueError(f"STL file {filepath} contains invalid vertex coordinates")
+                    n_vertices += len(vertices)
+            if not data:
+                break
+
+    if n_facets == 0:
+        raise ValueError(f"STL file {filepath} contains no facets")
+    if n_vertices != 3 * n_facets:
+        raise ValueError(f"STL file {filepath} contains {n_vertices} vertices for {n_facets} facets")
+    return np.concatenate(vertex_chunks).reshape(-1, 3, 3)
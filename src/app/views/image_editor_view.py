@@ -12,6 +12,7 @@ import enum
 
 from ..models.plate_model import Plate
 from ..controllers.image_editing_controller import ImageEditingController
+from ..task_runner import TaskRunner
 
 from ..widgets.image_load_widget import ImageLoadWidget
 from ..widgets.image_threshold_widget import ImageThresholdWidget
@@ -41,6 +42,7 @@ class ImageEditorView(QStackedWidget):
 
         self.plate = plate
         self.controller = ImageEditingController(session, IMAGE_PREVIEW_DIR, self.plate)
+        self.task_runner = TaskRunner(max_threads=1, parent=self)
         self.min_width = min_width
         self.min_height = min_height
         self._setup_ui()
@@ -51,7 +53,7 @@ class ImageEditorView(QStackedWidget):
         self.image_load_widget = ImageLoadWidget(self.controller, self.language)
         self.image_load_widget.imageImported.connect(self.on_image_imported)
 
-        self.image_threshold_widget = ImageThresholdWidget(self.controller, self.min_height, self.language)
+        self.image_threshold_widget = ImageThresholdWidget(self.controller, self.min_height, self.language, self.task_runner)
         self.image_threshold_widget.thresholdingFinalized.connect(self.on_thresholding_finalized)
 
         self.image_feature_widget = ImageFeatureWidget(self.controller, self.min_height, self.language)
@@ -72,12 +74,18 @@ class ImageEditorView(QStackedWidget):
         logger.debug("Image import finished.")
 
     def on_thresholding_finalized(self):
-        """ Binary is finalized. """
+        """ Binary is finalized. Features are extracted in the background; the feature widget is disabled until they are available. """
         self.setCurrentIndex(EditorViews.FEATURES.value)
-        self.controller.extract_image_features()
-        self.image_feature_widget.update()
+        self.image_feature_widget.setEnabled(False)
+        self.task_runner.start(self.controller.extract_image_features, on_finished=self.on_features_extracted)
         logger.debug("Image thresholding finished.")
 
+    def on_features_extracted(self, success: bool):
+        """ Show extracted features. """
+        self.image_feature_widget.setEnabled(True)
+        if success:
+            self.image_feature_widget.update()
+
     def on_features_finalized(self):
         """ Features are finalized. """
         self.setCurrentIndex(EditorViews.FLAT.value)
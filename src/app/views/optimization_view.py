@@ -4,7 +4,7 @@ import traceback
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QScrollArea
+    QWidget, QVBoxLayout, QLabel, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QScrollArea, QProgressBar
 )
 from .view_template import ViewTemplate
 from PyQt6.QtGui import QPixmap
@@ -12,6 +12,9 @@ from PyQt6.QtGui import QPixmap
 from sqlalchemy.orm import Session
 
 from src.app.controllers.optimization_controller import OptimizationController
+from src.app.utils.packing.layout_optimizer import Layout
+
+from ..task_runner import TaskRunner, Task
 
 from ..translations import optimization_view
 from ..logging import logger
@@ -24,6 +27,8 @@ class OptimizationView(ViewTemplate):
     """
     View for displaying placement optimization. 
     """
+    LAYOUT_TIME_BUDGET: float = 3.0
+
     def __init__(self, session: Session, language: int, units: int):
         super().__init__()
 
@@ -31,10 +36,12 @@ class OptimizationView(ViewTemplate):
         self.language = language
         self.units = units
 
-        self.controller = OptimizationController(session, LAYOUT_PREVIEW_PATH, CONVERSION_FACTORS[self.units])
+        self.controller = OptimizationController(session, LAYOUT_PREVIEW_PATH, CONVERSION_FACTORS[self.units], time_budget=self.LAYOUT_TIME_BUDGET)
 
         self.generated_layout = False
         self.saved_layout = False
+        self.task_runner = TaskRunner(max_threads=1, parent=self)
+        self.generate_task: Task = None
 
         self.session = session
         self._setup_ui()
@@ -58,6 +65,10 @@ class OptimizationView(ViewTemplate):
         generate_button_wrapper_layout.addStretch(1)
         generate_button_wrapper.setLayout(generate_button_wrapper_layout)
 
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(False)
+
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True) 
 
@@ -93,6 +104,7 @@ class OptimizationView(ViewTemplate):
         save_button_wrapper.setLayout(save_button_wrapper_layout)
 
         main_layout.addWidget(generate_button_wrapper)
+        main_layout.addWidget(self.progress_bar)
         main_layout.addWidget(self.scroll_area, 1) 
         main_layout.addWidget(save_button_wrapper)
 
@@ -101,64 +113,111 @@ class OptimizationView(ViewTemplate):
         self.__init_template_gui__(self.texts['view_name'][self.language], main_widget)
 
     def generate_layout(self):
-        """Generate optimized part placement layout and update the table."""
+        """ Generate optimized part placement layout in the background, or cancel generation if it is running. """
         if self.saved_layout == True:
             return
 
-        try:
-            self.controller.optimize()
-
-            pixmap = QPixmap(LAYOUT_PREVIEW_PATH)
-            self.preview_widget.setPixmap(pixmap)
-
-            placements_data = self.controller.placements
-
-            filtered_placements = {piece_id: placement_info for piece_id, placement_info in placements_data.items() if 'edge' not in piece_id and 'ctr' not in piece_id}
-
-            self.table_widget.clearContents()
-            self.table_widget.setRowCount(len(filtered_placements))
-            self.table_widget.setColumnCount(3)
-            self.table_widget.setHorizontalHeaderLabels(['Piece ID', 'Bin ID', 'Coordinates'])
-
-            self.table_widget.setColumnWidth(0, 300)
-            self.table_widget.setColumnWidth(1, 300)
-            self.table_widget.setColumnWidth(2, 280)
+        if self.generate_task is not None:
+            self.generate_task.cancel()
+            return
 
-            self.table_widget.setStyleSheet("border: 1px solid #cccccc;")
+        try:
+            job = self.controller.prepare()
+        except Exception as e:
+            self._show_layout_error(str(e))
+            return
 
-            for row_idx, (piece_id, placement_info) in enumerate(filtered_placements.items()):
-                if placement_info is None:
-                    bin_id = 'Not Placed'
-                    coordinates_text = '-'
+        self.generate_button.setText(self.texts['cancel_button_text'][self.language])
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.generate_task = self.task_runner.start(
+            self.controller.generate,
+            job,
+            on_finished=self._on_layout_generated,
+            on_failed=self._show_layout_error,
+            on_progress=self._on_progress,
+            on_done=self._on_generate_done
+        )
+
+    def _on_progress(self, percent: int, message: str):
+        """ Show progress of layout generation, along with placed parts and utilization. """
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"%p% ({message})" if message else "%p%")
+
+    def _on_generate_done(self):
+        """ Reset controls once layout generation has finished, failed, or been cancelled. """
+        self.generate_task = None
+        self.progress_bar.setVisible(False)
+        self.generate_button.setText(self.texts['generate_button_text'][self.language])
+
+    def _on_layout_generated(self, layout: Layout):
+        """ Show placements of generated layout and render its preview in the background. """
+        try:
+            self.controller.set_layout(layout)
+            self.preview_widget.clear()
+            self._update_table()
+            self.generated_layout = True
+            self.task_runner.start(self.controller.render_preview, layout, on_finished=self._on_preview_rendered)
+        except Exception as e:
+            self._show_layout_error(str(e))
+
+    def _show_layout_error(self, error: str):
+        QMessageBox.critical(
+            self,
+            self.texts['error_title'][self.language],
+            self.texts['layout_error_text'][self.language] + f" {error}"
+        )
+        logger.error(f"Error generating layout: {error}")
+
+    def _update_table(self):
+        """ Fill table with placements of generated layout. """
+        placements_data = self.controller.placements
+
+        filtered_placements = {piece_id: placement_info for piece_id, placement_info in placements_data.items() if 'edge' not in piece_id and 'ctr' not in piece_id}
+
+        self.table_widget.clearContents()
+        self.table_widget.setRowCount(len(filtered_placements))
+        self.table_widget.setColumnCount(4)
+        self.table_widget.setHorizontalHeaderLabels(['Piece ID', 'Bin ID', 'Coordinates', 'Rotation'])
+
+        self.table_widget.setColumnWidth(0, 300)
+        self.table_widget.setColumnWidth(1, 300)
+        self.table_widget.setColumnWidth(2, 180)
+        self.table_widget.setColumnWidth(3, 100)
+
+        self.table_widget.setStyleSheet("border: 1px solid #cccccc;")
+
+        for row_idx, (piece_id, placement_info) in enumerate(filtered_placements.items()):
+            if placement_info is None:
+                bin_id = 'Not Placed'
+                coordinates_text = '-'
+                rotation_text = '-'
+            else:
+                bin_id, coordinates, rotation = placement_info
+                if coordinates:
+                    coordinates_text = f"({(coordinates[0]*CONVERSION_FACTORS[self.units]):.2f}, {(coordinates[1]*CONVERSION_FACTORS[self.units]):.2f})"
                 else:
-                    bin_id, coordinates = placement_info
-                    if coordinates:
-                        coordinates_text = f"({(coordinates[0]*CONVERSION_FACTORS[self.units]):.2f}, {(coordinates[1]*CONVERSION_FACTORS[self.units]):.2f})"
-                    else:
-                        coordinates_text = '-'
-
-                self.table_widget.setItem(row_idx, 0, QTableWidgetItem(piece_id))
-                self.table_widget.setItem(row_idx, 1, QTableWidgetItem(bin_id))
-                self.table_widget.setItem(row_idx, 2, QTableWidgetItem(coordinates_text))
-
-            row_height = 30
-            self.table_widget.setFixedHeight(row_height * len(filtered_placements) + 50)
-            self.table_widget.verticalScrollBar().setEnabled(False)
+                    coordinates_text = '-'
+                rotation_text = f"{rotation:.0f}°"
 
-            self.generated_layout = True
+            self.table_widget.setItem(row_idx, 0, QTableWidgetItem(piece_id))
+            self.table_widget.setItem(row_idx, 1, QTableWidgetItem(bin_id))
+            self.table_widget.setItem(row_idx, 2, QTableWidgetItem(coordinates_text))
+            self.table_widget.setItem(row_idx, 3, QTableWidgetItem(rotation_text))
 
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                self.texts['error_title'][self.language],
-                self.texts['layout_error_text'][self.language] + f" {e}"
-            )
-            logger.error(f"Error generating layout: {str(e)}")
+        row_height = 30
+        self.table_widget.setFixedHeight(row_height * len(filtered_placements) + 50)
+        self.table_widget.verticalScrollBar().setEnabled(False)
 
+    def _on_preview_rendered(self, success: bool):
+        """ Show rendered preview image. """
+        if success:
+            self.preview_widget.setPixmap(QPixmap(LAYOUT_PREVIEW_PATH))
 
     def save_layout(self):
         """ Save added parts to plates in database """
-        if not self.generated_layout or self.saved_layout:
+        if not self.generated_layout or self.saved_layout or self.generate_task is not None:
             return
 
         try:
@@ -3,11 +3,17 @@ Author: nagan319
 Date: 2024/06/10
 """
 
+import os
+from typing import Dict, List, Tuple
+
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QScrollArea, QMessageBox
 from .view_template import ViewTemplate
 from ..widgets.part_widget import PartWidget
 
 from ..controllers.part_controller import PartController
+from ..models.part_model import Part
+from ..utils.stl_cache import STLCache
+from ..task_runner import TaskRunner
 
 from ..translations import part_view
 from ..logging import logger
@@ -16,16 +22,18 @@ class PartView(ViewTemplate):
     """
     View for handling imported parts. 
     """
-    def __init__(self, session, part_preview_dir: str, language: int, units: int):
+    def __init__(self, session, part_preview_dir: str, language: int, units: int, stl_cache_dir: str = None):
         super().__init__()
 
         self.texts = part_view
         self.language = language
         self.units = units
 
-        self.controller = PartController(session, part_preview_dir)
+        stl_cache = STLCache(stl_cache_dir) if stl_cache_dir is not None else None
+        self.controller = PartController(session, part_preview_dir, stl_cache)
         self.controller.remove_all_with_previews()
         self.widget_map = {}
+        self.task_runner = TaskRunner(parent=self)
 
         self._setup_ui()
         logger.debug("Successfully initialized PartView.")
@@ -62,43 +70,79 @@ class PartView(ViewTemplate):
 
     def import_file(self) -> None:
         """
-        Import file from selected filepath and create a new widget if valid.
+        Import files from selected filepaths in the background and create a new widget for each valid file.
         """
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select File", "", "STL Files (*.stl)")
-        
-        if file_path:
-            try:
-                part = self.controller.add_from_file(file_path)
-                
-                if part is not None:
-                    new_part_widget = PartWidget(
-                        part.id, 
-                        self.controller._get_preview_image_path(part.id), 
-                        self.language
-                    )
-                    new_part_widget.amountEdited.connect(self.on_amount_edited)
-                    new_part_widget.materialEdited.connect(self.on_material_edited)
-                    new_part_widget.deleteRequested.connect(self.on_delete_requested)
-                    self.scroll_layout.addWidget(new_part_widget)
-                    self.widget_map[part.id] = new_part_widget  
-                    self._update_button_amount()
-                    logger.debug(f"Part added successfully from {file_path}")
-
-                else:
-                    QMessageBox.warning(
-                        self, 
-                        self.texts['import_fail_title'][self.language], 
-                        self.texts['import_fail_text'][self.language]
-                    )
-                    logger.warning(f"Failed to import part from {file_path}")
-
-            except Exception as e:
-                QMessageBox.critical(
-                    self, 
-                    self.texts['import_error_title'][self.language], 
-                    f"{self.texts['import_error_text'][self.language]}{str(e)}"
-                )
-                logger.error(f"Error importing file {file_path}: {str(e)}")
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Files", "", "STL Files (*.stl)")
+        if not file_paths:
+            return
+
+        importable = [file_path for file_path in file_paths if self.controller.can_import(file_path)]
+        if len(importable) < len(file_paths):
+            self._show_import_failed(', '.join(file_path for file_path in file_paths if file_path not in importable))
+        if not importable:
+            return
+
+        self.import_button.setEnabled(False)
+        self.task_runner.start(
+            self.controller.parse_files, 
+            importable,
+            on_finished=self._on_files_parsed,
+            on_failed=lambda error: self._show_import_error(', '.join(importable), error),
+            on_progress=lambda percent, message: self.import_button.setText(f"{message} ({percent}%)"),
+            on_done=self._on_import_done
+        )
+
+    def _on_files_parsed(self, result: Tuple[List[Part], Dict[str, str]]) -> None:
+        """ Add parts parsed in the background to db and create their widgets. """
+        parsed_parts, errors = result
+        try:
+            parts = self.controller.add_parsed_all(parsed_parts)
+            for part in parts:
+                self._add_part_widget(part)
+                logger.debug(f"Part added successfully from {part.filename}")
+
+            if len(parts) < len(parsed_parts):
+                added_ids = {part.id for part in parts}
+                self._show_import_failed(', '.join(part.filename for part in parsed_parts if part.id not in added_ids))
+        except Exception as e:
+            self._show_import_error(', '.join(part.filename for part in parsed_parts), str(e))
+
+        if errors:
+            self._show_import_error(', '.join(errors), '\n'.join(f"{os.path.basename(file_path)}: {error}" for file_path, error in errors.items()))
+
+    def _on_import_done(self) -> None:
+        self.import_button.setEnabled(True)
+        self._update_button_amount()
+
+    def _add_part_widget(self, part: Part) -> None:
+        """ Create widget for part added to db. """
+        new_part_widget = PartWidget(
+            part.id, 
+            self.controller._get_preview_image_path(part.id), 
+            self.language
+        )
+        new_part_widget.amountEdited.connect(self.on_amount_edited)
+        new_part_widget.materialEdited.connect(self.on_material_edited)
+        new_part_widget.deleteRequested.connect(self.on_delete_requested)
+        self.scroll_layout.addWidget(new_part_widget)
+        self.widget_map[part.id] = new_part_widget  
+        self._update_button_amount()
+
+    def _show_import_failed(self, file_path: str) -> None:
+        QMessageBox.warning(
+            self, 
+            self.texts['import_fail_title'][self.language], 
+            self.texts['import_fail_text'][self.language]
+        )
+        logger.warning(f"Failed to import part from {file_path}")
+
+    def _show_import_error(self, file_path: str, error: str) -> None:
+        QMessageBox.critical(
+            self, 
+            self.texts['import_error_title'][self.language], 
+            f"{self.texts['import_error_text'][self.language]}{error}"
+        )
+        logger.error(f"Error importing file {file_path}: {error}")
 
     def on_material_edited(self, part_id: str, new_val: str) -> None:
         """ Update material stored in db to reflect ui change. """
@@ -135,6 +179,8 @@ class PartView(ViewTemplate):
 
     def closeEvent(self):
         """ Clear out db and remove part previews. """
+        self.task_runner.cancel_all()
+        self.task_runner.wait()
         try:
             self.controller.remove_all_with_previews()
         except Exception as e:
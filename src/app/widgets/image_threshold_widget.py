@@ -8,12 +8,14 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLab
 from PyQt6.QtGui import QPixmap
 
 from ..controllers.image_editing_controller import ImageEditingController
+from ..task_runner import TaskRunner, Task
 
 from ..translations import image_threshold_widget
 
 class ImageThresholdWidget(QWidget):
     """
     Widget for applying binary threshold filter to image. 
+    Binary images are saved by the editor's task runner, which runs one task at a time, so only the latest threshold is applied.
     """
     thresholdingFinalized = pyqtSignal()
 
@@ -21,13 +23,15 @@ class ImageThresholdWidget(QWidget):
     COLOR_MAX = 255
     COLOR_MID = (COLOR_MIN + COLOR_MAX)//2
 
-    def __init__(self, controller: ImageEditingController, min_height: int, language: int):
+    def __init__(self, controller: ImageEditingController, min_height: int, language: int, task_runner: TaskRunner):
         super().__init__()
 
         self.texts = image_threshold_widget
         self.language = language
 
         self.controller = controller
+        self.task_runner = task_runner
+        self.threshold_task: Task = None
         self.min_height = min_height
         self.threshold = self.COLOR_MID
         self._setup_ui()
@@ -104,12 +108,24 @@ class ImageThresholdWidget(QWidget):
         self.on_threshold_parameter_edited(self.COLOR_MID)
 
     def on_threshold_parameter_edited(self, value: int):
-        """ Save image with updated threshold value. """
+        """ Save image with updated threshold value in the background, skipping updates for previous values that have not run yet. """
         self.threshold = value
-        self.controller.save_binary_image(self.threshold)
-        self._update_display()
+        if self.threshold_task is not None:
+            self.threshold_task.cancel()
+        self.threshold_task = self.task_runner.start(
+            self.controller.save_binary_image, 
+            self.threshold, 
+            on_finished=self._on_binary_saved
+        )
+
+    def _on_binary_saved(self, saved: bool):
+        if saved:
+            self._update_display()
 
     def on_save_button_pressed(self):
-        """ User presses save button. """
-        self.controller.finalize_binary()
-        self.thresholdingFinalized.emit()
+        """ User presses save button. Binary image is finalized after pending threshold updates. """
+        self.task_runner.start(self.controller.finalize_binary, on_finished=self._on_binary_finalized)
+
+    def _on_binary_finalized(self, finalized: bool):
+        if finalized:
+            self.thresholdingFinalized.emit()
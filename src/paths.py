@@ -49,6 +49,11 @@ if not os.path.exists(LAYOUT_PREVIEW_DIR):
 
 LAYOUT_PREVIEW_PATH  = os.path.join(LAYOUT_PREVIEW_DIR, 'layout.png')
 
+''' parsed STL files are kept between sessions, so this is not a temporary directory. Its size is limited by STLCache.MAX_SIZE '''
+STL_CACHE_DIR = os.path.join(CACHE_DIR, 'stl')
+if not os.path.exists(STL_CACHE_DIR):
+    os.makedirs(STL_CACHE_DIR)
+
 TEMP_DIRS = [IMAGE_PREVIEW_DIR, PART_PREVIEW_DIR, PLATE_PREVIEW_DIR, ROUTER_PREVIEW_DIR, LAYOUT_PREVIEW_DIR]
 
 USER_SETTINGS_PATH = os.path.join(DATA_DIR, 'user_settings.json')
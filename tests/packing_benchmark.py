@@ -0,0 +1,267 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from src.app.utils.packing import packing_algo
+from src.app.utils.packing.layout_optimizer import score_layout, is_movable
+from src.app.utils.stl_parser import STLParser
+
+"""
+Packing benchmark harness.
+
+Generates seeded workloads, times the phases of execute_packing_algorithm and reports utilization and throughput.
+Results are compared against machine-readable baselines so regressions in speed or packing quality are detected.
+Packing quality of quick workloads is gated by tests/test_packing_benchmark.py. Times depend on the machine, so they are only gated
+there if the PACKING_BENCHMARK_TIMES environment variable is set, e.g. on the machine that recorded the baseline.
+The full suite, comparing both quality and times, is run from the repository root with:
+
+    python -m tests.packing_benchmark                       # run all workloads and compare against baseline
+    python -m tests.packing_benchmark --quick               # run quick workloads only
+    python -m tests.packing_benchmark --update-baseline     # overwrite baseline with current results
+
+Workloads:
+- rectangles: random rectangles of varying aspect ratio.
+- polygons: random irregular star-shaped polygons.
+- holes: rectangles on plates with existing cutouts (plate contours).
+- stl: copies of the valid parts in tests/test data/stl files, parsed with STLParser.
+"""
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test data', 'packing_benchmark_baseline.json')
+STL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test data', 'stl files')
+STL_FILES: Tuple[str, ...] = ('RollerConnectorPlate.STL',)
+
+PLATE_SIZE: Tuple[float, float] = (2440.0, 1220.0)
+BIT_DIAMETER: float = 3.0
+EDGE_DISTANCE: float = 10.0
+PLATE_AREA_FACTOR: float = 1.6
+
+TIME_TOLERANCE: float = 3.0
+TIME_SLACK: float = 0.25
+UTILIZATION_TOLERANCE: float = 0.005
+
+TIMES_ENV_VAR: str = 'PACKING_BENCHMARK_TIMES'
+
+class Workload(NamedTuple):
+    """ Seeded packing job in the input format of execute_packing_algorithm. """
+    name: str
+    bins: List[Tuple[str, Tuple[float, float], List[List[Tuple[float, float]]]]]
+    pieces: List[Tuple[str, List[Tuple[float, float]], int]]
+    rotations: Tuple[float, ...]
+
+""" Workload generation """
+
+def _rectangle(width: float, height: float) -> List[Tuple[float, float]]:
+    return [(0.0, 0.0), (width, 0.0), (width, height), (0.0, height)]
+
+def _polygon(rng: random.Random, radius: float) -> List[Tuple[float, float]]:
+    n_vertices = rng.randint(5, 12)
+    return [
+        (
+            float(radius * rng.uniform(0.4, 1) * math.cos(2 * math.pi * i / n_vertices)),
+            float(radius * rng.uniform(0.4, 1) * math.sin(2 * math.pi * i / n_vertices))
+        )
+        for i in range(n_vertices)
+    ]
+
+def _bb_area(contour: List[Tuple[float, float]]) -> float:
+    xs, ys = [p[0] for p in contour], [p[1] for p in contour]
+    return (max(xs) - min(xs) + 2 * BIT_DIAMETER) * (max(ys) - min(ys) + 2 * BIT_DIAMETER)
+
+def _split_amounts(rng: random.Random, n_parts: int, n_types: int) -> List[int]:
+    """ Split n_parts into amounts for n_types part types, each at least 1. """
+    n_types = min(n_types, n_parts)
+    cuts = sorted(rng.sample(range(1, n_parts), n_types - 1)) if n_types > 1 else []
+    bounds = [0] + cuts + [n_parts]
+    return [bounds[i + 1] - bounds[i] for i in range(n_types)]
+
+def _plates(pieces: List[Tuple[str, List[Tuple[float, float]], int]], contours: Callable[[int], List[List[Tuple[float, float]]]] = None):
+    """ Create enough plates to hold pieces by bounding box area, with optional existing contours per plate. """
+    required_area = sum(_bb_area(contour) * amount for _, contour, amount in pieces) * PLATE_AREA_FACTOR
+    n_plates = max(1, math.ceil(required_area / (PLATE_SIZE[0] * PLATE_SIZE[1])))
+    return [(f'plate{i}', PLATE_SIZE, contours(i) if contours else []) for i in range(n_plates)]
+
+def rectangle_workload(n_parts: int, seed: int = 0) -> Workload:
+    rng = random.Random(seed)
+    amounts = _split_amounts(rng, n_parts, max(1, n_parts // 5))
+    pieces = [(f'rect{i}', _rectangle(rng.uniform(20, 400), rng.uniform(20, 300)), amount) for i, amount in enumerate(amounts)]
+    return Workload(f'rectangles_{n_parts}', _plates(pieces), pieces, packing_algo.RIGHT_ANGLE_ROTATIONS)
+
+def polygon_workload(n_parts: int, seed: int = 0) -> Workload:
+    rng = random.Random(seed)
+    amounts = _split_amounts(rng, n_parts, max(1, n_parts // 5))
+    pieces = [(f'poly{i}', _polygon(rng, rng.uniform(20, 200)), amount) for i, amount in enumerate(amounts)]
+    return Workload(f'polygons_{n_parts}', _plates(pieces), pieces, packing_algo.RIGHT_ANGLE_ROTATIONS)
+
+def holes_workload(n_parts: int, seed: int = 0) -> Workload:
+    rng = random.Random(seed)
+    amounts = _split_amounts(rng, n_parts, max(1, n_parts // 5))
+    pieces = [(f'rect{i}', _rectangle(rng.uniform(20, 300), rng.uniform(20, 300)), amount) for i, amount in enumerate(amounts)]
+
+    def cutouts(_: int) -> List[List[Tuple[float, float]]]:
+        contours = []
+        for _ in range(rng.randint(2, 6)):
+            width, height = rng.uniform(50, 400), rng.uniform(50, 400)
+            x, y = rng.uniform(0, PLATE_SIZE[0] - width), rng.uniform(0, PLATE_SIZE[1] - height)
+            contours.append([(x + px, y + py) for px, py in _rectangle(width, height)])
+        return contours
+
+    return Workload(f'holes_{n_parts}', _plates(pieces, cutouts), pieces, packing_algo.RIGHT_ANGLE_ROTATIONS)
+
+def stl_workload(n_parts: int, seed: int = 0) -> Workload:
+    rng = random.Random(seed)
+    contours = []
+    for filename in STL_FILES:
+        parser = STLParser(os.path.join(STL_DIR, filename))
+        parser.parse_stl()
+        contours.append([(float(x), float(y)) for x, y in parser.outer_contour.tolist()])
+    amounts = _split_amounts(rng, n_parts, len(contours))
+    pieces = [(f'stl{i}', contour, amount) for i, (contour, amount) in enumerate(zip(contours, amounts))]
+    return Workload(f'stl_{n_parts}', _plates(pieces), pieces, packing_algo.RIGHT_ANGLE_ROTATIONS)
+
+WORKLOADS: Dict[str, Callable[[], Workload]] = {
+    'rectangles_10': lambda: rectangle_workload(10),
+    'rectangles_100': lambda: rectangle_workload(100),
+    'rectangles_500': lambda: rectangle_workload(500),
+    'rectangles_2000': lambda: rectangle_workload(2000),
+    'polygons_10': lambda: polygon_workload(10),
+    'polygons_100': lambda: polygon_workload(100),
+    'polygons_500': lambda: polygon_workload(500),
+    'holes_100': lambda: holes_workload(100),
+    'holes_500': lambda: holes_workload(500),
+    'stl_20': lambda: stl_workload(20),
+    'stl_200': lambda: stl_workload(200),
+}
+
+QUICK_WORKLOADS: Tuple[str, ...] = ('rectangles_10', 'rectangles_100', 'polygons_100', 'holes_100', 'stl_20')
+
+""" Measurement """
+
+def run_workload(workload: Workload, render: bool = True) -> Dict[str, float]:
+    """
+    Pack workload and measure build, pack, placement and render phases in seconds, along with packing quality.
+    Utilization is the area of placed parts divided by the area of used plates.
+    """
+    metrics: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    obstacles = packing_algo.build_obstacles(workload.bins, BIT_DIAMETER)
+    pieces = packing_algo.build_pieces(workload.pieces, BIT_DIAMETER)
+    pieces = sorted(pieces, key=lambda p: p.get_bb().area, reverse=True)
+    bins = packing_algo.build_bins(workload.bins, obstacles, EDGE_DISTANCE, rotations=workload.rotations)
+    metrics['build_time'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    layout = packing_algo.pack_bins(bins, pieces)
+    metrics['pack_time'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    packing_algo.get_placements(layout)
+    metrics['placement_time'] = time.perf_counter() - start
+
+    if render:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            packing_algo.render_part_placements(layout.used_bins, layout.free_bins, os.path.join(directory, 'preview.png'))
+            metrics['render_time'] = time.perf_counter() - start
+
+    score = score_layout(layout)
+    placed_area = sum(piece.get_area() for bin in layout.used_bins for piece in bin.placed_pieces if is_movable(piece))
+    metrics['total_time'] = sum(value for key, value in metrics.items() if key.endswith('_time'))
+    metrics['n_parts'] = len(pieces)
+    metrics['n_placed'] = len(pieces) - score.unplaced
+    metrics['plates_used'] = score.plates_used
+    metrics['utilization'] = placed_area / score.used_area if score.used_area else 0.0
+    metrics['throughput'] = len(pieces) / metrics['pack_time'] if metrics['pack_time'] > 0 else float('inf')
+    return metrics
+
+def run_benchmarks(names: List[str], render: bool = True) -> Dict[str, Dict[str, float]]:
+    """ Run named workloads. Returns dictionary of workload name to metrics. """
+    return {name: run_workload(WORKLOADS[name](), render) for name in names}
+
+""" Baselines """
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    """ Load baseline results. Returns empty dictionary if no baseline exists. """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)['results']
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = BASELINE_PATH) -> None:
+    """ Merge results into baseline file, keeping results for workloads that were not run. """
+    baseline = load_baseline(path)
+    baseline.update({name: {key: round(value, 6) for key, value in metrics.items()} for name, metrics in results.items()})
+    with open(path, 'w') as f:
+        json.dump({'machine': platform.platform(), 'python': platform.python_version(), 'results': baseline}, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    time_tolerance: float = TIME_TOLERANCE,
+    utilization_tolerance: float = UTILIZATION_TOLERANCE,
+    compare_times: bool = True
+) -> List[str]:
+    """
+    Compare results against baseline. Returns list of regressions.
+    Packing quality is deterministic and compared closely; times vary between machines and are compared with a relative tolerance plus fixed slack,
+    unless compare_times is False.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if metrics['n_placed'] < expected['n_placed']:
+            regressions.append(f"{name}: placed {metrics['n_placed']:.0f} parts, baseline {expected['n_placed']:.0f}")
+        if metrics['plates_used'] > expected['plates_used']:
+            regressions.append(f"{name}: used {metrics['plates_used']:.0f} plates, baseline {expected['plates_used']:.0f}")
+        if metrics['plates_used'] == expected['plates_used'] and metrics['utilization'] < expected['utilization'] - utilization_tolerance:
+            regressions.append(f"{name}: utilization {metrics['utilization']:.3f}, baseline {expected['utilization']:.3f}")
+        for key in ('build_time', 'pack_time') if compare_times else ():
+            if metrics[key] > expected[key] * time_tolerance + TIME_SLACK:
+                regressions.append(f"{name}: {key} {metrics[key]:.3f}s, baseline {expected[key]:.3f}s")
+    return regressions
+
+def format_results(results: Dict[str, Dict[str, float]]) -> str:
+    """ Format results as a table. """
+    header = f"{'workload':<18}{'parts':>7}{'placed':>8}{'plates':>8}{'util':>8}{'build s':>10}{'pack s':>10}{'render s':>10}{'parts/s':>10}"
+    lines = [header, '-' * len(header)]
+    for name, m in results.items():
+        lines.append(
+            f"{name:<18}{m['n_parts']:>7.0f}{m['n_placed']:>8.0f}{m['plates_used']:>8.0f}{m['utilization']:>8.3f}"
+            f"{m['build_time']:>10.3f}{m['pack_time']:>10.3f}{m.get('render_time', 0):>10.3f}{m['throughput']:>10.0f}"
+        )
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run packing benchmarks.")
+    parser.add_argument('--workloads', nargs='*', choices=list(WORKLOADS.keys()), help="workloads to run, defaults to all")
+    parser.add_argument('--quick', action='store_true', help="run quick workloads only")
+    parser.add_argument('--no-render', action='store_true', help="skip preview rendering")
+    parser.add_argument('--update-baseline', action='store_true', help="save results as baseline")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline file path")
+    args = parser.parse_args()
+
+    names = args.workloads or (list(QUICK_WORKLOADS) if args.quick else list(WORKLOADS.keys()))
+    results = run_benchmarks(names, render=not args.no_render)
+    print(format_results(results))
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    regressions = compare(results, load_baseline(args.baseline))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    raise SystemExit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
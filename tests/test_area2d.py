@@ -142,3 +142,57 @@ def test_rotate_multiple(sample_shape):
     assert sample_shape.rotation == 45
     sample_shape.rotate(90)
     assert sample_shape.rotation == 135
+
+### Intersection Tests
+
+def test_bb_cached_until_moved(sample_shape):
+    bb = sample_shape.get_bb()
+    assert sample_shape.get_bb() is bb
+    sample_shape.move(Vector2D(1, 1))
+    assert sample_shape.get_bb() is not bb
+    assert sample_shape.get_position() == (1, 1)
+
+def test_bounds_overlap(sample_shape, sample_rect):
+    assert sample_shape.bounds_overlap(sample_rect)
+    sample_rect.place_in_position(4, 0)
+    assert not sample_shape.bounds_overlap(sample_rect)
+
+def test_intersects_matches_intersection(sample_shape):
+    overlapping = Area2D(shape=Rectangle2D(2, 2, 4, 4))
+    adjacent = Area2D(shape=Rectangle2D(4, 0, 4, 3))
+    distant = Area2D(shape=Rectangle2D(10, 10, 4, 3))
+    for other in (overlapping, adjacent, distant):
+        assert sample_shape.intersects(other) == sample_shape.intersection(other)
+    assert sample_shape.intersects(overlapping)
+    assert not sample_shape.intersects(adjacent)
+    assert not sample_shape.intersects(distant)
+
+def test_prepared_intersects(sample_shape):
+    overlapping = Area2D(shape=Rectangle2D(2, 2, 4, 4))
+    sample_shape.prepare()
+    assert sample_shape.is_prepared()
+    assert sample_shape.intersects(overlapping)
+    sample_shape.move(Vector2D(10, 10))
+    assert not sample_shape.is_prepared()
+    assert not sample_shape.intersects(overlapping)
+
+### Rotation Variant Tests
+
+def test_get_rotated_shape(sample_shape):
+    shape, width, height = sample_shape.get_rotated_shape(90)
+    assert (width, height) == pytest.approx((3, 4))
+    assert shape.bounds[:2] == pytest.approx((0, 0))
+    assert sample_shape.get_rotated_shape(90) is sample_shape.get_rotated_shape(450)
+
+def test_get_rotated_shape_with_margin():
+    area = Area2D(id="margin", points=[(0.0, 0.0), (4.0, 0.0), (4.0, 3.0), (0.0, 3.0)], edge_margin=1)
+    _, width, height = area.get_rotated_shape(90)
+    assert (width, height) == pytest.approx((5, 6))
+
+def test_place_rotated(sample_shape):
+    sample_shape.place_rotated(90, 10, 20)
+    assert sample_shape.get_rotation() == 90
+    assert sample_shape.get_position() == pytest.approx((10, 20))
+    assert sample_shape.get_bb().width == pytest.approx(3)
+    sample_shape.place_rotated(0, 0, 0)
+    assert sample_shape.get_bb().width == pytest.approx(4)
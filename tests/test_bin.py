@@ -3,6 +3,7 @@ from src.app.utils.packing.utils.area2d import Area2D
 from src.app.utils.packing.utils.rectangle2d import Rectangle2D
 from src.app.utils.packing.utils.dimension2d import Dimension2D
 from src.app.utils.packing.utils.plot_for_testing import plot_bin, plot_area
+from src.app.utils.packing.packing_algo import rotation_steps, RIGHT_ANGLE_ROTATIONS
 
 import os
 import pytest
@@ -208,3 +209,39 @@ def test_pack_with_edges(test_preview_directory):
     bin.pack([Area2D(id='id', points=[(0, 0), (100, 0), (100, 100), (0, 100)])])
     plot_bin(bin, os.path.join(test_preview_directory, 'pack_with_edges.png'))
 
+
+def test_immovable_parts_prepared():
+    bin = Bin('id', Dimension2D(100, 100), edge_distance=5)
+    contour = Area2D(id='ctr0', points=[(20.0, 20.0), (60.0, 20.0), (60.0, 60.0), (20.0, 60.0)], shift_to_origin=False)
+    bin.add_immovable_part(contour)
+    assert all(piece.is_prepared() for piece in bin.placed_pieces)
+    bin.pack([Area2D(id='piece', shape=Rectangle2D(0, 0, 10, 10))])
+    placed = bin.placed_pieces[-1]
+    assert placed.id == 'piece'
+    assert not any(placed.intersects(piece) for piece in bin.placed_pieces[:-1])
+
+""" Tests for rotation """
+
+def test_pack_rotation_required():
+    bin = Bin('id', Dimension2D(100, 20), rotations=(0.0, 90.0))
+    piece = Area2D(id='piece', shape=Rectangle2D(0, 0, 20, 100))
+    assert bin.pack([piece]) == []
+    assert piece.get_rotation() == 90
+    assert piece.get_bb().width == pytest.approx(100)
+
+def test_pack_rotation_not_allowed():
+    bin = Bin('id', Dimension2D(100, 20))
+    piece = Area2D(id='piece', shape=Rectangle2D(0, 0, 20, 100))
+    assert bin.pack([piece]) == [piece]
+
+def test_pack_prefers_first_rotation():
+    bin = Bin('id', Dimension2D(100, 100), rotations=(0.0, 180.0))
+    piece = Area2D(id='piece', shape=Rectangle2D(0, 0, 20, 10))
+    bin.pack([piece])
+    assert piece.get_rotation() == 0
+
+def test_rotation_steps():
+    assert rotation_steps(90) == RIGHT_ANGLE_ROTATIONS
+    assert len(rotation_steps(15)) == 24
+    with pytest.raises(ValueError):
+        rotation_steps(0)
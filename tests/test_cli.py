@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import subprocess
+import pytest
+import numpy as np
+from sqlalchemy import create_engine, text
+
+from src.app import cli
+from src.app.models.router_model import Router
+from src.app.models.plate_model import Plate
+from src.app.models.part_model import Part
+from src.app.models.utils import serialize_array, serialize_array_list
+
+"""
+Tests for headless layout generation.
+
+Test coverage:
+- JSON jobs with STL and contour parts produce placements, previews and exports
+- layouts generated from a database file
+- legacy text contours in database file converted before use
+- failing jobs reported by exit code
+- part ids containing reserved substrings rejected
+- layouts limited by evaluations identical with any amount of workers
+- time limit stops layout search early
+- no Qt modules imported
+"""
+
+STL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test data', 'stl files')
+THICKNESS = 6.35
+
+@pytest.fixture
+def job_path(tmpdir):
+    job = {
+        'routers': [{'plate_x': 2000, 'plate_y': 2000, 'min_safe_dist_from_edge': 5, 'drill_bit_diameter': 2, 'mill_bit_diameter': 3}],
+        'plates': [
+            {'id': 'stock', 'x': 800, 'y': 600, 'z': THICKNESS, 'material': 'aluminum', 'contours': [[[700, 500], [780, 500], [780, 580], [700, 580]]]}
+        ],
+        'parts': [
+            {'stl': os.path.join(STL_DIR, 'RollerConnectorPlate.STL'), 'amount': 2, 'material': 'Aluminum', 'thickness': THICKNESS},
+            {'id': 'spacer', 'contour': [[0, 0], [50, 0], [50, 30], [0, 30]], 'thickness': THICKNESS, 'material': 'aluminum', 'amount': 3}
+        ]
+    }
+    path = os.path.join(str(tmpdir), 'job1.json')
+    with open(path, 'w') as file:
+        json.dump(job, file)
+    return path
+
+def read_placements(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)['placements']
+
+def test_json_job(job_path, tmpdir):
+    output = os.path.join(str(tmpdir), 'out')
+    assert cli.main([job_path, '-o', output, '--preview', '--export', 'svg', 'dxf']) == 0
+    job_dir = os.path.join(output, 'job1')
+    placements = read_placements(os.path.join(job_dir, 'placements.json'))
+    assert set(placements) == {'RollerConnectorPlate__0', 'RollerConnectorPlate__1', 'spacer__0', 'spacer__1', 'spacer__2'}
+    assert all(placement['plate'] == 'stock' for placement in placements.values())
+    for filename in ('preview.png', 'stock.svg', 'stock.dxf'):
+        assert os.path.getsize(os.path.join(job_dir, filename)) > 0
+
+def test_database(tmpdir):
+    db_path = os.path.join(str(tmpdir), 'app.db')
+    session = cli.create_session(f'sqlite:///{db_path}')
+    session.add(Router(selected=True))
+    session.add(Plate(id='stock', x=500.0, y=500.0, z=THICKNESS, selected=True))
+    session.commit()
+    cli.load_job(session, _write_json(tmpdir, {'parts': [{'id': 'square', 'contour': [[0, 0], [40, 0], [40, 40], [0, 40]], 'thickness': THICKNESS}]}))
+    session.close()
+
+    output = os.path.join(str(tmpdir), 'out')
+    assert cli.main(['--db', db_path, '-o', output]) == 0
+    assert read_placements(os.path.join(output, 'database', 'placements.json'))['square__0']['plate'] == 'stock'
+
+def test_legacy_database(tmpdir):
+    db_path = os.path.join(str(tmpdir), 'legacy.db')
+    session = cli.create_session(f'sqlite:///{db_path}')
+    session.add(Router(selected=True))
+    session.add(Plate(id='stock', x=500.0, y=500.0, z=THICKNESS, selected=True))
+    session.add(Part(id='square', thickness=THICKNESS, contours=b''))
+    session.commit()
+    session.close()
+
+    engine = create_engine(f'sqlite:///{db_path}')
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE plates SET contours = :contours"), {
+            'contours': serialize_array_list([np.array([[[400, 400]], [[480, 400]], [[480, 480]], [[400, 480]]], dtype=np.int32)])
+        })
+        connection.execute(text("UPDATE parts SET contours = :contours"), {
+            'contours': serialize_array(np.array([[0.0, 0.0], [40.0, 0.0], [40.0, 40.0], [0.0, 40.0]]))
+        })
+    engine.dispose()
+
+    output = os.path.join(str(tmpdir), 'out')
+    assert cli.main(['--db', db_path, '-o', output]) == 0
+    assert read_placements(os.path.join(output, 'database', 'placements.json'))['square__0']['plate'] == 'stock'
+
+def test_evaluations(job_path, tmpdir):
+    placements = []
+    for workers in (1, 2):
+        output = os.path.join(str(tmpdir), f'out{workers}')
+        assert cli.main([job_path, '-o', output, '--evaluations', '2', '--workers', str(workers)]) == 0
+        placements.append(read_placements(os.path.join(output, 'job1', 'placements.json')))
+    assert placements[0] == placements[1]
+
+def test_time_limit(job_path, tmpdir):
+    output = os.path.join(str(tmpdir), 'out')
+    start = time.monotonic()
+    assert cli.main([job_path, '-o', output, '--time-budget', '60', '--time-limit', '0.5', '--workers', '1']) == 0
+    assert time.monotonic() - start < 30
+    placements = read_placements(os.path.join(output, 'job1', 'placements.json'))
+    assert all(placement is not None for placement in placements.values())
+
+def test_failed_job(tmpdir):
+    job_path = _write_json(tmpdir, {'routers': [{}], 'plates': [], 'parts': []})
+    assert cli.main([job_path, '-o', os.path.join(str(tmpdir), 'out')]) == 1
+    assert cli.main([job_path, '--db', 'app.db']) == 1
+
+@pytest.mark.parametrize('part_id', ['edge_guard', 'plate_ctr', 'part__1'])
+def test_reserved_part_id(tmpdir, part_id):
+    job = {
+        'routers': [{}],
+        'plates': [{'id': 'stock', 'x': 500, 'y': 500, 'z': THICKNESS}],
+        'parts': [{'id': part_id, 'contour': [[0, 0], [40, 0], [40, 40], [0, 40]], 'thickness': THICKNESS}]
+    }
+    output = os.path.join(str(tmpdir), 'out')
+    assert cli.main([_write_json(tmpdir, job), '-o', output]) == 1
+    assert not os.path.exists(os.path.join(output, 'job', 'placements.json'))
+
+    job['parts'][0]['id'] = 'guard'
+    assert cli.main([_write_json(tmpdir, job), '-o', output]) == 0
+    assert read_placements(os.path.join(output, 'job', 'placements.json'))['guard__0']['plate'] == 'stock'
+
+def test_no_qt_imports():
+    code = "import sys; import src.app.cli; print(any(module.startswith('PyQt') for module in sys.modules))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+def _write_json(tmpdir, data: dict) -> str:
+    path = os.path.join(str(tmpdir), 'job.json')
+    with open(path, 'w') as file:
+        json.dump(data, file)
+    return path
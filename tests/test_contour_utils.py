@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from src.app.utils.contour_utils import get_arc_lengths, interpolate_contour, decimate_contour, densify_contour, simplify_contour
+
+"""
+Tests for contour resampling and simplification.
+
+Test coverage:
+- arc lengths and interpolation along closed contour
+- densified segments no longer than twice the spacing, keeping original points
+- decimated points about one spacing of arc length apart, including across the closing segment
+- simplification within tolerance, keeping bounding box
+"""
+
+@pytest.fixture
+def square():
+    return np.array([(0.0, 0.0), (100.0, 0.0), (100.0, 100.0), (0.0, 100.0)])
+
+@pytest.fixture
+def circle():
+    angles = np.linspace(0, 2 * np.pi, 2000, endpoint=False)
+    return np.column_stack((np.cos(angles), np.sin(angles))) * 50 + 50
+
+def test_arc_lengths(square):
+    assert get_arc_lengths(square).tolist() == [0, 100, 200, 300, 400]
+    assert get_arc_lengths(square, closed=False).tolist() == [0, 100, 200, 300]
+    assert interpolate_contour(square, np.array([50.0, 100.0, 350.0, 400.0])).tolist() == [[50, 0], [100, 0], [0, 50], [0, 0]]
+
+def test_densify(square):
+    dense = densify_contour(square, 10)
+    assert len(dense) == 4 * 10
+    assert dense[-1].tolist() == [0, 0]
+    assert all(point.tolist() in dense.tolist() for point in square)
+    steps = np.hypot(*np.diff(np.vstack((dense[-1:], dense)), axis=0).T)
+    assert steps.max() < 20
+
+def test_decimate(circle):
+    sparse = decimate_contour(circle, 10)
+    assert sparse[0].tolist() == circle[0].tolist()
+    assert np.hypot(*np.diff(sparse, axis=0).T).min() > 9.5
+    assert len(sparse) == pytest.approx(2 * np.pi * 50 / 10, abs=1)
+
+def test_decimate_closing_segment(square):
+    closed = np.vstack((square, [(0.0, 5.0), (0.0, 2.0)]))
+    sparse = decimate_contour(closed, 10)
+    assert sparse.tolist() == square.tolist()
+    assert np.hypot(*(sparse[-1] - sparse[0])) >= 10
+
+    dense = np.array([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0)])
+    assert decimate_contour(dense, 10).tolist() == [[0, 0]]
+
+def test_simplify(square, circle):
+    dense_square = densify_contour(square, 1)
+    simplified_square = simplify_contour(dense_square, 0.01)
+    assert len(simplified_square) <= 6
+    assert Polygon(simplified_square).area == pytest.approx(100 * 100)
+
+    simplified = simplify_contour(circle, 0.1)
+    assert len(simplified) < len(circle) / 10
+    assert Polygon(simplified).bounds == pytest.approx(Polygon(circle).bounds)
+    assert Polygon(circle).hausdorff_distance(Polygon(simplified)) <= 0.1 + 1e-9
+
+    assert simplify_contour(circle, 0).tolist() == circle.tolist()
+    assert simplify_contour(square[:3], 10).tolist() == square[:3].tolist()
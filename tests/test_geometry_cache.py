@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import src.app.models.geometry_cache as geometry_cache_module
+from src.app.models.geometry_cache import GeometryCache, geometry_cache
+from src.app.models.plate_model import Plate
+from src.app.models.utils import serialize_contours
+from src.app.controllers.plate_controller import PlateController
+
+"""
+Tests for in-memory geometry cache.
+
+Test coverage:
+- contours decoded once per version and derived geometry computed once
+- invalidation and changed contours decode again
+- least recently used entries dropped
+- rows without contours not cached
+- controllers invalidate edited rows
+"""
+
+@pytest.fixture
+def contours():
+    return [np.array([[0, 0], [10, 0], [10, 10]]), np.array([[20, 20], [30, 20], [30, 30], [20, 30]])]
+
+@pytest.fixture
+def plate(contours):
+    return Plate(id='plate', contours=serialize_contours(contours))
+
+@pytest.fixture
+def decode_count(monkeypatch):
+    count = [0]
+    deserialize = geometry_cache_module.deserialize_contours
+    def counting_deserialize(data):
+        count[0] += 1
+        return deserialize(data)
+    monkeypatch.setattr(geometry_cache_module, 'deserialize_contours', counting_deserialize)
+    return count
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite:///:memory:')
+    Plate.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def test_get_contours(plate, contours, decode_count):
+    cache = GeometryCache()
+    cached = cache.get_contours(plate)
+    assert [contour.tolist() for contour in cached] == [contour.tolist() for contour in contours]
+    assert cache.get_contours(plate) is cached
+    assert decode_count[0] == 1
+
+    computed = []
+    get_areas = lambda contours: computed.append(1) or [len(contour) for contour in contours]
+    assert cache.get(plate, 'areas', get_areas) == [3, 4]
+    assert cache.get(plate, 'areas', get_areas) == [3, 4]
+    assert len(computed) == 1
+
+    assert cache.get_contours(Plate(id='empty', contours=None)) is None
+    assert cache.get(Plate(id='invalid', contours=b'invalid'), 'areas', get_areas) is None
+
+def test_invalidate(plate, contours, decode_count):
+    cache = GeometryCache()
+    cached = cache.get_contours(plate)
+    cache.invalidate('plates', 'plate')
+    assert cache.get_contours(plate) is not cached
+    assert decode_count[0] == 2
+
+    cached = cache.get_contours(plate)
+    plate.contours = serialize_contours(contours[:1])
+    assert len(cache.get_contours(plate)) == 1
+    assert decode_count[0] == 3
+
+    cache.invalidate('plates')
+    cache.get_contours(plate)
+    assert decode_count[0] == 4
+
+def test_max_entries(contours, decode_count):
+    cache = GeometryCache(max_entries=2)
+    plates = [Plate(id=f'plate{i}', contours=serialize_contours(contours)) for i in range(3)]
+    for plate in plates:
+        cache.get_contours(plate)
+    cache.get_contours(plates[2])
+    assert decode_count[0] == 3
+    cache.get_contours(plates[0])
+    assert decode_count[0] == 4
+    assert len(cache.entries) == 2
+
+def test_controller_invalidates(session, contours, tmpdir):
+    controller = PlateController(session, str(tmpdir))
+    plate = controller.add_new()
+    controller.edit_contours(plate.id, contours)
+    assert len(controller.get_contours(plate.id)) == 2
+    key = ('plates', plate.id, geometry_cache.versions[('plates', plate.id)])
+    assert key in geometry_cache.entries
+
+    controller.edit_contours(plate.id, contours[:1])
+    assert key not in geometry_cache.entries
+    assert len(controller.get_contours(plate.id)) == 1
+
+    controller.remove(plate.id)
+    assert not any(entry[:2] == ('plates', plate.id) for entry in geometry_cache.entries)
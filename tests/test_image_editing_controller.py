@@ -11,7 +11,7 @@ import numpy as np
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from src.app.models.utils import deserialize_array_list
+from src.app.models.utils import deserialize_contours
 from src.app.utils.image_processing.features import Features
 from src.app.utils.image_processing.utils import Size
 from src.app.models.plate_model import Plate, PlateConstants
@@ -396,9 +396,9 @@ def test_update_plate_successful(controller, valid_raw_path):
     assert controller.update_plate() == True
     plate_in_db = controller.session.query(Plate).filter(Plate.id == controller.plate.id).first()
     print(plate_in_db)
-    db_contours = deserialize_array_list(plate_in_db.contours)
+    db_contours = deserialize_contours(plate_in_db.contours)
 
-    old = controller.flattened_contours
+    old = [contour.reshape(-1, 2) for contour in controller.flattened_contours]
     new = db_contours
 
     assert len(old) == len(new), "Length of the lists do not match"
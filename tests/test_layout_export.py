@@ -0,0 +1,128 @@
+import os
+import xml.etree.ElementTree as ET
+import numpy as np
+import pytest
+from shapely.affinity import translate
+from shapely.geometry import Polygon
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.app.controllers.optimization_controller import OptimizationController
+from src.app.models.router_model import Router
+from src.app.models.plate_model import Plate
+from src.app.models.part_model import Part
+from src.app.models.utils import serialize_contour, deserialize_contours
+from src.app.utils.packing import packing_algo
+from src.app.utils.packing.layout_export import export_layout, ExportFormat, ExportLayers, get_safe_filename
+
+"""
+Tests for vector layout export.
+
+Test coverage:
+- one file written per plate, named after plate id
+- SVG contains plate, contour and part outlines, including holes
+- DXF contains closed polylines on plate, contour and part layers, with flipped y axis
+- invalid export directory rejected
+- controller exports original part contours rather than simplified packing outlines, matching saved plate contours
+"""
+
+SVG_NAMESPACE = '{http://www.w3.org/2000/svg}'
+
+FRAME = [(0.0, 0.0), (60.0, 0.0), (60.0, 40.0), (0.0, 40.0)]
+HOLE = [(20.0, 10.0), (40.0, 10.0), (40.0, 30.0), (20.0, 30.0)]
+
+@pytest.fixture
+def layout():
+    bins = [
+        ('plate/0', (200.0, 100.0), [[(150.0, 60.0), (190.0, 60.0), (190.0, 90.0), (150.0, 90.0)]]),
+        ('plate/1', (200.0, 100.0), [])
+    ]
+    layout = packing_algo.generate_layout(bins, [('part', FRAME, 3)], 1, 2)
+    for piece in layout.used_bins[0].placed_pieces:
+        if piece.id == 'part__0':
+            x, y = piece.get_position()
+            piece.shape = piece.shape.difference(translate(Polygon(HOLE), x, y))
+    return layout
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite:///:memory:')
+    Part.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def read_svg_parts(path: str) -> dict:
+    """ Get points of part paths in SVG file by path id. """
+    root = ET.parse(path).getroot()
+    group = next(group for group in root.iter(f'{SVG_NAMESPACE}g') if group.get('id') == ExportLayers.PARTS)
+    return {
+        path.get('id'): [tuple(map(float, point.split(','))) for point in path.get('d')[1:-1].split(' ')]
+        for path in group.findall(f'{SVG_NAMESPACE}path')
+    }
+
+def read_dxf(path: str):
+    """ Get list of (code, value) pairs from DXF file. """
+    with open(path) as file:
+        lines = file.read().splitlines()
+    return [(int(code), value) for code, value in zip(lines[::2], lines[1::2])]
+
+def test_files_per_plate(layout, tmpdir):
+    paths = export_layout(layout.used_bins, str(tmpdir), ExportFormat.SVG)
+    assert [os.path.basename(path) for path in paths] == ['plate_0.svg']
+    assert get_safe_filename('a b/c') == 'a_b_c'
+
+def test_svg(layout, tmpdir):
+    path = export_layout(layout.used_bins, str(tmpdir), ExportFormat.SVG)[0]
+    root = ET.parse(path).getroot()
+    assert root.get('width') == '200mm' and root.get('viewBox') == '0 0 200 100'
+    groups = {group.get('id'): group.findall(f'{SVG_NAMESPACE}path') for group in root.iter(f'{SVG_NAMESPACE}g') if group.get('id')}
+    assert len(groups[ExportLayers.PLATE]) == 1
+    assert len(groups[ExportLayers.CONTOURS]) == 1
+    parts = {path.get('id'): path.get('d') for path in groups[ExportLayers.PARTS]}
+    assert set(parts) == {'part__0', 'part__1', 'part__2'}
+    assert parts['part__0'].count('M') == 2
+    assert parts['part__1'].count('M') == 1
+
+def test_dxf(layout, tmpdir):
+    path = export_layout(layout.used_bins, str(tmpdir), ExportFormat.DXF, conversion_factor=2.0)[0]
+    pairs = read_dxf(path)
+    assert pairs[-1] == (0, 'EOF')
+    assert (1, 'AC1009') in pairs
+    layers = [pairs[i + 1][1] for i, pair in enumerate(pairs) if pair == (0, 'POLYLINE')]
+    assert layers.count(ExportLayers.PLATE) == 1
+    assert layers.count(ExportLayers.CONTOURS) == 1
+    assert layers.count(ExportLayers.PARTS) == 4
+    assert pairs.count((0, 'SEQEND')) == len(layers)
+    ys = [float(value) for code, value in pairs if code == 20]
+    assert max(ys) == pytest.approx(200.0)
+    contour_start = pairs.index((8, ExportLayers.CONTOURS), pairs.index((2, 'ENTITIES')))
+    contour_ys = [float(value) for code, value in pairs[contour_start:contour_start + 30] if code == 20][1:5]
+    assert sorted(contour_ys) == pytest.approx([20.0, 20.0, 80.0, 80.0])
+
+def test_invalid_directory(layout):
+    with pytest.raises(FileNotFoundError):
+        export_layout(layout.used_bins, os.path.join('missing', 'directory'))
+
+def test_controller_exports_original_contours(session, tmpdir):
+    zigzag = [(100.0 - 5 * i, 50.0 + 0.25 * (i % 2)) for i in range(1, 20)]
+    contour = np.array([(0.0, 0.0), (100.0, 0.0), (100.0, 50.0)] + zigzag + [(0.0, 50.0)])
+    session.add(Router(selected=True, drill_bit_diameter=6.0, mill_bit_diameter=6.0))
+    session.add(Plate(id='plate', x=400.0, y=300.0, z=5.0, selected=True))
+    session.add(Part(id='part', thickness=5.0, contours=serialize_contour(contour)))
+    session.commit()
+
+    controller = OptimizationController(session, os.path.join(str(tmpdir), 'layout.png'), rotations=(0.0,))
+    job = controller.prepare()
+    assert len(job.parts[0][1]) < len(contour)
+    controller.optimize()
+
+    path = controller.export_layout(str(tmpdir), ExportFormat.SVG)[0]
+    _, (x, y), _ = controller.placements['part__0']
+    expected = [(px + x, py + y) for px, py in contour.tolist()]
+    assert read_svg_parts(path)['part__0'] == pytest.approx(expected, abs=1e-3)
+
+    controller.save_layout()
+    session.expire_all()
+    saved = deserialize_contours(session.get(Plate, 'plate').contours)[-1]
+    assert saved.tolist() == [[int(px), int(py)] for px, py in expected]
@@ -0,0 +1,98 @@
+import os
+import random
+import pytest
+
+from src.app.utils.packing import packing_algo
+from src.app.utils.packing.layout_optimizer import LayoutOptimizer, LayoutScore, Genome, score_layout
+
+"""
+Tests for LayoutOptimizer.
+
+Test coverage:
+- greedy genome reproduces a single greedy pass
+- optimized layout is never worse than the greedy pass
+- results are reproducible for a given seed
+- mutations keep genomes valid
+- time budget is respected
+- optimizer selectable from execute_packing_algorithm
+"""
+
+BINS = [(f'plate{i}', (300.0, 250.0), []) for i in range(6)]
+
+@pytest.fixture
+def preview_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'packing algo preview', 'optimized.png')
+
+@pytest.fixture
+def parts():
+    rng = random.Random(2)
+    parts = []
+    for i in range(10):
+        width, height = rng.uniform(20, 140), rng.uniform(20, 140)
+        parts.append((f'part{i}', [(0.0, 0.0), (width, 0.0), (width, height), (0.0, height)], rng.randint(1, 5)))
+    return parts
+
+def create_optimizer(parts, **kwargs) -> LayoutOptimizer:
+    obstacles = packing_algo.build_obstacles(BINS, 2)
+    pieces = packing_algo.build_pieces(parts, 2)
+    return LayoutOptimizer(
+        lambda ordered_pieces: packing_algo.pack_bins(
+            packing_algo.build_bins(BINS, obstacles, 5, rotations=packing_algo.RIGHT_ANGLE_ROTATIONS),
+            ordered_pieces,
+            sort=False
+        ),
+        pieces,
+        packing_algo.RIGHT_ANGLE_ROTATIONS,
+        **kwargs
+    )
+
+def greedy_score(parts) -> LayoutScore:
+    obstacles = packing_algo.build_obstacles(BINS, 2)
+    pieces = sorted(packing_algo.build_pieces(parts, 2), key=lambda p: p.get_bb().area, reverse=True)
+    bins = packing_algo.build_bins(BINS, obstacles, 5, rotations=packing_algo.RIGHT_ANGLE_ROTATIONS)
+    return score_layout(packing_algo.pack_bins(bins, pieces))
+
+def test_greedy_genome(parts):
+    optimizer = create_optimizer(parts)
+    _, score = optimizer.evaluate(optimizer.get_greedy_genome())
+    assert score == greedy_score(parts)
+
+def test_not_worse_than_greedy(parts):
+    optimizer = create_optimizer(parts, time_budget=60, max_evaluations=60, restart_after=20)
+    layout, score = optimizer.optimize()
+    assert score <= greedy_score(parts)
+    assert score == score_layout(layout)
+    assert optimizer.n_evaluations == 60
+
+def test_reproducible(parts):
+    _, first = create_optimizer(parts, time_budget=60, max_evaluations=30, seed=5).optimize()
+    _, second = create_optimizer(parts, time_budget=None, max_evaluations=30, seed=5).optimize()
+    assert first == second
+
+def test_mutations_valid(parts):
+    optimizer = create_optimizer(parts)
+    genome = optimizer.get_greedy_genome()
+    for _ in range(100):
+        genome = optimizer.mutate(genome)
+        assert sorted(genome.order) == list(range(len(optimizer.pieces)))
+        assert all(rotation in packing_algo.RIGHT_ANGLE_ROTATIONS for rotation in genome.rotations)
+    assert isinstance(optimizer.get_random_genome(), Genome)
+
+def test_time_budget(parts):
+    optimizer = create_optimizer(parts, time_budget=0)
+    optimizer.optimize()
+    assert optimizer.n_evaluations == 1
+    with pytest.raises(ValueError):
+        create_optimizer(parts, time_budget=-1)
+    with pytest.raises(ValueError):
+        create_optimizer(parts, time_budget=None)
+
+def test_execute_with_time_budget(parts, preview_path):
+    res = packing_algo.execute_packing_algorithm(
+        BINS, parts, 2, 5, preview_path,
+        rotations=packing_algo.RIGHT_ANGLE_ROTATIONS,
+        time_budget=0.5
+    )
+    placements = {id: placement for id, placement in res.items() if 'edge' not in id}
+    assert len(placements) == sum(amount for _, _, amount in parts)
+    assert all(placement is not None for placement in placements.values())
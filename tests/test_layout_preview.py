@@ -0,0 +1,55 @@
+import os
+import threading
+import pytest
+
+from src.app.utils.packing import packing_algo
+
+"""
+Tests for rendering layout previews separately from packing.
+
+Test coverage:
+- packing without preview filename does not render
+- placements match between generate_layout and execute_packing_algorithm
+- previews can be rendered later, from a worker thread
+- invalid preview filenames rejected
+"""
+
+BINS = [('plate', (200.0, 200.0), [[(150.0, 150.0), (190.0, 150.0), (190.0, 190.0), (150.0, 190.0)]])]
+PARTS = [('part', [(0.0, 0.0), (40.0, 0.0), (40.0, 30.0), (0.0, 30.0)], 6)]
+
+@pytest.fixture
+def preview_path():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'packing algo preview', 'deferred.png')
+    if os.path.exists(path):
+        os.remove(path)
+    yield path
+    if os.path.exists(path):
+        os.remove(path)
+
+def test_execute_without_preview(preview_path):
+    res = packing_algo.execute_packing_algorithm(BINS, PARTS, 1, 2)
+    assert all(res[f'part__{i}'] is not None for i in range(6))
+    assert not os.path.exists(preview_path)
+
+def test_generate_layout_placements():
+    layout = packing_algo.generate_layout(BINS, PARTS, 1, 2)
+    assert packing_algo.get_placements(layout) == packing_algo.execute_packing_algorithm(BINS, PARTS, 1, 2)
+    with pytest.raises(ValueError):
+        packing_algo.generate_layout(BINS, [('part', [(0, 0), (1, 0), (1, 1)])], 1, 2)
+
+def test_render_in_thread(preview_path):
+    layout = packing_algo.generate_layout(BINS, PARTS, 1, 2)
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(packing_algo.plot_part_placements(layout.used_bins, layout.free_bins, preview_path))
+    )
+    thread.start()
+    thread.join()
+    assert results == [True]
+    assert os.path.exists(preview_path)
+
+def test_invalid_preview_filename(preview_path):
+    with pytest.raises(ValueError):
+        packing_algo.execute_packing_algorithm(BINS, PARTS, 1, 2, preview_path[:-4] + '.jpg')
+    with pytest.raises(FileNotFoundError):
+        packing_algo.execute_packing_algorithm(BINS, PARTS, 1, 2, os.path.join('missing', 'preview.png'))
@@ -0,0 +1,70 @@
+import pytest
+from src.app.utils.packing.bin import Bin
+from src.app.utils.packing.max_rects import MaxRects, PlacementHeuristic
+from src.app.utils.packing.utils.area2d import Area2D
+from src.app.utils.packing.utils.dimension2d import Dimension2D
+from src.app.utils.packing.utils.rectangle2d import Rectangle2D
+
+"""
+Tests for MaxRects free space manager.
+
+Test coverage:
+- splitting produces maximal rectangles
+- contained and duplicate rectangles are pruned
+- candidate ordering for each heuristic
+- free rectangle count stays bounded during packing
+"""
+
+@pytest.fixture
+def free_space():
+    return MaxRects([Rectangle2D(0, 0, 100, 100)])
+
+def test_split_center(free_space):
+    free_space.split(Rectangle2D(10, 10, 80, 80))
+    assert len(free_space.free_rectangles) == 4
+    assert Rectangle2D(0, 0, 10, 100) in free_space.free_rectangles
+    assert Rectangle2D(90, 0, 10, 100) in free_space.free_rectangles
+    assert Rectangle2D(0, 0, 100, 10) in free_space.free_rectangles
+    assert Rectangle2D(0, 90, 100, 10) in free_space.free_rectangles
+
+def test_split_corner(free_space):
+    free_space.split(Rectangle2D(0, 0, 50, 50))
+    assert sorted(free_space.free_rectangles, key=lambda r: (r.min_x, r.min_y)) == [
+        Rectangle2D(0, 50, 100, 50),
+        Rectangle2D(50, 0, 50, 100)
+    ]
+
+def test_split_no_intersection(free_space):
+    free_space.split(Rectangle2D(100, 100, 10, 10))
+    assert free_space.free_rectangles == [Rectangle2D(0, 0, 100, 100)]
+
+def test_prune():
+    free_rectangles = [
+        Rectangle2D(0, 0, 10, 10),
+        Rectangle2D(0, 0, 50, 50),
+        Rectangle2D(0, 0, 50, 50),
+        Rectangle2D(40, 40, 20, 20)
+    ]
+    MaxRects.prune(free_rectangles)
+    assert len(free_rectangles) == 2
+    assert Rectangle2D(0, 0, 50, 50) in free_rectangles
+    assert Rectangle2D(40, 40, 20, 20) in free_rectangles
+
+def test_sort_candidates_bottom_left():
+    free_rectangles = [Rectangle2D(20, 0, 10, 10), Rectangle2D(0, 20, 30, 30), Rectangle2D(0, 0, 5, 5)]
+    assert MaxRects.sort_candidates(free_rectangles, 10, 10, PlacementHeuristic.BOTTOM_LEFT) == [1, 0]
+
+def test_sort_candidates_best_short_side_fit():
+    free_rectangles = [Rectangle2D(0, 0, 30, 30), Rectangle2D(30, 0, 11, 50)]
+    assert MaxRects.sort_candidates(free_rectangles, 10, 10, PlacementHeuristic.BEST_SHORT_SIDE_FIT) == [1, 0]
+
+def test_sort_candidates_best_area_fit():
+    free_rectangles = [Rectangle2D(0, 0, 11, 100), Rectangle2D(20, 0, 20, 20)]
+    assert MaxRects.sort_candidates(free_rectangles, 10, 10, PlacementHeuristic.BEST_AREA_FIT) == [1, 0]
+
+@pytest.mark.parametrize('heuristic', list(PlacementHeuristic))
+def test_pack_bounded_free_rectangles(heuristic):
+    bin = Bin('id', Dimension2D(100, 100), heuristic=heuristic)
+    remaining = bin.pack([Area2D(id=f'piece_{i}', shape=Rectangle2D(0, 0, 10, 10)) for i in range(100)])
+    assert remaining == []
+    assert bin.free_rectangles == []
@@ -5,8 +5,9 @@ Date: 2024/06/01
 
 import pytest
 import numpy as np
-from sqlalchemy import Integer, Float, String, Text, Boolean
+from sqlalchemy import Integer, Float, String, Text, Boolean, LargeBinary, create_engine, text
 from src.app.models.utils import get_uuid, serialize_array, deserialize_array, serialize_array_list, deserialize_array_list, get_python_type, is_value_of_type
+from src.app.models.utils import serialize_contours, deserialize_contours, serialize_contour, deserialize_contour, migrate_legacy_contours
 
 """
 Tests for ORM model utility functions.
@@ -15,6 +16,8 @@ Test coverage:
 - retrieval of uuid
 - np array serialization and deserialization
 - list of np arrays serialization and deserialization
+- binary contour serialization and zero-copy deserialization
+- migration of legacy contour columns
 - converting sql type to python type
 - converting python type to sql type
 """
@@ -82,6 +85,7 @@ def test_get_python_type():
     assert get_python_type(String()) == str
     assert get_python_type(Text()) == str
     assert get_python_type(Boolean()) == bool
+    assert get_python_type(LargeBinary()) == bytes
     assert get_python_type(None) == None
 
 def test_is_value_of_type():
@@ -101,4 +105,56 @@ def test_is_value_of_type():
     assert is_value_of_type(False, Boolean())
     assert not is_value_of_type("True", Boolean())
     
+    assert is_value_of_type(b"test", LargeBinary())
+    assert not is_value_of_type("test", LargeBinary())
+
     assert not is_value_of_type(1, None)
+
+@pytest.fixture
+def sample_contours():
+    return [np.array([[[0, 0]], [[10, 0]], [[10, 10]]], dtype=np.int32), np.array([[1.5, 2.5], [3.5, 4.5], [5.5, 6.5], [7.5, 8.5]])]
+
+def test_serialize_contours(sample_contours):
+    int_contours = serialize_contours(sample_contours[:1])
+    float_contours = serialize_contours(sample_contours)
+    assert isinstance(float_contours, bytes)
+    assert len(float_contours) == 8 + 3 * 4 + 7 * 2 * 4
+    assert len(float_contours) < len(serialize_array_list(sample_contours))
+
+    deserialized = deserialize_contours(float_contours)
+    assert [contour.shape for contour in deserialized] == [(3, 2), (4, 2)]
+    assert all(contour.dtype == np.float32 for contour in deserialized)
+    assert np.array_equal(deserialized[0], sample_contours[0].reshape(-1, 2))
+    assert np.array_equal(deserialized[1], sample_contours[1])
+    assert not deserialized[1].flags.writeable
+    assert not deserialized[1].flags.owndata
+
+    assert deserialize_contours(int_contours)[0].dtype == np.int32
+    assert deserialize_contours(serialize_contours([])) == []
+    assert serialize_contours(None) is None
+    assert deserialize_contours(None) is None
+    assert deserialize_contours(b'invalid') is None
+
+def test_serialize_contour(sample_contours):
+    assert np.array_equal(deserialize_contour(serialize_contour(sample_contours[1])), sample_contours[1])
+    assert deserialize_contour(serialize_contours(sample_contours)) is None
+    assert serialize_contour(None) is None
+
+def test_migrate_legacy_contours(sample_contours):
+    engine = create_engine('sqlite:///:memory:')
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE parts (id TEXT PRIMARY KEY, contours TEXT NOT NULL)"))
+        connection.execute(text("CREATE TABLE plates (id TEXT PRIMARY KEY, contours TEXT)"))
+        connection.execute(text("INSERT INTO parts VALUES ('legacy', :contours), ('binary', :binary)"), {
+            'contours': serialize_array(sample_contours[1]), 'binary': serialize_contour(sample_contours[1])
+        })
+        connection.execute(text("INSERT INTO plates VALUES ('legacy', :contours), ('empty', NULL)"), {'contours': serialize_array_list(sample_contours)})
+
+        assert migrate_legacy_contours(connection) == 2
+        assert migrate_legacy_contours(connection) == 0
+
+        part_contours = dict(connection.execute(text("SELECT id, contours FROM parts")).all())
+        assert part_contours['legacy'] == part_contours['binary']
+        plate_contours = dict(connection.execute(text("SELECT id, contours FROM plates")).all())
+        assert plate_contours['empty'] is None
+        assert [contour.tolist() for contour in deserialize_contours(plate_contours['legacy'])] == [contour.reshape(-1, 2).tolist() for contour in sample_contours]
@@ -0,0 +1,119 @@
+import os
+import pytest
+import shapely
+from shapely.affinity import translate
+
+from src.app.utils.packing.nfp_bin import NFPBin
+from src.app.utils.packing.packing_algo import execute_packing_algorithm, PackingEngine, RIGHT_ANGLE_ROTATIONS
+from src.app.utils.packing.utils.area2d import Area2D
+from src.app.utils.packing.utils.dimension2d import Dimension2D
+from src.app.utils.packing.utils.no_fit_polygon import NFPCache, minkowski_sum, no_fit_polygon, inner_fit_region
+
+"""
+Tests for no-fit polygon utilities and NFPBin.
+
+Test coverage:
+- minkowski sum of convex and non-convex polygons
+- no-fit polygon marks overlapping translations
+- inner-fit region, including exact and impossible fits
+- NFPs shared between identical pieces
+- L-shaped parts nest into each other
+- placed pieces keep their margins and stay inside bin edges
+- immovable parts are avoided
+- engine selectable from execute_packing_algorithm
+"""
+
+L_SHAPE = [(0.0, 0.0), (100.0, 0.0), (100.0, 20.0), (20.0, 20.0), (20.0, 100.0), (0.0, 100.0)]
+
+@pytest.fixture
+def preview_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'packing algo preview', 'nfp.png')
+
+def l_pieces(n: int, margin: float = 1):
+    return [Area2D(id=f'L{i}', points=list(L_SHAPE), edge_margin=margin) for i in range(n)]
+
+def assert_valid_layout(bin: NFPBin):
+    pieces = [piece for piece in bin.placed_pieces if 'edge' not in piece.id]
+    for i, piece in enumerate(pieces):
+        for other in pieces[i+1:]:
+            distance = piece.edge_margin + other.edge_margin
+            assert piece.shape.distance(other.shape) >= distance - 1e-6
+        if piece in bin.obstacles:
+            continue
+        min_x, min_y, max_x, max_y = piece.shape.bounds
+        assert min_x >= bin.edge_distance + piece.edge_margin - 1e-6
+        assert min_y >= bin.edge_distance + piece.edge_margin - 1e-6
+        assert max_x <= bin.dimension.width - bin.edge_distance - piece.edge_margin + 1e-6
+        assert max_y <= bin.dimension.height - bin.edge_distance - piece.edge_margin + 1e-6
+
+def test_minkowski_sum_convex():
+    square = shapely.box(0, 0, 1, 1)
+    assert minkowski_sum(square, square).equals(shapely.box(0, 0, 2, 2))
+
+def test_minkowski_sum_non_convex():
+    l_shape = shapely.Polygon(L_SHAPE)
+    res = minkowski_sum(l_shape, l_shape)
+    assert res.is_valid
+    assert res.covers(translate(l_shape, 100, 0))
+    assert res.covers(translate(l_shape, 0, 100))
+    assert res.bounds == (0.0, 0.0, 200.0, 200.0)
+
+def test_no_fit_polygon():
+    fixed = shapely.Polygon(L_SHAPE)
+    moving = shapely.box(0, 0, 30, 30)
+    nfp = no_fit_polygon([fixed], [moving])
+    for t in [(0, 0), (10, 50), (90, 10), (-29, -29)]:
+        assert fixed.intersection(translate(moving, *t)).area > 0
+        assert nfp.contains(shapely.Point(t))
+    for t in [(50, 50), (20, 20), (-30, 0), (100, 0)]:
+        assert fixed.intersection(translate(moving, *t)).area == 0
+        assert not nfp.contains(shapely.Point(t))
+
+def test_inner_fit_region():
+    assert inner_fit_region((0, 0, 10, 10), (0, 0, 5, 5)).equals(shapely.box(0, 0, 5, 5))
+    assert inner_fit_region((0, 0, 10, 10), (0, 0, 10, 5)).geom_type == 'LineString'
+    assert inner_fit_region((0, 0, 10, 10), (0, 0, 10, 10)).geom_type == 'Point'
+    assert inner_fit_region((0, 0, 10, 10), (0, 0, 11, 5)) is None
+
+def test_nfp_cache_shared():
+    cache = NFPCache()
+    a, b, c = l_pieces(3)
+    assert a.get_geometry_key() == b.get_geometry_key()
+    assert cache.get_nfp(a, 0, b, 90) is cache.get_nfp(b, 0, c, 90)
+    assert len(cache.nfps) == 1
+
+def test_l_shapes_nest():
+    bin = NFPBin('id', Dimension2D(130, 130), edge_distance=2, rotations=RIGHT_ANGLE_ROTATIONS)
+    assert bin.pack(l_pieces(2)) == []
+    assert_valid_layout(bin)
+
+def test_l_shapes_pack_densely():
+    bin = NFPBin('id', Dimension2D(300, 300), edge_distance=2, rotations=RIGHT_ANGLE_ROTATIONS)
+    assert bin.pack(l_pieces(10)) == []
+    assert bin.get_n_placed() == 14
+    assert_valid_layout(bin)
+
+def test_immovable_part_avoided():
+    bin = NFPBin('id', Dimension2D(100, 100))
+    obstacle = Area2D('ctr0', points=[(0.0, 0.0), (60.0, 0.0), (0.0, 60.0)], shift_to_origin=False, edge_margin=1)
+    bin.add_immovable_part(obstacle)
+    piece = Area2D(id='piece', points=[(0.0, 0.0), (30.0, 0.0), (30.0, 30.0), (0.0, 30.0)], edge_margin=1)
+    assert bin.pack([piece]) == []
+    assert piece.shape.distance(obstacle.shape) >= 2 - 1e-6
+    assert piece.get_position()[0] < 60
+    assert_valid_layout(bin)
+
+def test_piece_too_large():
+    bin = NFPBin('id', Dimension2D(50, 50))
+    assert len(bin.pack(l_pieces(1))) == 1
+
+def test_execute_nfp_engine(preview_path):
+    res = execute_packing_algorithm(
+        [('plate', (130.0, 130.0), [])],
+        [(f'L{i}', list(L_SHAPE)) for i in range(2)],
+        1, 2,
+        preview_path,
+        rotations=RIGHT_ANGLE_ROTATIONS,
+        engine=PackingEngine.NO_FIT_POLYGON
+    )
+    assert res['L0'] is not None and res['L1'] is not None
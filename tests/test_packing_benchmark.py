@@ -0,0 +1,49 @@
+import os
+import pytest
+
+from tests import packing_benchmark
+
+"""
+Regression gate for packing benchmarks. Run the full suite with `python -m tests.packing_benchmark`.
+
+Test coverage:
+- workloads are reproducible for a given seed
+- workloads cover part amounts, plate contours and STL parts
+- regressions are detected against a baseline
+- quick workloads do not regress in packing quality against the saved baseline
+- quick workloads do not regress in speed, only if PACKING_BENCHMARK_TIMES is set
+"""
+
+@pytest.fixture(scope='module')
+def quick_results():
+    return packing_benchmark.run_benchmarks(list(packing_benchmark.QUICK_WORKLOADS), render=False)
+
+def test_workloads_reproducible():
+    assert packing_benchmark.rectangle_workload(100, seed=1) == packing_benchmark.rectangle_workload(100, seed=1)
+    assert packing_benchmark.polygon_workload(100, seed=1) != packing_benchmark.polygon_workload(100, seed=2)
+
+def test_workload_contents():
+    workload = packing_benchmark.holes_workload(100)
+    assert sum(amount for _, _, amount in workload.pieces) == 100
+    assert all(len(contours) > 0 for _, _, contours in workload.bins)
+    assert sum(amount for _, _, amount in packing_benchmark.stl_workload(20).pieces) == 20
+
+def test_compare_detects_regressions():
+    baseline = {'job': {'n_placed': 10, 'plates_used': 2, 'utilization': 0.8, 'build_time': 0.1, 'pack_time': 1.0}}
+    assert packing_benchmark.compare(baseline, baseline) == []
+    slower = {'job': dict(baseline['job'], pack_time=10.0)}
+    worse = {'job': dict(baseline['job'], n_placed=9, plates_used=3)}
+    assert len(packing_benchmark.compare(slower, baseline)) == 1
+    assert len(packing_benchmark.compare(worse, baseline)) == 2
+    assert packing_benchmark.compare(slower, baseline, compare_times=False) == []
+
+def test_no_regressions(quick_results):
+    baseline = packing_benchmark.load_baseline()
+    assert all(name in baseline for name in quick_results)
+    regressions = packing_benchmark.compare(quick_results, baseline, compare_times=False)
+    assert regressions == [], '\n'.join(regressions)
+
+@pytest.mark.skipif(not os.environ.get(packing_benchmark.TIMES_ENV_VAR), reason=f"set {packing_benchmark.TIMES_ENV_VAR} to compare times")
+def test_no_time_regressions(quick_results):
+    regressions = packing_benchmark.compare(quick_results, packing_benchmark.load_baseline())
+    assert regressions == [], '\n'.join(regressions)
@@ -0,0 +1,126 @@
+import random
+import pytest
+
+from src.app.utils.packing import packing_algo
+from src.app.utils.packing.layout_optimizer import LayoutOptimizer
+from src.app.utils.packing.parallel_optimizer import ParallelLayoutOptimizer
+from src.app.utils.packing.progress import PackingProgress, ProgressReporter
+from src.app.utils.cancellation import CancellationToken
+
+"""
+Tests for progress reporting and cancellation of packing.
+
+Test coverage:
+- progress of a greedy pass is monotonic and complete
+- packing stops before the next piece once cancelled, keeping placed pieces
+- cancelled layout search returns best layout so far
+- progress and cancellation passed through generate_layout
+- progress reports are throttled
+"""
+
+BINS = [(f'plate{i}', (400.0, 300.0), []) for i in range(4)]
+
+@pytest.fixture
+def parts():
+    rng = random.Random(3)
+    parts = []
+    for i in range(8):
+        width, height = rng.uniform(20, 120), rng.uniform(20, 120)
+        parts.append((f'part{i}', [(0.0, 0.0), (width, 0.0), (width, height), (0.0, height)], rng.randint(1, 4)))
+    return parts
+
+def create_bins_and_pieces(parts):
+    obstacles = packing_algo.build_obstacles(BINS, 2)
+    pieces = packing_algo.build_pieces(parts, 2)
+    return packing_algo.build_bins(BINS, obstacles, 5), pieces
+
+def unthrottled(monkeypatch):
+    monkeypatch.setattr(ProgressReporter, 'DEFAULT_INTERVAL', 0.0)
+
+def test_greedy_progress(parts, monkeypatch):
+    unthrottled(monkeypatch)
+    bins, pieces = create_bins_and_pieces(parts)
+    reports = []
+    layout = packing_algo.pack_bins(bins, pieces, progress_callback=reports.append)
+
+    fractions = [report.fraction for report in reports]
+    assert fractions == sorted(fractions)
+    assert len(reports) > len(pieces)
+    final = reports[-1]
+    assert final.fraction == 1.0
+    assert final.pieces_total == len(pieces)
+    assert final.pieces_placed == len(pieces) - len(layout.unplaced)
+    assert final.bins_tried == len(layout.used_bins) + len(layout.free_bins)
+    assert 0 < final.utilization <= 1
+
+def test_cancel_mid_pack(parts, monkeypatch):
+    unthrottled(monkeypatch)
+    bins, pieces = create_bins_and_pieces(parts)
+    token = CancellationToken()
+
+    def on_progress(progress: PackingProgress):
+        if progress.pieces_placed >= 3:
+            token.cancel()
+
+    layout = packing_algo.pack_bins(bins, pieces, cancellation_token=token, progress_callback=on_progress)
+    n_placed = sum(1 for bin in layout.used_bins for piece in bin.placed_pieces if 'edge' not in piece.id)
+    assert n_placed == 3
+    assert len(layout.unplaced) == len(pieces) - 3
+    assert len(layout.used_bins) + len(layout.free_bins) == 1
+
+def test_cancelled_before_start(parts):
+    bins, pieces = create_bins_and_pieces(parts)
+    token = CancellationToken()
+    token.cancel()
+    layout = packing_algo.pack_bins(bins, pieces, cancellation_token=token)
+    assert layout.used_bins == [] and len(layout.unplaced) == len(pieces)
+
+def test_cancel_search(parts):
+    obstacles = packing_algo.build_obstacles(BINS, 2)
+    pieces = packing_algo.build_pieces(parts, 2)
+    token = CancellationToken()
+    reports = []
+
+    def pack_layout(ordered_pieces, cancellation_token=None):
+        return packing_algo.pack_bins(packing_algo.build_bins(BINS, obstacles, 5), ordered_pieces, sort=False, cancellation_token=cancellation_token)
+
+    def on_progress(progress: PackingProgress):
+        reports.append(progress)
+        token.cancel()
+
+    optimizer = LayoutOptimizer(pack_layout, pieces, packing_algo.RIGHT_ANGLE_ROTATIONS, time_budget=60)
+    layout, score = optimizer.optimize(token, on_progress)
+    assert optimizer.n_evaluations <= 2
+    assert score.unplaced == 0 and len(layout.unplaced) == 0
+    assert reports[-1].fraction == 1.0 and reports[-1].evaluations == optimizer.n_evaluations
+
+def test_cancel_parallel_in_process(parts):
+    problem = packing_algo.PackingProblem(BINS, parts, 2, 5, packing_algo.PlacementHeuristic.BOTTOM_LEFT, (0.0, 90.0), packing_algo.PackingEngine.RECTANGLES)
+    token = CancellationToken()
+    token.cancel()
+    reports = []
+    optimizer = ParallelLayoutOptimizer(packing_algo.create_packer, problem, (0.0, 90.0), time_budget=60, workers=1)
+    layout, _ = optimizer.optimize(token, reports.append)
+    assert optimizer.get_n_evaluations() == 1
+    assert len(layout.used_bins) > 0
+    assert reports[-1].fraction == 1.0
+
+def test_generate_layout(parts):
+    reports = []
+    layout = packing_algo.generate_layout(BINS, parts, 2, 5, progress_callback=reports.append)
+    assert reports[-1].pieces_placed == reports[-1].pieces_total - len(layout.unplaced)
+
+    token = CancellationToken()
+    token.cancel()
+    layout = packing_algo.generate_layout(BINS, parts, 2, 5, cancellation_token=token)
+    assert len(layout.unplaced) == sum(amount for _, _, amount in parts)
+
+def test_reporter_throttled():
+    reports = []
+    reporter = ProgressReporter(reports.append, interval=60)
+    progress = PackingProgress(0.5, 1, 2, 1, 0.5)
+    for _ in range(10):
+        reporter.report(progress)
+    reporter.report(progress, force=True)
+    assert len(reports) == 2
+    ProgressReporter(None).report(progress, force=True)
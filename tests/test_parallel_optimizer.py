@@ -0,0 +1,107 @@
+import os
+import random
+import pytest
+
+from src.app.utils.packing import packing_algo
+from src.app.utils.packing.layout_optimizer import score_layout
+from src.app.utils.packing.parallel_optimizer import ParallelLayoutOptimizer
+
+"""
+Tests for ParallelLayoutOptimizer.
+
+Test coverage:
+- problem descriptions are picklable
+- results are identical in-process and in a process pool
+- results are deterministic for a given seed
+- searches limited by evaluations independent of amount of workers, and split evenly between common core counts
+- one search per worker for the whole time budget, split between rounds if there are more searches
+- best result is replayed in the calling process
+- parallel search selectable from execute_packing_algorithm
+"""
+
+@pytest.fixture
+def preview_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'packing algo preview', 'parallel.png')
+
+@pytest.fixture
+def problem():
+    rng = random.Random(3)
+    parts = []
+    for i in range(8):
+        width, height = rng.uniform(20, 140), rng.uniform(20, 140)
+        parts.append((f'part{i}', [(0.0, 0.0), (width, 0.0), (width, height), (0.0, height)], rng.randint(1, 4)))
+    bins = [(f'plate{i}', (300.0, 250.0), []) for i in range(5)]
+    return packing_algo.PackingProblem(
+        bins, parts, 2, 5, packing_algo.PlacementHeuristic.BOTTOM_LEFT, packing_algo.RIGHT_ANGLE_ROTATIONS, packing_algo.PackingEngine.RECTANGLES
+    )
+
+def create_optimizer(problem, workers: int, seed: int = 0) -> ParallelLayoutOptimizer:
+    return ParallelLayoutOptimizer(
+        packing_algo.create_packer, problem, problem.rotations, time_budget=120, seed=seed, workers=workers, n_searches=2, max_evaluations=15
+    )
+
+def test_problem_picklable(problem):
+    import pickle
+    assert pickle.loads(pickle.dumps(problem)) == problem
+
+def test_in_process_matches_pool(problem):
+    in_process = create_optimizer(problem, workers=1)
+    pool = create_optimizer(problem, workers=2)
+    _, in_process_score = in_process.optimize()
+    _, pool_score = pool.optimize()
+    assert in_process_score == pool_score
+    assert in_process.results == pool.results
+    assert pool.get_n_evaluations() == 30
+
+def test_deterministic(problem):
+    first = create_optimizer(problem, workers=1, seed=7)
+    second = create_optimizer(problem, workers=1, seed=7)
+    assert first.optimize()[1] == second.optimize()[1]
+
+def test_independent_of_workers(problem):
+    optimizers = [
+        ParallelLayoutOptimizer(packing_algo.create_packer, problem, problem.rotations, time_budget=None, seed=7, workers=workers, max_evaluations=2)
+        for workers in (1, 2)
+    ]
+    assert all(optimizer.n_searches == ParallelLayoutOptimizer.DEFAULT_N_SEARCHES for optimizer in optimizers)
+    assert all(ParallelLayoutOptimizer.DEFAULT_N_SEARCHES % workers == 0 for workers in (2, 3, 4, 6, 8, 12, 16, 24, 48))
+    assert optimizers[0].get_seeds() == optimizers[1].get_seeds()
+    scores = [optimizer.optimize()[1] for optimizer in optimizers]
+    assert scores[0] == scores[1]
+    assert optimizers[0].results == optimizers[1].results
+
+    res = [
+        packing_algo.execute_packing_algorithm(problem.bins, problem.pieces, 2, 5, rotations=problem.rotations, evaluations=2, seed=7, workers=workers)
+        for workers in (1, 2)
+    ]
+    assert res[0] == res[1]
+
+def test_get_deadline(problem):
+    optimizer = ParallelLayoutOptimizer(packing_algo.create_packer, problem, time_budget=12, workers=3, n_searches=8)
+    assert [optimizer.get_deadline(task_idx) for task_idx in range(8)] == [4, 4, 4, 8, 8, 8, 12, 12]
+
+    optimizer = ParallelLayoutOptimizer(packing_algo.create_packer, problem, time_budget=12, workers=16)
+    assert optimizer.n_searches == 16
+    assert [optimizer.get_deadline(task_idx) for task_idx in range(16)] == [12] * 16
+
+    assert ParallelLayoutOptimizer(packing_algo.create_packer, problem, time_budget=None, max_evaluations=5).get_deadline(0) is None
+    with pytest.raises(ValueError):
+        ParallelLayoutOptimizer(packing_algo.create_packer, problem, time_budget=None)
+
+def test_replayed_layout(problem):
+    optimizer = create_optimizer(problem, workers=1)
+    layout, score = optimizer.optimize()
+    assert score == min(result.score for result in optimizer.results)
+    assert score_layout(layout) == score
+
+def test_execute_with_workers(problem, preview_path):
+    res = packing_algo.execute_packing_algorithm(
+        problem.bins, problem.pieces, 2, 5, preview_path,
+        rotations=packing_algo.RIGHT_ANGLE_ROTATIONS,
+        time_budget=0.5,
+        workers=2
+    )
+    placements = {id: placement for id, placement in res.items() if 'edge' not in id}
+    assert len(placements) == sum(amount for _, _, amount in problem.pieces)
+    with pytest.raises(ValueError):
+        ParallelLayoutOptimizer(packing_algo.create_packer, problem, workers=0)
@@ -4,6 +4,7 @@ Date: 2024/06/03
 '''
 
 import os
+import shutil
 import pytest
 import tempfile
 import numpy as np
@@ -11,6 +12,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.app.controllers.part_controller import PartController
 from src.app.models.part_model import Part, PartConstants
+from src.app.utils.cancellation import CancellationToken, OperationCancelled
 
 """
 Tests for PartController.
@@ -25,6 +27,12 @@ Test Coverage:
             - correct parameters
             - correct preview image generation
         - Test adding duplicates
+        - Parsing and adding to db done separately
+    - Add parts from multiple files
+        - Parsed in worker processes and in calling process alike
+        - Unparsable files reported without failing the batch
+        - Duplicates skipped and added in a single transaction
+        - Cancellation removes previews
     - Remove part
         // Directly inherits from superclass, no tests necessary
     - Remove all parts
@@ -134,6 +142,61 @@ def test_add_duplicate(controller, stl_file_path_valid):
     assert initial is not None
     assert duplicate is None
 
+def test_parse_then_add(controller, stl_file_path_valid):
+    assert controller.can_import(stl_file_path_valid)
+    parsed = controller.parse_file(stl_file_path_valid)
+    assert controller.get_total_amount() == 0
+    assert os.path.exists(controller._get_preview_image_path(parsed.id))
+    part = controller.add_parsed(parsed)
+    assert part is not None and controller.get_total_amount() == 1
+    assert not controller.can_import(stl_file_path_valid)
+    duplicate = controller.parse_file(stl_file_path_valid)
+    assert controller.add_parsed(duplicate) is None
+    assert not os.path.exists(controller._get_preview_image_path(duplicate.id))
+
+@pytest.fixture
+def stl_file_copies(stl_file_path_valid, temp_dir):
+    copies = []
+    for i in range(3):
+        copy = os.path.join(temp_dir, f'part_{i}.stl')
+        shutil.copyfile(stl_file_path_valid, copy)
+        copies.append(copy)
+    return copies
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parse_files(controller, stl_file_copies, stl_file_path_invalid, workers):
+    progress = []
+    parts, errors = controller.parse_files(
+        stl_file_copies + [stl_file_path_invalid], 
+        workers=workers, 
+        progress_callback=lambda fraction, message: progress.append(fraction)
+    )
+    assert [part.filename for part in parts] == ['part_0.stl', 'part_1.stl', 'part_2.stl']
+    assert all(part.thickness == 6.349999904632568 for part in parts)
+    assert all(os.path.exists(controller._get_preview_image_path(part.id)) for part in parts)
+    assert list(errors) == [stl_file_path_invalid]
+    assert sorted(progress) == progress and progress[-1] == 1
+    assert controller.get_total_amount() == 0
+
+def test_add_parsed_all(controller, stl_file_copies, stl_file_path_valid):
+    assert controller.add_from_file(stl_file_copies[0]) is not None
+    parts, _ = controller.parse_files(stl_file_copies + [stl_file_copies[1]], workers=1)
+    added = controller.add_parsed_all(parts)
+    assert [part.filename for part in added] == ['part_1.stl', 'part_2.stl']
+    assert controller.get_total_amount() == 3
+    assert not os.path.exists(controller._get_preview_image_path(parts[0].id))
+    assert not os.path.exists(controller._get_preview_image_path(parts[3].id))
+
+    added = controller.add_from_files(stl_file_copies + [stl_file_path_valid, "invalid path"], workers=1)
+    assert [part.filename for part in added] == ['RollerConnectorPlate.STL']
+    assert controller.get_total_amount() == 4
+
+def test_parse_files_cancelled(controller, stl_file_copies, temp_dir):
+    token = CancellationToken()
+    with pytest.raises(OperationCancelled):
+        controller.parse_files(stl_file_copies, workers=1, cancellation_token=token, progress_callback=lambda fraction, message: token.cancel())
+    assert not any(name.endswith('.png') for name in os.listdir(temp_dir))
+
 def test_get_total_part_amount_empty_db(controller):
     assert controller.get_total_amount() == 0
 
@@ -30,7 +30,7 @@ def sample_part_data():
         'filename': 'test_part.stl',
         'thickness': 5.0,
         'material': 'Steel',
-        'contours': 'some_contours_data',
+        'contours': b'some_contours_data',
         'amount': 1
     }
 
@@ -0,0 +1,72 @@
+import os
+import pytest
+
+from src.app.utils.packing.bin import Bin
+from src.app.utils.packing.packing_algo import execute_packing_algorithm, RIGHT_ANGLE_ROTATIONS
+from src.app.utils.packing.utils.dimension2d import Dimension2D
+from src.app.utils.packing.utils.part_type import PartType
+
+"""
+Tests for PartType.
+
+Test coverage:
+- instances share geometry, bounds and rotation variants
+- instances are placed independently
+- rotation variants are computed once for all copies
+- failed copies are not retried
+- part amounts accepted by execute_packing_algorithm
+"""
+
+L_SHAPE = [(0.0, 0.0), (40.0, 0.0), (40.0, 10.0), (10.0, 10.0), (10.0, 40.0), (0.0, 40.0)]
+
+@pytest.fixture
+def preview_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'packing algo preview', 'part types.png')
+
+@pytest.fixture
+def part_type():
+    return PartType('part', L_SHAPE, amount=20, edge_margin=1)
+
+def test_instances_share_geometry(part_type):
+    instances = part_type.create_instances()
+    assert [instance.id for instance in instances] == [f'part__{i}' for i in range(20)]
+    first, second = instances[0], instances[1]
+    assert first.shape is second.shape
+    assert first.get_bb() is second.get_bb()
+    assert first._rotated_shapes is second._rotated_shapes
+    assert first.get_geometry_key() == second.get_geometry_key()
+    assert first.get_area() == part_type.geometry.get_area()
+
+def test_instances_placed_independently(part_type):
+    first, second = part_type.create_instances()[:2]
+    first.place_rotated(90, 50, 50)
+    assert first.get_position() == pytest.approx((50, 50))
+    assert second.get_position() == (0, 0)
+    assert second.get_rotation() == 0
+
+def test_rotations_computed_once(part_type):
+    bin = Bin('id', Dimension2D(200, 200), rotations=RIGHT_ANGLE_ROTATIONS)
+    bin.pack(part_type.create_instances())
+    assert len(part_type.geometry._rotated_shapes) == len(RIGHT_ANGLE_ROTATIONS)
+
+def test_failed_copies_skipped(part_type, monkeypatch):
+    bin = Bin('id', Dimension2D(50, 50))
+    calls = []
+    get_best_rotated_placement = bin.get_best_rotated_placement
+    monkeypatch.setattr(bin, 'get_best_rotated_placement', lambda piece: calls.append(piece) or get_best_rotated_placement(piece))
+    remaining = bin.pack(part_type.create_instances())
+    assert len(remaining) == 19
+    assert len(calls) == 2
+
+def test_execute_with_amounts(preview_path):
+    res = execute_packing_algorithm(
+        [('plate', (200.0, 200.0), [])],
+        [('part', list(L_SHAPE), 5), ('single', [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)])],
+        1, 2,
+        preview_path
+    )
+    placements = {id: placement for id, placement in res.items() if 'edge' not in id}
+    assert set(placements.keys()) == {f'part__{i}' for i in range(5)} | {'single'}
+    assert all(placement is not None for placement in placements.values())
+    with pytest.raises(ValueError):
+        execute_packing_algorithm([('plate', (200.0, 200.0), [])], [('part', list(L_SHAPE), -1)], 1, 2, preview_path)
@@ -11,7 +11,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.app.controllers.plate_controller import PlateController
 from src.app.models.plate_model import Plate, PlateConstants
-from src.app.models.utils import serialize_array, deserialize_array
+from src.app.models.utils import serialize_contours
 
 """
 Tests for PlateController class.
@@ -149,11 +149,12 @@ def test_get_z(controller):
 def test_get_contours(controller):
     new_plate = controller.add_new()
     assert controller.get_contours(new_plate.id) == None
-    new_contour = np.array([1, 2, 3])
-    serialized_contour = serialize_array(new_contour)
-    controller._edit_item_attr(new_plate.id, 'contours', serialized_contour)
-    retrieved_contour = controller.get_contours(new_plate.id)
-    assert np.array_equal(retrieved_contour, new_contour)
+    new_contours = [np.array([[1, 2], [3, 4], [5, 6]])]
+    serialized_contours = serialize_contours(new_contours)
+    controller._edit_item_attr(new_plate.id, 'contours', serialized_contours)
+    retrieved_contours = controller.get_contours(new_plate.id)
+    assert len(retrieved_contours) == 1
+    assert np.array_equal(retrieved_contours[0], new_contours[0])
 
 def test_get_selected(controller):
     new_plate = controller.add_new()
@@ -206,15 +207,15 @@ def test_edit_material_null_value(controller):
 
 def test_edit_contours(controller):
     new_plate = controller.add_new()
-    new_contour = np.array([1, 2, 3])
-    modified_plate = controller.edit_contours(new_plate.id, new_contour)
+    new_contours = [np.array([[1, 2], [3, 4], [5, 6]])]
+    modified_plate = controller.edit_contours(new_plate.id, new_contours)
     assert modified_plate is not None
-    assert modified_plate.contours == serialize_array(new_contour)
+    assert modified_plate.contours == serialize_contours(new_contours)
 
 def test_edit_contours_null_contour(controller):
     new_plate = controller.add_new()
     assert controller.edit_contours(new_plate.id, None) is not None
-    assert controller.edit_contours(new_plate.id, np.array([])) is not None
+    assert controller.edit_contours(new_plate.id, []) is not None
 
 def test_edit_selected(controller):
     new_plate = controller.add_new()
@@ -232,4 +233,10 @@ def test_save_preview(controller, temp_dir):
     file_size = os.path.getsize(preview_path)
     assert file_size > 0, f"Preview file is empty: {preview_path}"
     print(f"Preview file size: {file_size}")
-    
\ No newline at end of file
+    
+def test_save_preview_high_quality(controller):
+    new_plate = controller.add_new()
+    preview_path = controller._get_preview_image_path(new_plate.id)
+    os.remove(preview_path)
+    controller.save_preview(new_plate, high_quality=True)
+    assert os.path.getsize(preview_path) > 0
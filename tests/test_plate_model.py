@@ -31,7 +31,7 @@ def sample_plate_data():
         'y': 1000,
         'z': 1000,
         'material': 'Aluminum',
-        'contours': 'some_contours_data',
+        'contours': b'some_contours_data',
         'selected': False
     }
 
@@ -0,0 +1,66 @@
+import os
+import pytest
+import cv2
+import numpy as np
+
+from src.app.utils.raster_renderer import RasterCanvas, RasterColors, hex_to_bgr, add_title, stack_images, save_image
+from src.app.utils.packing import packing_algo
+
+"""
+Tests for raster preview rendering.
+
+Test coverage:
+- world coordinates scaled to fit canvas, keeping aspect ratio
+- y axis flipped and origin shifted
+- solid and dashed outlines drawn
+- images titled, stacked and saved
+- layout previews rendered without matplotlib
+"""
+
+@pytest.fixture
+def canvas():
+    return RasterCanvas(200, 100, 420, 420, margin=10)
+
+def test_canvas_size(canvas):
+    assert canvas.scale == pytest.approx(2)
+    assert canvas.image.shape == (220, 420, 3)
+    assert np.all(canvas.image == 255)
+    with pytest.raises(ValueError):
+        RasterCanvas(0, 100, 420, 420)
+    with pytest.raises(ValueError):
+        RasterCanvas(100, 100, 20, 420)
+
+def test_to_pixels(canvas):
+    assert canvas.to_pixels([(0, 0), (200, 100)]).tolist() == [[10, 10], [410, 210]]
+    flipped = RasterCanvas(200, 100, 420, 420, margin=10, flip_y=True, origin=(-50, 0))
+    assert flipped.to_pixels([(-50, 0), (150, 100)]).tolist() == [[10, 210], [410, 10]]
+
+def test_draw_outlines(canvas):
+    canvas.draw_rectangle(0, 0, 200, 100, thickness=1)
+    assert np.all(canvas.image[10, 50:350] < 128)
+    dashed = RasterCanvas(200, 100, 420, 420, margin=10)
+    dashed.draw_rectangle(0, 0, 200, 100, RasterColors.FREE_RECTANGLE, dash=RasterCanvas.DASH_LENGTH)
+    drawn = np.count_nonzero(np.any(dashed.image[10, 10:410] < 255, axis=1))
+    assert 0 < drawn < 400
+
+def test_hex_to_bgr():
+    assert hex_to_bgr('#1f77b4') == (0xb4, 0x77, 0x1f)
+
+def test_title_stack_save(canvas, tmpdir):
+    other = RasterCanvas(100, 100, 100, 100)
+    image = stack_images([add_title(canvas.image, 'Bin'), other.image], spacing=5)
+    assert image.shape == (24 + 220 + 5 + 100, 420, 3)
+    path = os.path.join(str(tmpdir), 'preview.png')
+    assert save_image(image, path)
+    assert cv2.imread(path).shape == image.shape
+    assert not save_image(image, os.path.join(str(tmpdir), 'missing', 'preview.png'))
+
+def test_render_part_placements(tmpdir):
+    bins = [('plate', (300.0, 150.0), [[(250.0, 100.0), (290.0, 100.0), (290.0, 140.0), (250.0, 140.0)]])]
+    parts = [('part', [(0.0, 0.0), (40.0, 0.0), (40.0, 30.0), (0.0, 30.0)], 4)]
+    layout = packing_algo.generate_layout(bins, parts, 1, 2)
+    path = os.path.join(str(tmpdir), 'layout.png')
+    assert packing_algo.render_part_placements(layout.used_bins, layout.free_bins, path, width=600, bin_height=300)
+    image = cv2.imread(path)
+    assert image.shape[1] <= 600
+    assert np.any(np.all(image == RasterColors.BOUNDING_BOX, axis=2))
@@ -335,4 +335,10 @@ def test_save_preview(controller, temp_dir):
     file_size = os.path.getsize(preview_path)
     assert file_size > 0, f"Preview file is empty: {preview_path}"
     print(f"Preview file size: {file_size}")
-    
\ No newline at end of file
+    
+def test_save_preview_high_quality(controller):
+    new_router = controller.add_new()
+    preview_path = controller._get_preview_image_path(new_router.id)
+    os.remove(preview_path)
+    controller.save_preview(new_router, high_quality=True)
+    assert os.path.getsize(preview_path) > 0
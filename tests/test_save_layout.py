@@ -0,0 +1,82 @@
+import os
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.app.controllers.optimization_controller import OptimizationController
+from src.app.models.part_model import Part
+from src.app.models.plate_model import Plate
+from src.app.models.utils import serialize_contour, serialize_contours, deserialize_contours
+
+"""
+Tests for saving generated layouts to db.
+
+Test coverage:
+- placed part contours appended to existing plate contours, shifted and rotated
+- margins, plate contours and unplaced pieces skipped
+- all plates written with a single commit
+- nothing written if layout refers to missing parts or plates
+"""
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite:///:memory:')
+    Part.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Part(id='part', filename='part.stl', thickness=5.0, contours=serialize_contour(np.array([[0, 0], [20, 0], [20, 10], [0, 10]]))))
+    session.add(Plate(id='plate1', contours=serialize_contours([np.array([[[900, 900]], [[950, 900]], [[950, 950]]], dtype=np.int32)])))
+    session.add(Plate(id='plate2'))
+    session.commit()
+    yield session
+    session.close()
+
+@pytest.fixture
+def controller(session, tmpdir):
+    return OptimizationController(session, os.path.join(str(tmpdir), 'layout.png'))
+
+@pytest.fixture
+def commit_count(session):
+    count = [0]
+    event.listen(session, 'after_commit', lambda session: count.__setitem__(0, count[0] + 1))
+    return count
+
+def get_plate_contours(session, plate_id):
+    session.expire_all()
+    return [contour.tolist() for contour in deserialize_contours(session.get(Plate, plate_id).contours)]
+
+def test_save_layout(controller, session, commit_count):
+    controller.placements = {
+        'part__0': ('plate1', (100, 200), 0),
+        'part__1': ('plate1', (300, 200), 90),
+        'part__2': ('plate2', (10.5, 20.5), 0),
+        'part__3': None,
+        'plate1ctr0': ('plate1', (900, 900), 0),
+        'edge0': ('plate1', (0, 0), 0)
+    }
+    used_pieces, used_bins = controller.save_layout()
+    assert used_pieces == {'part__0', 'part__1', 'part__2'}
+    assert used_bins == {'plate1', 'plate2'}
+    assert commit_count[0] == 1
+
+    assert get_plate_contours(session, 'plate1') == [
+        [[900, 900], [950, 900], [950, 950]],
+        [[100, 200], [120, 200], [120, 210], [100, 210]],
+        [[310, 200], [310, 220], [300, 220], [300, 200]]
+    ]
+    assert get_plate_contours(session, 'plate2') == [[[10, 20], [30, 20], [30, 30], [10, 30]]]
+
+def test_save_layout_missing_rows(controller, session, commit_count):
+    original = get_plate_contours(session, 'plate1')
+    controller.placements = {'part__0': ('plate1', (100, 200), 0), 'missing__0': ('plate1', (0, 0), 0)}
+    with pytest.raises(ValueError):
+        controller.save_layout()
+    assert get_plate_contours(session, 'plate1') == original
+
+    controller.placements = {'part__0': ('missing', (100, 200), 0)}
+    with pytest.raises(ValueError):
+        controller.save_layout()
+    assert commit_count[0] == 0
+
+    controller.placements = {'part__0': None}
+    assert controller.save_layout() == (set(), set())
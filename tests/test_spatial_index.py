@@ -0,0 +1,48 @@
+import pytest
+from src.app.utils.packing.bin import Bin
+from src.app.utils.packing.utils.area2d import Area2D
+from src.app.utils.packing.utils.dimension2d import Dimension2D
+from src.app.utils.packing.utils.rectangle2d import Rectangle2D
+from src.app.utils.packing.utils.spatial_index import SpatialIndex
+
+"""
+Tests for SpatialIndex.
+
+Test coverage:
+- empty index
+- query returns overlapping pieces only
+- adjacent pieces are not returned
+- pieces spanning multiple cells are returned once
+- index is kept up to date by Bin
+"""
+
+@pytest.fixture
+def index():
+    return SpatialIndex(100, 100, divisions=10)
+
+def test_empty_query(index):
+    assert index.query(Rectangle2D(0, 0, 100, 100)) == []
+    assert len(index) == 0
+
+def test_query_overlapping(index):
+    near = Area2D(id='near', shape=Rectangle2D(0, 0, 10, 10))
+    far = Area2D(id='far', shape=Rectangle2D(80, 80, 10, 10))
+    index.insert(near)
+    index.insert(far)
+    assert index.query(Rectangle2D(5, 5, 10, 10)) == [near]
+
+def test_query_adjacent(index):
+    index.insert(Area2D(id='piece', shape=Rectangle2D(0, 0, 10, 10)))
+    assert index.query(Rectangle2D(10, 0, 10, 10)) == []
+
+def test_query_large_piece_returned_once(index):
+    large = Area2D(id='large', shape=Rectangle2D(0, 0, 100, 5))
+    index.insert(large)
+    assert index.query(Rectangle2D(0, 0, 100, 100)) == [large]
+
+def test_bin_index_updated():
+    bin = Bin('id', Dimension2D(100, 100), edge_distance=5)
+    assert len(bin.index) == 4
+    bin.add_immovable_part(Area2D(id='ctr0', shape=Rectangle2D(40, 40, 10, 10), shift_to_origin=False))
+    bin.pack([Area2D(id='piece', shape=Rectangle2D(0, 0, 10, 10))])
+    assert len(bin.index) == 6
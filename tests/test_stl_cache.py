@@ -0,0 +1,130 @@
+import os
+import shutil
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.app.utils.stl_cache import STLCache, ParsedSTL
+from src.app.utils.stl_parser import STLParser, Axis
+from src.app.controllers.part_controller import PartController
+from src.app.models.part_model import Part
+from src.app.models.utils import deserialize_contour
+
+"""
+Tests for cache of parsed STL files.
+
+Test coverage:
+- key depends on file content only, not on file name
+- saved entry loads with identical axis, thickness and contours
+- missing and corrupted entries are cache misses
+- least recently used entries pruned once the cache exceeds its maximum size, and all entries cleared
+- part controller loads cached files without parsing, with identical part and preview image
+"""
+
+STL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test data', 'stl files')
+
+@pytest.fixture
+def stl_path():
+    return os.path.join(STL_DIR, 'RollerConnectorPlate.STL')
+
+@pytest.fixture
+def cache(tmpdir):
+    return STLCache(os.path.join(str(tmpdir), 'cache'))
+
+@pytest.fixture
+def preview_path(tmpdir):
+    path = os.path.join(str(tmpdir), 'preview.png')
+    with open(path, 'wb') as file:
+        file.write(b'preview')
+    return path
+
+@pytest.fixture
+def parsed():
+    return ParsedSTL(
+        flat_axis=Axis.Z,
+        thickness=6.35,
+        outer_contour=np.array([(0.0, 0.0), (100.0, 0.0), (100.0, 50.0), (0.0, 50.0)]),
+        inner_contours=[np.array([(10.0, 10.0), (10.0, 20.0), (20.0, 20.0)]), np.array([(50.0, 10.0), (50.0, 20.0), (60.0, 20.0), (60.0, 10.0)])]
+    )
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite:///:memory:')
+    Part.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def test_get_key(stl_path, tmpdir):
+    renamed = os.path.join(str(tmpdir), 'renamed.stl')
+    shutil.copyfile(stl_path, renamed)
+    assert STLCache.get_key(renamed) == STLCache.get_key(stl_path)
+
+    with open(renamed, 'ab') as file:
+        file.write(b'\n')
+    assert STLCache.get_key(renamed) != STLCache.get_key(stl_path)
+
+def test_save_and_load(cache, parsed, preview_path, tmpdir):
+    assert cache.load('key') is None
+    cache.save('key', parsed, preview_path)
+
+    loaded = cache.load('key')
+    assert loaded.flat_axis == Axis.Z
+    assert loaded.thickness == 6.35
+    assert np.array_equal(loaded.outer_contour, parsed.outer_contour)
+    assert len(loaded.inner_contours) == 2
+    assert all(np.array_equal(a, b) for a, b in zip(loaded.inner_contours, parsed.inner_contours))
+
+    copied_path = os.path.join(str(tmpdir), 'copied.png')
+    cache.copy_preview('key', copied_path)
+    with open(copied_path, 'rb') as file:
+        assert file.read() == b'preview'
+
+    cache.save('holes', parsed._replace(inner_contours=[]), preview_path)
+    assert cache.load('holes').inner_contours == []
+    assert [name for name in os.listdir(cache.directory) if name.endswith('.tmp')] == []
+
+def test_invalid_entries(cache, parsed, preview_path):
+    cache.save('key', parsed, preview_path)
+    os.remove(os.path.join(cache.directory, 'key.png'))
+    assert cache.load('key') is None
+
+    cache.save('key', parsed, preview_path)
+    with open(os.path.join(cache.directory, 'key.npz'), 'wb') as file:
+        file.write(b'corrupted')
+    assert cache.load('key') is None
+
+def test_prune(cache, parsed, preview_path):
+    cache.save('first', parsed, preview_path)
+    cache.save('second', parsed, preview_path)
+    entry_size = sum(os.path.getsize(path) for path in cache._get_paths('first'))
+    for key, last_used in (('first', 1000), ('second', 2000)):
+        for path in cache._get_paths(key):
+            os.utime(path, (last_used, last_used))
+
+    assert cache.load('first') is not None
+    cache.max_size = 2 * entry_size
+    cache.save('third', parsed, preview_path)
+    assert cache.load('second') is None
+    assert cache.load('first') is not None and cache.load('third') is not None
+
+    cache.clear()
+    assert cache.load('first') is None and cache.load('third') is None
+    assert os.listdir(cache.directory) == []
+
+def test_part_controller(session, cache, stl_path, tmpdir, monkeypatch):
+    controller = PartController(session, str(tmpdir), cache)
+    parsed_part = controller.parse_file(stl_path)
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("cached file was parsed")
+    monkeypatch.setattr(STLParser, 'parse_stl', fail_parse)
+
+    cached_part = controller.parse_file(stl_path)
+    assert cached_part.id != parsed_part.id
+    assert cached_part.thickness == parsed_part.thickness
+    assert np.array_equal(deserialize_contour(cached_part.contours), deserialize_contour(parsed_part.contours))
+    with open(controller._get_preview_image_path(cached_part.id), 'rb') as cached, open(controller._get_preview_image_path(parsed_part.id), 'rb') as parsed:
+        assert cached.read() == parsed.read()
+    assert controller.add_parsed(cached_part) is not None
@@ -19,6 +19,8 @@ Test coverage:
 - thickness on valid mesh
 - flattening of valid mesh
 - outer edges, contours, outer contour, and contour smoothing on valid mesh
+- outer edges exclude shared edges despite vertex order and floating point noise
+- contours of shape with hole, inner contours and orientation
 - saving of preview image
 """
 
@@ -67,12 +69,34 @@ def test_get_outer_edges(stl_parser_valid):
     flattened_mesh = STLParser.get_flattened_mesh(stl_parser_valid.stl_mesh_vector, flat_axis)
     assert isinstance(STLParser.get_outer_edges(flattened_mesh, flat_axis), list)
 
+def test_get_outer_edges_shared():
+    square = np.array([
+        [[0, 0, 0], [10, 0, 0], [10, 10, 0]],
+        [[10, 10.000001, 0], [0, 10, 0], [0, 0, 0]],
+    ], dtype=np.float32)
+    edges = STLParser.get_outer_edges(square, Axis.Z)
+    assert sorted(edges) == [((0.0, 0.0), (0.0, 10.0)), ((0.0, 0.0), (10.0, 0.0)), ((0.0, 10.0), (10.0, 10.0)), ((10.0, 0.0), (10.0, 10.0))]
+    assert STLParser.get_outer_edges(square[:0], Axis.Z) == []
+
 def test_get_contours(stl_parser_valid):
     flat_axis = STLParser.get_flat_axis(stl_parser_valid.stl_mesh_vector)
     flattened_mesh = STLParser.get_flattened_mesh(stl_parser_valid.stl_mesh_vector, flat_axis)
     outer_edges = STLParser.get_outer_edges(flattened_mesh, flat_axis)
     assert isinstance(STLParser.get_contours(outer_edges), list)
 
+def test_get_inner_contours():
+    outer = [((0.0, 0.0), (10.0, 0.0)), ((10.0, 0.0), (10.0, 10.0)), ((10.0, 10.0), (0.0, 10.0)), ((0.0, 10.0), (0.0, 0.0))]
+    hole = [((3.0, 3.0), (3.0, 6.0)), ((6.0, 6.0), (3.0, 6.0)), ((6.0, 3.0), (6.0, 6.0)), ((3.0, 3.0), (6.0, 3.0))]
+    contours = STLParser.get_contours(hole[:2] + outer + hole[2:])
+    assert sorted(len(contour) for contour in contours) == [4, 4]
+
+    outer_contour = STLParser.get_outermost_contour(contours)
+    assert STLParser.get_signed_area(STLParser.orient_contour(outer_contour)) == 100
+    inner_contours = STLParser.get_inner_contours(contours, outer_contour)
+    assert len(inner_contours) == 1
+    assert STLParser.get_signed_area(inner_contours[0]) == -9
+    assert STLParser.get_contours([]) == []
+
 def test_get_outermost_contour(stl_parser_valid):
     flat_axis = STLParser.get_flat_axis(stl_parser_valid.stl_mesh_vector)
     flattened_mesh = STLParser.get_flattened_mesh(stl_parser_valid.stl_mesh_vector, flat_axis)
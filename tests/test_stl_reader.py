@@ -0,0 +1,67 @@
+import os
+import numpy as np
+import pytest
+
+from src.app.utils.stl_reader import read_stl, read_ascii_stl, BINARY_FACET_DTYPE
+from src.app.utils.stl_parser import STLParser
+
+"""
+Tests for single pass STL reading.
+
+Test coverage:
+- ASCII file parsed in chunks of any size
+- binary file memory-mapped and matching ASCII file
+- invalid, empty and unrecognized files rejected
+"""
+
+STL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test data', 'stl files')
+
+@pytest.fixture
+def ascii_path():
+    return os.path.join(STL_DIR, 'RollerConnectorPlate.STL')
+
+@pytest.fixture
+def binary_path(ascii_path, tmpdir):
+    vertices = read_stl(ascii_path)
+    facets = np.zeros(len(vertices), dtype=BINARY_FACET_DTYPE)
+    facets['vertices'] = vertices
+    path = os.path.join(str(tmpdir), 'binary.stl')
+    with open(path, 'wb') as file:
+        file.write(b'solid exported as binary'.ljust(80, b' '))
+        file.write(np.uint32(len(facets)).tobytes())
+        file.write(facets.tobytes())
+    return path
+
+def test_ascii(ascii_path):
+    vertices = read_stl(ascii_path)
+    assert vertices.shape == (2238, 3, 3)
+    assert vertices.dtype == np.float32
+    assert np.array_equal(read_ascii_stl(ascii_path, chunk_size=1000), vertices)
+
+def test_binary(ascii_path, binary_path):
+    vertices = read_stl(binary_path)
+    assert isinstance(vertices, np.memmap)
+    assert np.array_equal(vertices, read_stl(ascii_path))
+
+    parser = STLParser(binary_path)
+    parser.parse_stl()
+    assert parser.thickness == pytest.approx(6.35)
+
+def test_invalid(tmpdir):
+    with pytest.raises(ValueError):
+        read_stl(os.path.join(STL_DIR, 'invalid.STL'))
+    with pytest.raises(FileNotFoundError):
+        read_stl(os.path.join(str(tmpdir), 'missing.stl'))
+
+    empty_binary = os.path.join(str(tmpdir), 'empty.stl')
+    with open(empty_binary, 'wb') as file:
+        file.write(b'\0' * 84)
+    with pytest.raises(ValueError):
+        read_stl(empty_binary)
+
+    other = os.path.join(str(tmpdir), 'other.stl')
+    with open(other, 'w') as file:
+        file.write('not an stl file\n')
+    with pytest.raises(ValueError):
+        read_stl(other)
+    assert STLParser.stl_file_valid(other) == False
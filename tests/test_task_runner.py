@@ -0,0 +1,92 @@
+import time
+import threading
+import pytest
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.app.task_runner import TaskRunner
+from src.app.utils.cancellation import CancellationToken, OperationCancelled
+
+"""
+Tests for background tasks.
+
+Test coverage:
+- results delivered in the calling thread
+- errors reported
+- progress reported
+- running and queued tasks cancelled
+- cancellation token usable without Qt
+"""
+
+@pytest.fixture(scope='module')
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+@pytest.fixture
+def runner(app):
+    runner = TaskRunner(max_threads=1)
+    yield runner
+    runner.cancel_all()
+    runner.wait()
+
+def process_until(app, condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    assert condition()
+
+def test_result_in_calling_thread(app, runner):
+    results, threads = [], []
+    def on_finished(result):
+        results.append(result)
+        threads.append(threading.current_thread())
+    runner.start(lambda x, y: (x + y, threading.current_thread()), 1, y=2, on_finished=on_finished)
+    process_until(app, lambda: not runner.is_busy())
+    assert results[0][0] == 3
+    assert results[0][1] is not threading.main_thread()
+    assert threads == [threading.main_thread()]
+
+def test_failure(app, runner):
+    errors, done = [], []
+    def fail():
+        raise ValueError("invalid input")
+    runner.start(fail, on_failed=errors.append, on_done=lambda: done.append(True))
+    process_until(app, lambda: done)
+    assert errors == ["invalid input"]
+
+def test_progress(app, runner):
+    progress = []
+    def work(n, progress_callback):
+        for i in range(1, n + 1):
+            progress_callback(i / n, f"step {i}")
+        return n
+    runner.start(work, 4, on_progress=lambda percent, message: progress.append((percent, message)))
+    process_until(app, lambda: not runner.is_busy())
+    assert progress == [(25, 'step 1'), (50, 'step 2'), (75, 'step 3'), (100, 'step 4')]
+
+def test_cancel(app, runner):
+    started = threading.Event()
+    def work(cancellation_token):
+        started.set()
+        while True:
+            cancellation_token.raise_if_cancelled()
+            time.sleep(0.001)
+    finished, cancelled = [], []
+    running = runner.start(work, on_finished=finished.append, on_cancelled=lambda: cancelled.append('running'))
+    queued = runner.start(lambda: 1, on_finished=finished.append, on_cancelled=lambda: cancelled.append('queued'))
+    assert started.wait(5)
+    queued.cancel()
+    running.cancel()
+    process_until(app, lambda: not runner.is_busy())
+    assert finished == []
+    assert sorted(cancelled) == ['queued', 'running']
+
+def test_cancellation_token():
+    token = CancellationToken()
+    token.raise_if_cancelled()
+    token.cancel()
+    assert token.is_cancelled()
+    with pytest.raises(OperationCancelled):
+        token.raise_if_cancelled()
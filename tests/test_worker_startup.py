@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+import types
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.app.views.optimization_view import OptimizationView
+
+"""
+Tests for startup of worker processes launched from the GUI entry point.
+
+Test coverage:
+- running run.py as the main module of a spawned worker imports no Qt or app modules
+- spawned workers start in a small share of the layout time budget
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_PATH = os.path.join(ROOT, 'run.py')
+
+def test_worker_imports():
+    code = (
+        "import sys, runpy; runpy.run_path(sys.argv[1], run_name='__mp_main__'); "
+        "print(sorted(module for module in sys.modules if module.startswith(('PyQt', 'src.'))))"
+    )
+    result = subprocess.run([sys.executable, '-c', code, RUN_PATH], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+def test_worker_startup(monkeypatch):
+    main_module = types.ModuleType('__main__')
+    main_module.__file__ = RUN_PATH
+    main_module.__spec__ = None
+    monkeypatch.setitem(sys.modules, '__main__', main_module)
+
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+        for future in [executor.submit(os.getpid) for _ in range(2)]:
+            future.result()
+        startup = time.monotonic() - start
+    assert startup < OptimizationView.LAYOUT_TIME_BUDGET / 4